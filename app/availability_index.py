@@ -0,0 +1,177 @@
+# ==============================================
+# DERLENMİŞ HOCA MÜSAİTLİĞİ (Bit Maskeleri)
+# ==============================================
+# check_instructor_available her kontrol için bir
+# SQL sorgusu çalıştırır. Planlama sırasında bu
+# kontrol on binlerce kez yapılır.
+#
+# Bu dosya müsaitliği BİR KERE derler:
+#    maske[(hoca_id, gün_adı)] = tamsayı
+#    dakika m müsaitse maskenin m. biti 1'dir (0..1439)
+#
+# Derleme kuralları:
+#    - is_available = 1 kayıtları bitleri 1 yapar
+#    - is_available = 0 kayıtları bitleri 0 yapar
+#    - Hocanın ders saatleri (courses.day_of_week,
+#      class_start_time, class_end_time) meşgul sayılır
+#      (config.SINAV_DERS_SAATLERI_MESGUL)
+#
+# Bir aralık kontrolü tek bir bit testidir:
+#    (maske >> başlangıç) & aralık_maskesi == aralık_maskesi
+#
+# Derlenmiş maskeler önbellekte tutulur. Veritabanındaki
+# tetikleyiciler instructor_availability veya derslerin
+# hoca/ders saati değiştiğinde data_versions tablosundaki
+# sürümü artırır; sürüm değişince maskeler yeniden derlenir.
+# ==============================================
+
+import sqlite3
+
+import app.database as database
+from app.database import execute_query
+from config import SINAV_DERS_SAATLERI_MESGUL
+
+# Önbellek: aynı veritabanı ve aynı sürüm için tekrar derleme yapılmaz.
+# Kayıt tek parça (veritabanı, sürüm, maskeler) olarak değiştirilir; aynı anda
+# çalışan planlamalar yarım güncellenmiş bir kayıt görmez. Maskeler sadece okunur.
+compiled_cache = {
+    'entry': None
+}
+
+
+def range_mask(start_minute, end_minute):
+    """[başlangıç, bitiş) dakikalarının bitleri 1 olan maske."""
+    if end_minute <= start_minute:
+        return 0
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+
+def compile_availability_masks(availability_rows, class_rows, exclude_class_times=True):
+    """
+    Müsaitlik ve ders saatlerini bit maskelerine derler.
+
+    Parametreler:
+        availability_rows: instructor_availability satırları
+                           (instructor_id, day_of_week, start_time, end_time, is_available)
+        class_rows: Ders saatleri (instructor_id, day_of_week, class_start_time, class_end_time)
+        exclude_class_times: True ise ders saatleri meşgul sayılır
+
+    Döndürür:
+        masks: {(hoca_id, gün_adı): maske}
+    """
+    # schedule_snapshot bu dosyayı import ettiği için burada import edilir
+    from app.schedule_snapshot import time_to_minutes
+
+    masks = {}
+    unavailable = []
+
+    for row in availability_rows:
+        key = (row['instructor_id'], row['day_of_week'])
+        bits = range_mask(time_to_minutes(row['start_time']), time_to_minutes(row['end_time']))
+        if row['is_available']:
+            masks[key] = masks.get(key, 0) | bits
+        else:
+            unavailable.append((key, bits))
+
+    # Müsait değil kayıtları, müsait kayıtlardan sonra uygulanır
+    for key, bits in unavailable:
+        if key in masks:
+            masks[key] &= ~bits
+
+    if exclude_class_times:
+        for row in class_rows:
+            key = (row['instructor_id'], row['day_of_week'])
+            if key in masks:
+                bits = range_mask(time_to_minutes(row['class_start_time']),
+                                  time_to_minutes(row['class_end_time']))
+                masks[key] &= ~bits
+
+    return masks
+
+
+def load_availability_masks():
+    """
+    Müsaitlik ve ders saatlerini veritabanından okuyup derler.
+
+    Döndürür:
+        masks: {(hoca_id, gün_adı): maske}
+    """
+    availability_rows = execute_query("""
+        SELECT instructor_id, day_of_week, start_time, end_time, is_available
+        FROM instructor_availability
+    """)
+
+    class_rows = execute_query("""
+        SELECT instructor_id, day_of_week, class_start_time, class_end_time
+        FROM courses
+        WHERE day_of_week IS NOT NULL
+          AND class_start_time IS NOT NULL
+          AND class_end_time IS NOT NULL
+    """)
+
+    return compile_availability_masks(availability_rows, class_rows, SINAV_DERS_SAATLERI_MESGUL)
+
+
+def get_availability_version():
+    """
+    Müsaitlik verisinin sürüm numarasını döndürür.
+    data_versions tablosu yoksa (eski veritabanı) None döner.
+    """
+    try:
+        rows = execute_query("SELECT version FROM data_versions WHERE name = 'availability'")
+    except sqlite3.OperationalError:
+        return None
+
+    if len(rows) == 0:
+        return None
+
+    return rows[0]['version']
+
+
+def get_availability_masks():
+    """
+    Derlenmiş maskeleri döndürür. Sadece veritabanı veya sürüm
+    değiştiyse yeniden derler (sürüm bilinmiyorsa her seferinde derler).
+
+    Döndürür:
+        masks: {(hoca_id, gün_adı): maske}
+    """
+    version = get_availability_version()
+
+    entry = compiled_cache['entry']
+    if (version is not None
+            and entry is not None
+            and entry[0] == database.DATABASE_PATH
+            and entry[1] == version):
+        return entry[2]
+
+    masks = load_availability_masks()
+    compiled_cache['entry'] = (database.DATABASE_PATH, version, masks)
+
+    return masks
+
+
+def is_available_in_masks(masks, instructor_id, day_name, start_minute, end_minute):
+    """
+    Hoca o gün [başlangıç, bitiş) aralığının tamamında müsait mi? (tek bit testi)
+    """
+    mask = masks.get((instructor_id, day_name))
+    if not mask:
+        return False
+
+    needed = (1 << (end_minute - start_minute)) - 1
+    return (mask >> start_minute) & needed == needed
+
+
+def count_available_instructors_by_day(masks):
+    """
+    Her gün en az bir dakika müsait olan hoca sayısını döndürür.
+
+    Döndürür:
+        counts: {gün_adı: hoca sayısı}
+    """
+    counts = {}
+    for (instructor_id, day_name), mask in masks.items():
+        if mask:
+            counts[day_name] = counts.get(day_name, 0) + 1
+    return counts
@@ -0,0 +1,335 @@
+# ==============================================
+# PERFORMANS ÖLÇÜMLERİ (Benchmark)
+# ==============================================
+# tests/test_functional.py sadece doğruluğu
+# kontrol eder. Bu dosya planlama, dışa aktarma
+# ve ana sayfaların performansını ölçer.
+#
+# Her veri boyutu için (bkz. app/synthetic_data.py)
+# sentetik bir veritabanı üretilir ve her ölçüm için:
+#    - Geçen süre (saniye)
+#    - Çalışan SQL komutu sayısı
+#    - En yüksek bellek kullanımı (tracemalloc, KB)
+#    - Planlamada yerleşen / yerleşemeyen ders sayısı
+# kaydedilir.
+#
+# Sonuçlar JSON temel çizgisi (baseline) olarak
+# saklanabilir. Sonraki çalıştırmalar temel çizgiyle
+# karşılaştırılır ve kötüleşmeler (regresyon) raporlanır.
+#
+# Kullanım:
+#    python -m app.benchmark --scales 1 10 --save-baseline
+#    python -m app.benchmark --scales 1 10
+# ==============================================
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import app.database as database
+from config import BASE_DIR
+
+# Varsayılan temel çizgi dosyası
+DEFAULT_BASELINE_PATH = os.path.join(BASE_DIR, 'benchmark_baseline.json')
+
+# Varsayılan veri boyutları (synthetic_data scale değerleri)
+DEFAULT_SCALES = [1, 10]
+
+# Veri üretimi ve planlama dönemi sabit: aynı kod aynı sonucu verir
+BENCHMARK_SEED = 1
+EXAM_PERIOD = ('2025-01-06', '2025-01-17')
+
+# Süre ve bellek bu orandan fazla artarsa regresyon sayılır
+DEFAULT_TOLERANCE = 0.25
+
+# Bu kadar küçük süre farkları (saniye) gürültü sayılır
+MIN_TIME_DELTA = 0.05
+
+
+def run_generate_schedule():
+    """Planlamayı çalıştırır, yerleşen/yerleşemeyen sayısını döndürür."""
+    from app.scheduler import generate_exam_schedule
+
+    result = generate_exam_schedule(EXAM_PERIOD[0], EXAM_PERIOD[1])
+    return {'placed': result['placed_count'], 'failed': result['failed_count']}
+
+
+def run_get_all_exams():
+    """Tüm sınavları okur."""
+    from app.models.exam import get_all_exams
+
+    return {'rows': len(get_all_exams())}
+
+
+def run_export_pdf():
+    """PDF dışa aktarma (oluşan dosya silinir)."""
+    from app.export import export_to_pdf
+
+    file_path = export_to_pdf()
+    size = os.path.getsize(file_path)
+    os.remove(file_path)
+    return {'bytes': size}
+
+
+def run_export_excel():
+    """Excel dışa aktarma (oluşan dosya silinir)."""
+    from app.export import export_to_excel
+
+    file_path = export_to_excel()
+    size = os.path.getsize(file_path)
+    os.remove(file_path)
+    return {'bytes': size}
+
+
+# Ölçülen sayfalar (admin oturumu ile)
+VIEW_URLS = {
+    'view_schedule': '/schedule/view',
+    'view_courses': '/admin/courses',
+    'view_students': '/admin/students',
+    'view_dashboard': '/auth/dashboard'
+}
+
+# Ölçümler: {ad: fonksiyon}. Planlama ilk sırada olmalı (diğerleri programı okur)
+BENCHMARK_CASES = {
+    'generate_exam_schedule': run_generate_schedule,
+    'get_all_exams': run_get_all_exams,
+    'export_to_pdf': run_export_pdf,
+    'export_to_excel': run_export_excel
+}
+
+# Tüm ölçüm adları (fonksiyonlar + sayfalar), çalışma sırasıyla
+ALL_CASES = list(BENCHMARK_CASES) + list(VIEW_URLS)
+
+
+def create_view_runner(client, url):
+    """Sayfayı test istemcisiyle açan ölçüm fonksiyonu."""
+    def run_view():
+        response = client.get(url)
+        return {'status': response.status_code, 'bytes': len(response.data)}
+    return run_view
+
+
+def measure(func, track_memory=True):
+    """
+    Bir fonksiyonun süresini, SQL komut sayısını ve bellek kullanımını ölçer.
+    Bellek ölçümü (tracemalloc) süreyi bozduğu için ayrı bir çalıştırmada yapılır.
+
+    Döndürür:
+        metrics: {'time', 'queries', 'peak_memory_kb' + fonksiyonun döndürdükleri}
+    """
+    query_count = [0]
+
+    def count_query(statement):
+        query_count[0] += 1
+
+    database.query_trace = count_query
+    try:
+        started = time.perf_counter()
+        extra = func()
+        elapsed = time.perf_counter() - started
+    finally:
+        database.query_trace = None
+
+    metrics = {
+        'time': round(elapsed, 4),
+        'queries': query_count[0]
+    }
+
+    if track_memory:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        metrics['peak_memory_kb'] = round(peak / 1024)
+
+    metrics.update(extra or {})
+    return metrics
+
+
+def run_benchmarks(scales=None, cases=None, track_memory=True, verbose=True):
+    """
+    Her veri boyutu için sentetik veritabanı üretip ölçümleri çalıştırır.
+    Çalışan uygulamanın veritabanına dokunmaz; sonunda eski yol geri yüklenir.
+
+    Parametreler:
+        scales: Veri boyutları (synthetic_data scale değerleri)
+        cases: Çalıştırılacak ölçüm adları (varsayılan: hepsi)
+        track_memory: False ise bellek ölçülmez (daha hızlı)
+        verbose: Ekrana ilerleme yazılsın mı?
+
+    Döndürür:
+        report: {'created_at', 'seed', 'exam_period', 'results': {veri_adı: {ölçüm: metrikler}}}
+    """
+    from app.synthetic_data import generate_university
+
+    if scales is None:
+        scales = DEFAULT_SCALES
+    if cases is None:
+        cases = ALL_CASES
+    for name in cases:
+        if name not in ALL_CASES:
+            raise ValueError(f"Bilinmeyen ölçüm: {name}")
+
+    report = {
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'seed': BENCHMARK_SEED,
+        'exam_period': list(EXAM_PERIOD),
+        'results': {}
+    }
+
+    old_database_path = database.DATABASE_PATH
+    work_folder = tempfile.mkdtemp(prefix='benchmark_')
+
+    try:
+        for scale in scales:
+            dataset = f'scale_{scale}'
+            database_path = os.path.join(work_folder, dataset + '.db')
+            stats = generate_university(database_path, seed=BENCHMARK_SEED, scale=scale)
+            database.DATABASE_PATH = database_path
+
+            results = {'_dataset': {'courses': stats['courses'], 'students': stats['students'],
+                                    'student_courses': stats['student_courses']}}
+
+            client = None
+            for name in cases:
+                if name in VIEW_URLS:
+                    if client is None:
+                        client = create_admin_client()
+                    func = create_view_runner(client, VIEW_URLS[name])
+                else:
+                    func = BENCHMARK_CASES[name]
+
+                results[name] = measure(func, track_memory)
+                if verbose:
+                    print(f"{dataset} {name}: {results[name]}")
+
+            report['results'][dataset] = results
+    finally:
+        database.DATABASE_PATH = old_database_path
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+    return report
+
+
+def create_admin_client():
+    """Admin oturumu açık bir Flask test istemcisi oluşturur."""
+    from app import create_app
+
+    flask_app = create_app()
+    client = flask_app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+        session['role'] = 'admin'
+        session['username'] = 'admin'
+    return client
+
+
+def compare_with_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Ölçümleri temel çizgiyle karşılaştırır.
+
+    Regresyon sayılanlar:
+        - Süre: tolerans oranından ve MIN_TIME_DELTA'dan fazla artış
+        - SQL komut sayısı: herhangi bir artış (veri ve kod aynıysa sabittir)
+        - Bellek: tolerans oranından fazla artış
+        - Yerleşen ders sayısı azalması / yerleşemeyen artışı
+
+    Döndürür:
+        regressions: [{'dataset', 'case', 'metric', 'baseline', 'current'}, ...]
+    """
+    regressions = []
+
+    for dataset, results in report['results'].items():
+        baseline_results = baseline.get('results', {}).get(dataset)
+        if baseline_results is None:
+            continue
+
+        for case, metrics in results.items():
+            old = baseline_results.get(case)
+            if old is None or case.startswith('_'):
+                continue
+
+            def flag(metric):
+                regressions.append({'dataset': dataset, 'case': case, 'metric': metric,
+                                    'baseline': old[metric], 'current': metrics[metric]})
+
+            if 'time' in old and 'time' in metrics:
+                if (metrics['time'] > old['time'] * (1 + tolerance)
+                        and metrics['time'] - old['time'] > MIN_TIME_DELTA):
+                    flag('time')
+            if 'queries' in old and 'queries' in metrics and metrics['queries'] > old['queries']:
+                flag('queries')
+            if 'peak_memory_kb' in old and 'peak_memory_kb' in metrics:
+                if metrics['peak_memory_kb'] > old['peak_memory_kb'] * (1 + tolerance):
+                    flag('peak_memory_kb')
+            if 'placed' in old and 'placed' in metrics and metrics['placed'] < old['placed']:
+                flag('placed')
+            if 'failed' in old and 'failed' in metrics and metrics['failed'] > old['failed']:
+                flag('failed')
+
+    return regressions
+
+
+def load_baseline(file_path):
+    """Temel çizgiyi okur (dosya yoksa None)."""
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(report, file_path):
+    """Ölçümleri temel çizgi olarak kaydeder."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    """Komut satırı: python -m app.benchmark --scales 1 10 [--save-baseline]"""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Planlama ve sayfa performans ölçümleri.')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='Sentetik veri boyutları (scale)')
+    parser.add_argument('--cases', nargs='+', default=None, choices=ALL_CASES,
+                        help='Çalıştırılacak ölçümler (varsayılan: hepsi)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='Temel çizgi JSON dosyası')
+    parser.add_argument('--save-baseline', action='store_true', help='Sonuçları temel çizgi olarak kaydet')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Süre/bellek için izin verilen artış oranı')
+    parser.add_argument('--no-memory', action='store_true', help='Bellek ölçümünü atla')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.scales, args.cases, track_memory=not args.no_memory)
+
+    if args.save_baseline:
+        save_baseline(report, args.baseline)
+        print(f"Temel cizgi kaydedildi: {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"Temel cizgi bulunamadi: {args.baseline} (--save-baseline ile olusturun)")
+        return
+
+    regressions = compare_with_baseline(report, baseline, args.tolerance)
+    if not regressions:
+        print("Regresyon yok.")
+        return
+
+    print(f"{len(regressions)} regresyon bulundu:")
+    for item in regressions:
+        print(f"   {item['dataset']} {item['case']} {item['metric']}: "
+              f"{item['baseline']} -> {item['current']}")
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+# ==============================================
+# ORTAK KAYIT MATRİSİ (Seyrek, NumPy)
+# ==============================================
+# Çakışma grafı (app/conflict_graph.py) her öğrenci
+# için aldığı derslerin tüm çiftlerini Python
+# döngüsüyle sayıyordu; 100 bin kayıtta bu yavaştır.
+#
+# Bu dosya aynı sayıları vektörel olarak hesaplar:
+#    1. student_courses'tan öğrenci x ders seyrek
+#       (CSR) kayıt matrisi A oluşturulur
+#    2. Ders x ders ortak öğrenci matrisi C = Aᵀ·A
+#       tek seferde hesaplanır: her öğrenci satırındaki
+#       ders çiftleri NumPy dizileriyle üretilip
+#       np.unique ile sayılır
+#    3. C'nin köşegeni ders mevcudu, köşegen dışı
+#       elemanları ortak öğrenci sayısıdır
+#
+# Sonuç çakışma grafı sözlüğüne çevrilir; planlama
+# kontrolleri ve çakışma raporları bu grafı kullanır.
+# "Aynı slota konamaz" ders çiftleri listesi doğrudan
+# matristen çıkarılır (list_conflict_pairs) ve
+# yöneticiye /schedule/conflict-pairs adresinden
+# sunulur.
+# ==============================================
+
+import numpy as np
+
+from app.database import execute_query
+
+
+def build_incidence_matrix(student_ids, course_ids):
+    """
+    Öğrenci x ders kayıt matrisini CSR biçiminde oluşturur.
+    Aynı kayıt birden fazla varsa bir kere sayılır.
+
+    Parametreler:
+        student_ids: Kayıtların öğrenci ID'leri
+        course_ids: Kayıtların ders ID'leri (aynı sırada)
+
+    Döndürür:
+        incidence: Sözlük
+            'indptr': Satır başlangıçları (öğrenci sayısı + 1)
+            'indices': Sütun (ders) indeksleri, satır içinde sıralı
+            'student_ids': Satır -> öğrenci ID
+            'course_ids': Sütun -> ders ID
+    """
+    student_ids = np.asarray(student_ids, dtype=np.int64)
+    course_ids = np.asarray(course_ids, dtype=np.int64)
+
+    row_ids, rows = np.unique(student_ids, return_inverse=True)
+    column_ids, columns = np.unique(course_ids, return_inverse=True)
+
+    # Öğrenciye, sonra derse göre sırala; tekrarlanan kayıtları at
+    keys = np.unique(rows.astype(np.int64) * len(column_ids) + columns)
+    rows = keys // max(len(column_ids), 1)
+    columns = keys % max(len(column_ids), 1)
+
+    indptr = np.zeros(len(row_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(row_ids)), out=indptr[1:])
+
+    return {
+        'indptr': indptr,
+        'indices': columns,
+        'student_ids': row_ids,
+        'course_ids': column_ids
+    }
+
+
+def load_incidence_matrix():
+    """student_courses tablosundan kayıt matrisini oluşturur."""
+    rows = execute_query("SELECT student_id, course_id FROM student_courses")
+    student_ids = [row['student_id'] for row in rows]
+    course_ids = [row['course_id'] for row in rows]
+    return build_incidence_matrix(student_ids, course_ids)
+
+
+def incidence_from_enrollments(enrollments):
+    """
+    {ders_id: {öğrenci_id, ...}} sözlüğünden kayıt matrisini oluşturur
+    (planlama anlık görüntüsü zaten okunmuşsa tekrar sorgu yapılmaz).
+    """
+    student_ids = []
+    course_ids = []
+    for course_id, students in enrollments.items():
+        student_ids.extend(students)
+        course_ids.extend([course_id] * len(students))
+    return build_incidence_matrix(student_ids, course_ids)
+
+
+def compute_coenrollment(incidence):
+    """
+    Ders x ders ortak öğrenci matrisini (Aᵀ·A) hesaplar.
+
+    Her kayıt, aynı öğrencinin tüm kayıtlarıyla eşleştirilir
+    (satır başına k² çift); çiftler tek bir np.unique ile sayılır.
+    Maliyet öğrenci başına ders sayısının karesiyle orantılıdır.
+
+    Döndürür:
+        coenrollment: Sözlük (CSR, köşegen hariç)
+            'indptr', 'indices', 'data': Ders satırları, komşu dersler, ortak öğrenci
+            'sizes': Ders mevcutları (köşegen)
+            'course_ids': İndeks -> ders ID
+    """
+    indptr = incidence['indptr']
+    columns = incidence['indices']
+    course_count = len(incidence['course_ids'])
+
+    row_lengths = np.diff(indptr)
+    rows = np.repeat(np.arange(len(row_lengths)), row_lengths)
+
+    # Her kayıt kendi satırındaki kayıt sayısı kadar çoğaltılır
+    pair_counts = row_lengths[rows]
+    left = np.repeat(columns, pair_counts)
+    first_pair = np.cumsum(pair_counts) - pair_counts
+    offsets = np.arange(int(pair_counts.sum())) - np.repeat(first_pair, pair_counts)
+    right = columns[np.repeat(indptr[rows], pair_counts) + offsets]
+
+    off_diagonal = left != right
+    keys, counts = np.unique(left[off_diagonal] * course_count + right[off_diagonal], return_counts=True)
+
+    matrix_rows = keys // max(course_count, 1)
+    matrix_indptr = np.zeros(course_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(matrix_rows, minlength=course_count), out=matrix_indptr[1:])
+
+    return {
+        'indptr': matrix_indptr,
+        'indices': keys % max(course_count, 1),
+        'data': counts,
+        'sizes': np.bincount(columns, minlength=course_count),
+        'course_ids': incidence['course_ids']
+    }
+
+
+def coenrollment_to_graph(coenrollment):
+    """
+    Ortak öğrenci matrisini çakışma grafı sözlüğüne çevirir
+    (app/conflict_graph.py ile aynı biçim).
+
+    Döndürür:
+        graph: {ders_id: {diğer_ders_id: ortak_öğrenci_sayısı}}
+    """
+    course_ids = coenrollment['course_ids'].tolist()
+    indptr = coenrollment['indptr'].tolist()
+    neighbor_ids = coenrollment['course_ids'][coenrollment['indices']].tolist()
+    counts = coenrollment['data'].tolist()
+
+    graph = {}
+    for i, course_id in enumerate(course_ids):
+        start, end = indptr[i], indptr[i + 1]
+        if start < end:
+            graph[course_id] = dict(zip(neighbor_ids[start:end], counts[start:end]))
+
+    return graph
+
+
+def list_conflict_pairs(coenrollment, min_shared=1):
+    """
+    Aynı slota asla konmaması gereken ders çiftlerini vektörel olarak listeler.
+
+    Döndürür:
+        pairs: [(ders_a, ders_b, ortak_öğrenci), ...] (ortak öğrenciye göre azalan)
+    """
+    course_ids = coenrollment['course_ids']
+    rows = np.repeat(np.arange(len(course_ids)), np.diff(coenrollment['indptr']))
+    columns = coenrollment['indices']
+    counts = coenrollment['data']
+
+    # Her çift bir kere (a < b) ve eşik üstü
+    mask = (rows < columns) & (counts >= min_shared)
+    order = np.argsort(-counts[mask], kind='stable')
+
+    course_a = course_ids[rows[mask]][order].tolist()
+    course_b = course_ids[columns[mask]][order].tolist()
+    shared = counts[mask][order].tolist()
+
+    return list(zip(course_a, course_b, shared))
+
+
+def get_conflict_pair_report(min_shared=1):
+    """
+    Aynı slota konamaz ders çiftlerini ders kodlarıyla listeler (yönetici raporu).
+
+    Parametreler:
+        min_shared: En az kaç ortak öğrenci olmalı?
+
+    Döndürür:
+        pairs: [{'course_a', 'code_a', 'course_b', 'code_b', 'shared'}, ...]
+               (ortak öğrenciye göre azalan)
+    """
+    codes = {}
+    for row in execute_query("SELECT id, code FROM courses"):
+        codes[row['id']] = row['code']
+
+    pairs = list_conflict_pairs(compute_coenrollment(load_incidence_matrix()), min_shared)
+
+    return [{'course_a': course_a, 'code_a': codes.get(course_a),
+             'course_b': course_b, 'code_b': codes.get(course_b), 'shared': shared}
+            for course_a, course_b, shared in pairs]
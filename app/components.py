@@ -0,0 +1,503 @@
+# ==============================================
+# BAĞIMSIZ PARÇALARIN PARALEL PLANLANMASI
+# ==============================================
+# Ortak öğrencisi ve ortak hocası olmayan fakülteler
+# birbirinin planını etkilemez; ama planlama tüm
+# dersleri tek bir döngüde sırayla yerleştiriyordu.
+#
+# Bu dosya planlamayı parçalara böler:
+#    1. Dersler bağlı bileşenlere ayrılır. İki ders
+#       aynı bileşendedir, eğer:
+#         - ortak öğrencileri varsa (çakışma grafı)
+#         - hocaları aynıysa
+#         - bölümleri aynıysa (bölüm aralığı kuralı)
+#    2. Bileşenler ders sayısına göre işlem sayısı
+#       kadar gruba dağıtılır (en kalabalık grup en
+#       az yüklü işleme)
+#    3. Paylaşılan kaynaklar gruplara ayrı havuzlar
+#       olarak bölünür; böylece iki grup aynı dersliği
+#       veya gözetmeni aynı saate koyamaz (özel derslik
+#       atamaları hariç):
+#         - derslikler öğrenci sayısıyla orantılı
+#         - gözetmenler: grubun kendi hocaları, dersi
+#           olmayan hocalar en az gözetmenli gruba
+#    4. Her grup kendi havuzlarıyla ayrı işlemde
+#       (ProcessPoolExecutor) compute_schedule_in_memory
+#       ile planlanır; gözetmen eşleştirmesi de grubun
+#       kendi havuzunda yapılır. İşlemler veritabanına
+#       yazmaz
+#    5. Birleştirme: yerleşimler tek bir duruma sırayla
+#       eklenir. Sadece gözetmeni dolu olan yerleşime
+#       yeni gözetmen seçilir; dersliği veya hocası dolu
+#       olan ders ve havuzu yetmeyen dersler bütün
+#       dersliklerle ortak durumda yeniden denenir
+#
+# Süre sınırı ve iptal hem grupların içinde (iptal
+# sinyali paylaşılan bir Event ile işlemlere aktarılır)
+# hem de birleştirmedeki yeniden denemede kontrol edilir.
+# ==============================================
+
+import os
+import time
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Manager
+
+import app.database as database
+from app.deadline import CANCEL_POLL_SECONDS, STOP_CANCELLED, create_deadline, get_stop_reason
+from app.schedule_snapshot import DAY_NAMES, load_schedule_snapshot
+from app.occupancy import is_room_busy, is_instructor_busy, is_supervisor_busy
+from app.instrumentation import merge_profile, summarize_profile
+from app.scheduler import (
+    compute_schedule_in_memory, create_run_state, build_schedule_settings, find_available_supervisors_in_memory,
+    add_placement_in_memory, place_course_in_state, save_placements
+)
+
+
+def find_course_components(courses, graph):
+    """
+    Dersleri birbirini etkilemeyen bağlı bileşenlere ayırır (union-find).
+
+    Parametreler:
+        courses: Ders sözlükleri ('id', 'instructor_id', 'department_id')
+        graph: Çakışma grafı (bkz. app/conflict_graph.py)
+
+    Döndürür:
+        components: [[ders_id, ...], ...] (büyükten küçüğe, eşitlikte en küçük ders ID'si önce)
+    """
+    parent = {}
+
+    def find(item):
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        # Yolu kısalt
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(item_a, item_b):
+        root_a = find(item_a)
+        root_b = find(item_b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    for course in courses:
+        parent[course['id']] = course['id']
+
+    # Aynı hoca veya aynı bölüm: ilk derse bağla
+    first_by_instructor = {}
+    first_by_department = {}
+    for course in courses:
+        course_id = course['id']
+        for key, first in ((course['instructor_id'], first_by_instructor),
+                           (course['department_id'], first_by_department)):
+            if key is None:
+                continue
+            if key in first:
+                union(course_id, first[key])
+            else:
+                first[key] = course_id
+
+    # Ortak öğrenci
+    for course_id in parent:
+        for other_id in graph.get(course_id, {}):
+            if other_id in parent:
+                union(course_id, other_id)
+
+    groups = {}
+    for course_id in parent:
+        groups.setdefault(find(course_id), []).append(course_id)
+
+    components = [sorted(group) for group in groups.values()]
+    components.sort(key=lambda group: (-len(group), group[0]))
+    return components
+
+
+def pack_components(components, batch_count):
+    """
+    Bileşenleri ders sayısı dengeli olacak şekilde gruplara dağıtır.
+    Her bileşen, o ana kadar en az dersi olan gruba eklenir.
+
+    Döndürür:
+        batches: [[ders_id, ...], ...] (boş gruplar hariç)
+    """
+    batch_count = max(1, min(batch_count, len(components)))
+    batches = [[] for _ in range(batch_count)]
+
+    for component in components:
+        smallest = min(range(batch_count), key=lambda i: (len(batches[i]), i))
+        batches[smallest].extend(component)
+
+    return [sorted(batch) for batch in batches if batch]
+
+
+def partition_classrooms(classrooms, demands):
+    """
+    Derslikleri gruplara ihtiyaçlarıyla orantılı olarak dağıtır.
+    Büyükten küçüğe her derslik, kapasitesi ihtiyacına oranla en az olan
+    gruba verilir; böylece her grup hem büyük hem küçük derslik alır.
+
+    Parametreler:
+        classrooms: Derslik sözlükleri ('id', 'capacity')
+        demands: Grup başına ihtiyaç (ör. toplam öğrenci sayısı)
+
+    Döndürür:
+        pools: [[derslik_id, ...], ...] (demands ile aynı sırada)
+    """
+    pools = [[] for _ in demands]
+    assigned = [0] * len(demands)
+
+    for room in sorted(classrooms, key=lambda r: (-r['capacity'], r['id'])):
+        candidates = [i for i in range(len(demands)) if demands[i] > 0]
+        if not candidates:
+            break
+        target = min(candidates, key=lambda i: (assigned[i] / demands[i], i))
+        pools[target].append(room['id'])
+        assigned[target] += room['capacity']
+
+    return pools
+
+
+def build_classroom_pools(settings, courses_by_id, batches):
+    """
+    Normal derslikleri ve laboratuvarları gruplara ayrı ayrı böler.
+
+    Döndürür:
+        pools: [[derslik_id, ...], ...] (batches ile aynı sırada)
+    """
+    normal_demands = []
+    computer_demands = []
+    for course_ids in batches:
+        normal = 0
+        computer = 0
+        for course_id in course_ids:
+            course = courses_by_id[course_id]
+            if 'LAB' in course['code']:
+                computer += course['student_count']
+            else:
+                normal += course['student_count']
+        normal_demands.append(normal)
+        computer_demands.append(computer)
+
+    normal_pools = partition_classrooms(settings['classrooms'], normal_demands)
+    computer_pools = partition_classrooms(settings['computer_classrooms'], computer_demands)
+
+    return [normal_pools[i] + computer_pools[i] for i in range(len(batches))]
+
+
+def build_supervisor_pools(instructor_ids, courses_by_id, batches):
+    """
+    Gözetmenleri gruplara böler. Her hoca kendi dersinin grubunda gözetmenlik
+    yapar (hocanın bütün dersleri aynı bileşendedir); dersi olmayan hocalar
+    ders başına en az gözetmeni olan gruba verilir.
+
+    Döndürür:
+        pools: [[hoca_id, ...], ...] (batches ile aynı sırada)
+    """
+    batch_by_instructor = {}
+    for i, course_ids in enumerate(batches):
+        for course_id in course_ids:
+            batch_by_instructor[courses_by_id[course_id]['instructor_id']] = i
+
+    pools = [[] for _ in batches]
+    for instructor_id in instructor_ids:
+        if instructor_id in batch_by_instructor:
+            pools[batch_by_instructor[instructor_id]].append(instructor_id)
+
+    for instructor_id in instructor_ids:
+        if instructor_id not in batch_by_instructor:
+            target = min(range(len(batches)), key=lambda i: (len(pools[i]) / len(batches[i]), i))
+            pools[target].append(instructor_id)
+
+    return pools
+
+
+def build_schedule_parts(snapshot, settings, batches):
+    """
+    Her grup için planlama parçasını hazırlar (bkz. scheduler.restrict_to_part).
+
+    Döndürür:
+        parts: [{'course_ids', 'classroom_ids', 'supervisor_ids'}, ...]
+    """
+    courses_by_id = {}
+    for course in snapshot['courses']:
+        courses_by_id[course['id']] = course
+
+    classroom_pools = build_classroom_pools(settings, courses_by_id, batches)
+    supervisor_pools = build_supervisor_pools(snapshot['instructor_ids'], courses_by_id, batches)
+
+    parts = []
+    for i, course_ids in enumerate(batches):
+        parts.append({
+            'course_ids': course_ids,
+            'classroom_ids': classroom_pools[i],
+            'supervisor_ids': supervisor_pools[i]
+        })
+    return parts
+
+
+def run_component_batch(database_path, start_date, end_date, ordering, part, improve, supervisor_matching=True,
+                        expires_at=None, deadline=None, cancel_event=None):
+    """
+    Bir ders grubunu kendi derslik ve gözetmen havuzuyla planlar (ayrı işlemde çalışır).
+    Veritabanından sadece okur.
+    expires_at: Ortak bitiş anı (time.time() değeri)
+    deadline: Aynı işlemde çalışırken expires_at ve cancel_event yerine kullanılır
+    cancel_event: İşlemler arası paylaşılan iptal sinyali (Manager().Event())
+
+    Döndürür:
+        batch: {'course_ids', 'placements', 'failed_ids', 'skipped_count', 'stop_reason', 'profile',
+                'supervisor_assignment'}
+    """
+    # Ayrı işlemde config yeniden yüklenir, test veritabanı gibi farklı bir yol varsa onu ayarla
+    database.DATABASE_PATH = database_path
+
+    if deadline is None:
+        deadline = create_deadline(expires_at=expires_at, cancel_event=cancel_event)
+
+    state, result = compute_schedule_in_memory(start_date, end_date, ordering, improve=improve, verbose=False,
+                                               supervisor_matching=supervisor_matching,
+                                               deadline=deadline, part=part)
+
+    batch = {
+        'course_ids': part['course_ids'],
+        'placements': state['placements'],
+        'failed_ids': [course['id'] for course in state['failed_courses']],
+        'skipped_count': result['skipped_count'],
+        'stop_reason': result['stop_reason'],
+        'profile': state['profile'],
+        'supervisor_assignment': result.get('supervisor_assignment')
+    }
+    return batch
+
+
+def merge_supervisor_reports(reports):
+    """
+    Grupların gözetmen eşleştirme raporlarını birleştirir (bkz. supervisors.assign_supervisors).
+
+    Döndürür:
+        report: Toplam sayılar; yük ve süre için grupların en büyüğü / en küçüğü
+    """
+    reports = [report for report in reports if report]
+    if not reports:
+        return None
+
+    merged = {}
+    for name in ('rooms', 'matched', 'reused', 'unmatched', 'unsupervised'):
+        merged[name] = sum(report[name] for report in reports)
+    merged['max_load'] = max(report['max_load'] for report in reports)
+    merged['min_load'] = min(report['min_load'] for report in reports)
+    merged['elapsed'] = max(report['elapsed'] for report in reports)
+    return merged
+
+
+def is_instructor_free(state, instructor_id, placement):
+    """Hocanın ortak durumda o saatte sınavı veya gözetmenliği yok mu?"""
+    occupancy = state['occupancy']
+    exam_date = placement['exam_date']
+    start_minute = placement['start_minute']
+    end_minute = placement['end_minute']
+
+    return not (is_instructor_busy(occupancy, instructor_id, exam_date, start_minute, end_minute)
+                or is_supervisor_busy(occupancy, instructor_id, exam_date, start_minute, end_minute))
+
+
+def merge_placement(state, placement):
+    """
+    Bir grubun yerleşimini ortak duruma eklemeyi dener.
+    Öğrenci ve bölüm kuralları bileşen içinde kaldığı için tekrar kontrol edilmez.
+    Gözetmenlerden biri başka grupta görevliyse gözetmenler yeniden seçilir.
+
+    Döndürür:
+        merged: Eklendi mi? (True/False)
+    """
+    for classroom_id in placement['rooms']:
+        if is_room_busy(state['occupancy'], classroom_id, placement['exam_date'],
+                        placement['start_minute'], placement['end_minute']):
+            return False
+
+    if not is_instructor_free(state, placement['instructor_id'], placement):
+        return False
+
+    supervisors = list(placement['supervisors'])
+    if not all(is_instructor_free(state, supervisor_id, placement) for supervisor_id in set(supervisors)):
+        day_name = DAY_NAMES[datetime.strptime(placement['exam_date'], '%Y-%m-%d').weekday()]
+        available = find_available_supervisors_in_memory(state, day_name, placement['exam_date'],
+                                                         placement['start_minute'], placement['end_minute'],
+                                                         exclude_ids=[placement['instructor_id']])
+        if not available:
+            return False
+        # try_place_course_at ile aynı: sırayla ata, yetmezse sonuncuyu tekrar kullan
+        supervisors = [available[min(i, len(available) - 1)] for i in range(len(placement['rooms']))]
+
+    placement = dict(placement)
+    placement['supervisors'] = supervisors
+    add_placement_in_memory(state, placement)
+    return True
+
+
+def merge_component_batches(state, batches, deadline=None):
+    """
+    Grupların yerleşimlerini ortak duruma ekler.
+    Dersliği veya hocası başka bir grupla çakışan dersler ve kendi derslik
+    havuzunda yerleşemeyen dersler ortak durumda (bütün derslikler ve
+    bütün kurallarla) yeniden denenir. Yeniden denemede her dersten önce
+    süre / iptal kontrol edilir (compute_schedule_in_memory ile aynı);
+    durursa kalan dersler yerleşemeyen sayılır.
+
+    Döndürür:
+        repair: {'conflicts': çakışan ders sayısı, 'retried': havuzu yetmeyen ders sayısı,
+                 'repaired': yeniden denenip yerleşen ders sayısı,
+                 'skipped': süre dolduğu için yeniden denenmeyen ders sayısı,
+                 'stop_reason': durduysa nedeni, yoksa None}
+    """
+    courses_by_id = {}
+    for course in state['snapshot']['courses']:
+        courses_by_id[course['id']] = course
+
+    conflicting = []
+    retried = []
+    for batch in batches:
+        for placement in batch['placements']:
+            if not merge_placement(state, placement):
+                conflicting.append(courses_by_id[placement['course_id']])
+        for course_id in batch['failed_ids']:
+            # Süresi dolan grubun denenmeyen dersleri tekrar denenmez
+            if batch['stop_reason']:
+                state['failed_courses'].append(courses_by_id[course_id])
+            else:
+                retried.append(courses_by_id[course_id])
+
+    # Kalabalık dersler önce (planlamadaki varsayılan sıra)
+    pending = sorted(conflicting + retried, key=lambda course: -course['student_count'])
+
+    repaired = 0
+    skipped = 0
+    stop_reason = None
+    for course in pending:
+        if stop_reason is None:
+            stop_reason = get_stop_reason(deadline)
+        if stop_reason:
+            state['failed_courses'].append(course)
+            skipped += 1
+        elif place_course_in_state(state, course):
+            repaired += 1
+        else:
+            state['failed_courses'].append(course)
+
+    return {'conflicts': len(conflicting), 'retried': len(retried), 'repaired': repaired, 'skipped': skipped,
+            'stop_reason': stop_reason}
+
+
+def generate_component_schedule(start_date, end_date, workers=None, ordering='dsatur', improve=False,
+                                supervisor_matching=True, progress=None, deadline=None, save=True):
+    """
+    Bağımsız ders gruplarını paralel planlar, derslik çakışmalarını birleştirirken çözer.
+
+    Parametreler:
+        start_date: Sınav dönemi başlangıç tarihi (YYYY-MM-DD)
+        end_date: Sınav dönemi bitiş tarihi (YYYY-MM-DD)
+        workers: İşlem sayısı (varsayılan: çekirdek sayısı). Grup sayısı bunu geçmez.
+        ordering: Her grupta kullanılan sıralama stratejisi
+        improve: Her grupta yerel arama yapılsın mı?
+        supervisor_matching: True ise gözetmenler her grupta kendi havuzundan yük dengeli atanır
+        progress: Her grup bitince progress(işlenen ders, yerleşen ders, toplam ders)
+        deadline: Süre sınırı / iptal (bkz. app/deadline.py). Dolunca gruplar o ana
+                  kadarki kısmi programı döndürür; birleştirme yine yapılır ama
+                  çakışan dersler yeniden denenmez.
+        save: False ise program kaydedilmez, result['placements'] ile döndürülür
+              (deneme planlaması, bkz. app/what_if.py)
+
+    Döndürür:
+        result: compute_schedule_in_memory sonucu ile aynı alanlar ve ek olarak
+            'components': Bağımsız bileşen sayısı
+            'batches': Paralel planlanan grup sayısı
+            'repair': Birleştirmede çakışan / yeniden yerleşen ders sayıları
+    """
+    started = time.perf_counter()
+
+    snapshot = load_schedule_snapshot()
+    state = create_run_state(snapshot)
+    state['settings'] = build_schedule_settings(snapshot, start_date, end_date)
+    courses = snapshot['courses']
+
+    components = find_course_components(courses, state['conflict_graph'])
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    batches = pack_components(components, workers)
+
+    parts = build_schedule_parts(snapshot, state['settings'], batches)
+
+    expires_at = deadline['expires_at'] if deadline else None
+    jobs = []
+    for part in parts:
+        jobs.append((database.DATABASE_PATH, start_date, end_date, ordering, part, improve, supervisor_matching,
+                     expires_at))
+
+    outcomes = []
+
+    def report(batch):
+        outcomes.append(batch)
+        if progress:
+            processed = sum(len(outcome['course_ids']) for outcome in outcomes)
+            placed = sum(len(outcome['placements']) for outcome in outcomes)
+            progress(processed, placed, len(courses))
+
+    if len(jobs) <= 1:
+        for job in jobs:
+            report(run_component_batch(*job, deadline=deadline))
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as executor, Manager() as manager:
+            shared_cancel = manager.Event()
+            futures = [executor.submit(run_component_batch, *job, cancel_event=shared_cancel) for job in jobs]
+            pending = set(futures)
+            while pending:
+                # Grupların hepsi gerekli (kısmi de olsa); iptal sadece çalışan işlemlere aktarılır
+                if get_stop_reason(deadline) == STOP_CANCELLED and not shared_cancel.is_set():
+                    shared_cancel.set()
+                done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report(future.result())
+
+    for batch in outcomes:
+        merge_profile(state['profile'], batch['profile'])
+
+    repair = merge_component_batches(state, outcomes, deadline)
+
+    stop_reason = None
+    for batch in outcomes:
+        stop_reason = stop_reason or batch['stop_reason']
+    stop_reason = stop_reason or repair['stop_reason']
+
+    result = {
+        'total_courses': len(courses),
+        'placed_count': len(state['placements']),
+        'failed_count': len(state['failed_courses']),
+        'skipped_count': sum(batch['skipped_count'] for batch in outcomes) + repair['skipped'],
+        'ordering': ordering,
+        'components': len(components),
+        'batches': len(batches),
+        'repair': repair
+    }
+
+    if supervisor_matching:
+        result['supervisor_assignment'] = merge_supervisor_reports(
+            [batch['supervisor_assignment'] for batch in outcomes]
+        )
+
+    result['completed'] = stop_reason is None
+    result['stop_reason'] = stop_reason
+    result['profile'] = summarize_profile(state['profile'], courses, state['failed_courses'],
+                                          time.perf_counter() - started)
+
+    if save:
+        save_placements(state['placements'], (start_date, end_date))
+    else:
+        result['placements'] = state['placements']
+
+    print(f"Bagimsiz parcalar: {len(components)} bilesen, {len(batches)} grup, "
+          f"{repair['conflicts']} cakisma ({repair['repaired']} yeniden yerlesti)")
+
+    return result
@@ -0,0 +1,130 @@
+# ==============================================
+# DERS ÇAKIŞMA GRAFI (Ortak Öğrenci Grafı)
+# ==============================================
+# Bu dosya student_courses tablosunu BİR KERE
+# okuyup dersler arasındaki ortak öğrenci
+# sayılarını hesaplar.
+#
+# Graf seyrek bir komşuluk sözlüğüdür:
+#    graph[ders_a][ders_b] = ortak öğrenci sayısı
+# Ortak öğrencisi olmayan ders çiftleri grafta yer almaz.
+# Sayılar seyrek matris çarpımıyla (Aᵀ·A) hesaplanır,
+# bkz. app/coenrollment.py.
+#
+# Kullanım yerleri:
+#    - Planlama: "bu ders bu slottaki bir dersle çakışır mı?"
+#      sorusu küme kesişimiyle cevaplanır
+#    - Raporlar: çakışan sınav sayısı
+#    - Doğrulama: planlanmış programda öğrenci çakışması var mı?
+# ==============================================
+
+from app.database import execute_query
+from app.coenrollment import (
+    load_incidence_matrix, incidence_from_enrollments, compute_coenrollment, coenrollment_to_graph
+)
+
+
+def load_enrollments():
+    """
+    Öğrenci-ders kayıtlarını okur.
+
+    Döndürür:
+        enrollments: {ders_id: {öğrenci_id, ...}}
+    """
+    rows = execute_query("SELECT student_id, course_id FROM student_courses")
+
+    enrollments = {}
+    for row in rows:
+        course_id = row['course_id']
+        if course_id not in enrollments:
+            enrollments[course_id] = set()
+        enrollments[course_id].add(row['student_id'])
+
+    return enrollments
+
+
+def build_conflict_graph(enrollments=None):
+    """
+    Ders çakışma grafını oluşturur.
+
+    Öğrenci x ders kayıt matrisi A'dan ortak öğrenci matrisi Aᵀ·A
+    vektörel olarak hesaplanır ve sözlüğe çevrilir.
+
+    Parametreler:
+        enrollments: {ders_id: {öğrenci_id, ...}} (opsiyonel)
+                     Verilmezse veritabanından okunur.
+
+    Döndürür:
+        graph: {ders_id: {diğer_ders_id: ortak_öğrenci_sayısı}}
+    """
+    if enrollments is None:
+        incidence = load_incidence_matrix()
+    else:
+        incidence = incidence_from_enrollments(enrollments)
+
+    return coenrollment_to_graph(compute_coenrollment(incidence))
+
+
+def has_conflict_with_any(graph, course_id, course_ids):
+    """
+    Ders, verilen derslerden herhangi biriyle ortak öğrenciye sahip mi?
+
+    Parametreler:
+        graph: Çakışma grafı
+        course_id: Kontrol edilecek ders
+        course_ids: Aynı saatte sınavı olan derslerin kümesi
+
+    Döndürür:
+        has_conflict: True/False
+    """
+    neighbors = graph.get(course_id)
+    if not neighbors or not course_ids:
+        return False
+
+    # Küçük olan küme üzerinde dolaş
+    if len(course_ids) < len(neighbors):
+        for other_id in course_ids:
+            if other_id in neighbors:
+                return True
+        return False
+
+    return not neighbors.keys().isdisjoint(course_ids)
+
+
+def find_student_clashes(graph, exams):
+    """
+    Planlanmış sınavlar içinde öğrenci çakışmalarını bulur (doğrulama).
+
+    Parametreler:
+        graph: Çakışma grafı
+        exams: exam_schedule satırları (course_id, exam_date, start_time, end_time)
+
+    Döndürür:
+        clashes: [(ders_a, ders_b, tarih, ortak_öğrenci), ...]
+    """
+    # Aynı dersin birden fazla derslik satırını tek sınav say
+    exams_by_date = {}
+    seen = set()
+    for exam in exams:
+        key = (exam['course_id'], exam['exam_date'], exam['start_time'], exam['end_time'])
+        if key in seen:
+            continue
+        seen.add(key)
+        if exam['exam_date'] not in exams_by_date:
+            exams_by_date[exam['exam_date']] = []
+        exams_by_date[exam['exam_date']].append(key)
+
+    clashes = []
+    for exam_date in exams_by_date:
+        day_exams = exams_by_date[exam_date]
+        for i in range(len(day_exams)):
+            course_a, _, start_a, end_a = day_exams[i]
+            neighbors = graph.get(course_a, {})
+            for j in range(i + 1, len(day_exams)):
+                course_b, _, start_b, end_b = day_exams[j]
+                if course_b == course_a or course_b not in neighbors:
+                    continue
+                if start_a < end_b and end_a > start_b:
+                    clashes.append((course_a, course_b, exam_date, neighbors[course_b]))
+
+    return clashes
@@ -13,6 +13,10 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import DATABASE_PATH, BASE_DIR
 
+# Sorgu izleme (ölçüm için, bkz. app/benchmark.py)
+# Bir fonksiyon atanırsa her bağlantıda çalışan her SQL komutu ile çağrılır
+query_trace = None
+
 
 def get_db_connection():
     """
@@ -31,6 +35,10 @@ def get_db_connection():
     # Bu sayede sütun ismiyle erişebiliriz: row['name']
     connection.row_factory = sqlite3.Row
     
+    # Ölçüm açıksa çalışan SQL komutlarını bildir
+    if query_trace is not None:
+        connection.set_trace_callback(query_trace)
+    
     return connection
 
 
@@ -58,8 +66,63 @@ def init_database():
     connection = get_db_connection()
     cursor = connection.cursor()
     
+    # WAL modu: planlama yazarken sayfalar beklemeden okumaya devam eder
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
+    # Eski veritabanı: exam_schedule tablo ise sürümlü yapıya taşınacak
+    cursor.execute("SELECT type FROM sqlite_master WHERE name = 'exam_schedule'")
+    row = cursor.fetchone()
+    migrate_versions = row is not None and row['type'] == 'table'
+    if migrate_versions:
+        cursor.execute("ALTER TABLE exam_schedule RENAME TO exam_schedule_legacy")
+
+    # Sürümlü ama tam sayı saat sütunları olmayan veritabanı: sütunlar eklenip doldurulur
+    cursor.execute("PRAGMA table_info(exam_schedule_versions)")
+    version_columns = [column['name'] for column in cursor.fetchall()]
+    if version_columns and 'date_ord' not in version_columns:
+        migration_path = os.path.join(BASE_DIR, 'database', 'migrate_exam_time_columns.sql')
+        migration_file = open(migration_path, 'r', encoding='utf-8')
+        cursor.executescript(migration_file.read())
+        migration_file.close()
+
+    # Sınav dönemi sütunları olmayan sürüm tablosu: sütunlar eklenir
+    cursor.execute("PRAGMA table_info(schedule_versions)")
+    schedule_version_columns = [column['name'] for column in cursor.fetchall()]
+    if schedule_version_columns and 'start_date' not in schedule_version_columns:
+        cursor.execute("ALTER TABLE schedule_versions ADD COLUMN start_date TEXT")
+        cursor.execute("ALTER TABLE schedule_versions ADD COLUMN end_date TEXT")
+
+    # Canlılık sinyali sütunu olmayan iş tablosu: sütun eklenir
+    cursor.execute("PRAGMA table_info(generation_jobs)")
+    job_columns = [column['name'] for column in cursor.fetchall()]
+    if job_columns and 'heartbeat_at' not in job_columns:
+        cursor.execute("ALTER TABLE generation_jobs ADD COLUMN heartbeat_at TEXT")
+
+    # Temel sürüm sütunu olmayan taslak tablosu: sütun eklenir
+    cursor.execute("PRAGMA table_info(schedule_drafts)")
+    draft_columns = [column['name'] for column in cursor.fetchall()]
+    if draft_columns and 'base_version_id' not in draft_columns:
+        cursor.execute("ALTER TABLE schedule_drafts ADD COLUMN base_version_id INTEGER")
+
+    # Doluluk R*Tree aynası yoksa schema.sql oluşturduktan sonra mevcut sınavlarla doldurulur
+    cursor.execute("SELECT name FROM sqlite_master WHERE name = 'exam_schedule_rtree'")
+    fill_rtree = cursor.fetchone() is None
+
     # SQL komutlarını çalıştır (tabloları oluştur)
     cursor.executescript(schema_sql)
+
+    if fill_rtree:
+        migration_path = os.path.join(BASE_DIR, 'database', 'migrate_exam_schedule_rtree.sql')
+        migration_file = open(migration_path, 'r', encoding='utf-8')
+        cursor.executescript(migration_file.read())
+        migration_file.close()
+    
+    # Eski sınavları ilk sürüm olarak yayınla
+    if migrate_versions:
+        migration_path = os.path.join(BASE_DIR, 'database', 'migrate_exam_schedule_versions.sql')
+        migration_file = open(migration_path, 'r', encoding='utf-8')
+        cursor.executescript(migration_file.read())
+        migration_file.close()
     
     # Değişiklikleri kaydet
     connection.commit()
@@ -269,3 +332,35 @@ def execute_update(query, parameters):
     
     return affected_rows
 
+
+def execute_many(query, parameter_list):
+    """
+    Aynı INSERT/UPDATE sorgusunu birden fazla parametre ile çalıştırır.
+    Tüm satırlar TEK bir işlemde (transaction) yazılır, tek commit yapılır.
+    
+    Parametreler:
+        query: SQL sorgusu
+        parameter_list: Parametre listesi [(...), (...), ...]
+    
+    Döndürür:
+        affected_rows: Etkilenen satır sayısı
+    """
+    # Veritabanına bağlan
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        # Tüm satırları tek seferde çalıştır
+        cursor.executemany(query, parameter_list)
+        
+        # Değişiklikleri kaydet (tek commit)
+        connection.commit()
+    except Exception:
+        # Hata olursa hiçbir satır yazılmasın
+        connection.rollback()
+        raise
+    finally:
+        # Bağlantıyı kapat
+        connection.close()
+    
+    return cursor.rowcount
@@ -0,0 +1,121 @@
+# ==============================================
+# GÜNLÜK YÜK SAYAÇLARI (Dengeli gün seçimi)
+# ==============================================
+# Planlama günleri takvim sırasıyla deniyordu; ilk
+# günler dolunca sonrakilere geçiliyordu. Günleri
+# yoğunluğa göre sıralamak için her ders ve her gün
+# için bir COUNT sorgusu gerekirdi
+# (get_day_exam_count), bu yüzden kapalıydı.
+#
+# Bu dosya yükü bellekte sayar:
+#    - Her gün için: sınav, öğrenci (koltuk), derslik
+#    - Her (gün, slot) için: aynı üç sayı
+# Sayaçlar her yerleşimde güncellenir.
+#
+# Bir ders yerleştirilirken günler bir öncelik
+# kuyruğundan (heapq) en az yüklü olan önce çekilir;
+# gün içindeki slotlar da en az yüklü önce denenir.
+# Eşitlikte takvim / saat sırası korunur, yani boş
+# bir programda ilk ders yine ilk güne ve ilk slota
+# gider. Maliyet ders başına O(gün log gün).
+# ==============================================
+
+import heapq
+
+
+def create_day_load_index(seats_by_course, enabled=True):
+    """
+    Boş bir günlük yük indeksi oluşturur.
+
+    Parametreler:
+        seats_by_course: {ders_id: öğrenci sayısı}
+        enabled: False ise günler takvim sırasıyla denenir (sayaçlar yine tutulur)
+
+    Döndürür:
+        index: Sözlük
+            'seats': Ders -> öğrenci sayısı
+            'enabled': Dengeli sıralama açık mı?
+            'days': {tarih: [sınav, öğrenci, derslik]}
+            'slots': {(tarih, başlangıç_dk): [sınav, öğrenci, derslik]}
+    """
+    index = {
+        'seats': seats_by_course,
+        'enabled': enabled,
+        'days': {},
+        'slots': {}
+    }
+    return index
+
+
+def update_day_load(index, course_id, exam_date, start_minute, room_count, sign):
+    """Gün ve slot sayaçlarına bir sınavı ekler (sign=1) veya çıkarır (sign=-1)."""
+    seats = index['seats'].get(course_id, 0)
+    for table, key in ((index['days'], exam_date), (index['slots'], (exam_date, start_minute))):
+        load = table.get(key)
+        if load is None:
+            load = [0, 0, 0]
+            table[key] = load
+        load[0] += sign
+        load[1] += sign * seats
+        load[2] += sign * room_count
+
+
+def add_exam_to_day_load(index, course_id, exam_date, start_minute, room_count):
+    """Yerleşen sınavı günlük yük sayaçlarına ekler."""
+    update_day_load(index, course_id, exam_date, start_minute, room_count, 1)
+
+
+def remove_exam_from_day_load(index, course_id, exam_date, start_minute, room_count):
+    """add_exam_to_day_load ile eklenen sınavı geri alır."""
+    update_day_load(index, course_id, exam_date, start_minute, room_count, -1)
+
+
+def iterate_balanced_days(index, exam_days):
+    """
+    Günleri en az yüklü olandan başlayarak döndürür (öncelik kuyruğu).
+    Dengeleme kapalıysa takvim sırası.
+    """
+    if not index['enabled']:
+        for exam_date in exam_days:
+            yield exam_date
+        return
+
+    empty = (0, 0, 0)
+    heap = []
+    for position, exam_date in enumerate(exam_days):
+        heap.append((tuple(index['days'].get(exam_date, empty)), position, exam_date))
+    heapq.heapify(heap)
+
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def order_day_slots(index, exam_date, slots, covered_of=None):
+    """
+    Bir günün slotlarını en az yüklü olandan başlayarak sıralar (eşitlikte saat sırası).
+
+    Parametreler:
+        slots: Slot listesi
+        covered_of: Slotun kapladığı slot başlangıçlarını (dakika) veren fonksiyon
+                    (varsayılan: slotun kendisi bir başlangıç dakikasıdır)
+    """
+    if not index['enabled']:
+        return slots
+
+    empty = (0, 0, 0)
+    slot_loads = index['slots']
+
+    def load_key(item):
+        position, slot = item
+        if covered_of is None:
+            return (tuple(slot_loads.get((exam_date, slot), empty)), position)
+        # Sınav birden fazla slota taşıyorsa yükler toplanır
+        total = [0, 0, 0]
+        for start_minute in covered_of(slot):
+            load = slot_loads.get((exam_date, start_minute), empty)
+            total[0] += load[0]
+            total[1] += load[1]
+            total[2] += load[2]
+        return (tuple(total), position)
+
+    return [slot for _, slot in sorted(enumerate(slots), key=load_key)]
@@ -0,0 +1,76 @@
+# ==============================================
+# PLANLAMA SÜRE SINIRI VE İPTAL
+# ==============================================
+# Planlama ya sonuna kadar çalışıyordu ya da
+# isteği kilitliyordu. Bu dosya planlamaya bir
+# süre sınırı (deadline) ve iptal sinyali ekler.
+#
+# Planlama her dersten önce get_stop_reason ile
+# durması gerekip gerekmediğine bakar (kooperatif
+# iptal). Durursa o ana kadar bulunan (kısmi)
+# program kaydedilir ve sonuçta 'completed': False
+# ve 'stop_reason' döner.
+#
+# Bitiş anı duvar saatiyle (time.time) tutulur;
+# böylece paralel denemelerde (ayrı işlemler)
+# aynı bitiş anı kullanılabilir.
+# ==============================================
+
+import time
+
+# Durma nedenleri
+STOP_TIME_LIMIT = 'süre doldu'
+STOP_CANCELLED = 'iptal edildi'
+
+# Paralel işler beklenirken iptal sinyaline kaç saniyede bir bakılır
+# (bkz. app/multistart.py, app/components.py)
+CANCEL_POLL_SECONDS = 0.2
+
+
+def create_deadline(time_limit=None, cancel_event=None, expires_at=None):
+    """
+    Süre sınırı sözlüğü oluşturur.
+
+    Parametreler:
+        time_limit: Şu andan itibaren en fazla süre (saniye), None ise sınırsız
+        cancel_event: threading.Event; set edilirse planlama durur
+        expires_at: Doğrudan bitiş anı (time.time() değeri), time_limit yerine
+
+    Döndürür:
+        deadline: {'expires_at', 'cancel_event'}
+    """
+    if expires_at is None and time_limit is not None:
+        expires_at = time.time() + time_limit
+
+    return {
+        'expires_at': expires_at,
+        'cancel_event': cancel_event
+    }
+
+
+def get_stop_reason(deadline):
+    """
+    Planlama durmalı mı?
+
+    Döndürür:
+        reason: STOP_CANCELLED, STOP_TIME_LIMIT veya None (devam)
+    """
+    if deadline is None:
+        return None
+
+    cancel_event = deadline['cancel_event']
+    if cancel_event is not None and cancel_event.is_set():
+        return STOP_CANCELLED
+
+    expires_at = deadline['expires_at']
+    if expires_at is not None and time.time() >= expires_at:
+        return STOP_TIME_LIMIT
+
+    return None
+
+
+def get_remaining_time(deadline):
+    """Kalan süre (saniye), sınır yoksa None. Süre dolduysa 0."""
+    if deadline is None or deadline['expires_at'] is None:
+        return None
+    return max(0.0, deadline['expires_at'] - time.time())
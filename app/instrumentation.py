@@ -0,0 +1,192 @@
+# ==============================================
+# PLANLAMA ÖLÇÜMLERİ (Profil)
+# ==============================================
+# Bir ders yerleşemediğinde sadece "yerlestirilemedi"
+# yazıyordu; hangi kuralın engellediği ve sürenin
+# nereye gittiği bilinmiyordu.
+#
+# Bu dosya planlama sırasında şunları sayar:
+#    - Her kontrol için çağrı sayısı ve toplam süre
+#      (derslik, hoca müsaitliği, hoca çakışması,
+#       gözetmen, öğrenci çakışması, öğrenci günlük
+#       yükü, bölüm aralığı)
+#    - Her ders için denenen slot sayısı
+#    - Her reddedilen slotun nedeni
+#
+# Ölçümler planlama durumunda (state['profile'])
+# tutulur ve sonuç sözlüğüne eklenir. Sayaçlar
+# sözlük güncellemesi ve perf_counter çağrısından
+# ibarettir; üretimde açık bırakılabilir.
+# ==============================================
+
+import json
+import time
+
+# Kontrol / red nedeni adları (rescheduling.find_invalid_reason ile aynı dil)
+CHECK_DURATION = 'süre'
+CHECK_DEPARTMENT = 'bölüm aralığı'
+CHECK_INSTRUCTOR_AVAILABILITY = 'hoca müsaitliği'
+CHECK_INSTRUCTOR_CONFLICT = 'hoca çakışması'
+CHECK_STUDENT = 'öğrenci çakışması'
+CHECK_STUDENT_LOAD = 'öğrenci günlük yükü'
+CHECK_ROOM = 'derslik'
+CHECK_SUPERVISOR = 'gözetmen'
+
+# Ortak gün kuralı (sadece belirli bir güne yerleştirmede)
+CHECK_COMMON_DAY = 'ortak gün'
+
+
+def create_profile():
+    """
+    Boş bir ölçüm sözlüğü oluşturur.
+
+    Döndürür:
+        profile: Sözlük
+            'checks': {kontrol: [çağrı sayısı, toplam süre]}
+            'rejections': {neden: reddedilen slot sayısı}
+            'courses': {ders_id: {'attempts': slot sayısı, 'rejections': {neden: sayı}}}
+    """
+    return {
+        'checks': {},
+        'rejections': {},
+        'courses': {}
+    }
+
+
+def record_check(profile, name, started):
+    """
+    Bir kontrolün süresini kaydeder.
+
+    Parametreler:
+        profile: Ölçüm sözlüğü
+        name: Kontrol adı
+        started: Kontrol başlamadan önce alınan time.perf_counter() değeri
+    """
+    elapsed = time.perf_counter() - started
+    entry = profile['checks'].get(name)
+    if entry is None:
+        profile['checks'][name] = [1, elapsed]
+    else:
+        entry[0] += 1
+        entry[1] += elapsed
+
+
+def record_attempt(profile, course_id, slots=1):
+    """Ders için denenen slot sayısını artırır."""
+    course = profile['courses'].get(course_id)
+    if course is None:
+        course = {'attempts': 0, 'rejections': {}}
+        profile['courses'][course_id] = course
+    course['attempts'] += slots
+
+
+def record_rejection(profile, course_id, reason, slots=1):
+    """
+    Reddedilen slot(lar)ı nedeniyle birlikte kaydeder.
+
+    Parametreler:
+        profile: Ölçüm sözlüğü
+        course_id: Ders ID'si
+        reason: Red nedeni (CHECK_* sabitlerinden biri)
+        slots: Aynı nedenle reddedilen slot sayısı (ör. bölüm aralığı tüm günü kapatır)
+    """
+    profile['rejections'][reason] = profile['rejections'].get(reason, 0) + slots
+
+    course = profile['courses'].get(course_id)
+    if course is None:
+        course = {'attempts': 0, 'rejections': {}}
+        profile['courses'][course_id] = course
+    course['rejections'][reason] = course['rejections'].get(reason, 0) + slots
+
+
+def get_main_reason(profile, course_id):
+    """Ders için en çok slotu reddeden neden (yoksa None)."""
+    course = profile['courses'].get(course_id)
+    if course is None or not course['rejections']:
+        return None
+    return max(course['rejections'].items(), key=lambda item: item[1])[0]
+
+
+def merge_profile(profile, other):
+    """
+    Başka bir planlamanın ölçümlerini profile ekler
+    (ayrı işlemlerde planlanan parçaları birleştirmek için, bkz. app/components.py).
+    """
+    for name, (count, total_time) in other['checks'].items():
+        entry = profile['checks'].get(name)
+        if entry is None:
+            profile['checks'][name] = [count, total_time]
+        else:
+            entry[0] += count
+            entry[1] += total_time
+
+    for reason, slots in other['rejections'].items():
+        profile['rejections'][reason] = profile['rejections'].get(reason, 0) + slots
+
+    for course_id, data in other['courses'].items():
+        course = profile['courses'].get(course_id)
+        if course is None:
+            course = {'attempts': 0, 'rejections': {}}
+            profile['courses'][course_id] = course
+        course['attempts'] += data['attempts']
+        for reason, slots in data['rejections'].items():
+            course['rejections'][reason] = course['rejections'].get(reason, 0) + slots
+
+
+def summarize_profile(profile, courses, failed_courses, elapsed=None):
+    """
+    Ölçümleri sonuç sözlüğüne konacak (JSON uyumlu) özete çevirir.
+
+    Parametreler:
+        profile: Ölçüm sözlüğü
+        courses: Planlanan dersler (ID -> kod eşlemesi için)
+        failed_courses: Yerleşemeyen dersler
+        elapsed: Planlamanın toplam süresi (saniye)
+
+    Döndürür:
+        summary: Sözlük
+            'checks': {kontrol: {'count', 'time'}}
+            'rejections': {neden: slot sayısı}
+            'slot_attempts': Toplam denenen slot
+            'courses': {ders_kodu: {'attempts', 'rejections'}}
+            'failed': {ders_kodu: en sık red nedeni}
+            'elapsed': Toplam süre
+    """
+    code_by_id = {}
+    for course in courses:
+        code_by_id[course['id']] = course['code']
+
+    checks = {}
+    for name, (count, total_time) in profile['checks'].items():
+        checks[name] = {'count': count, 'time': round(total_time, 4)}
+
+    course_summary = {}
+    slot_attempts = 0
+    for course_id, data in profile['courses'].items():
+        slot_attempts += data['attempts']
+        course_summary[code_by_id.get(course_id, str(course_id))] = {
+            'attempts': data['attempts'],
+            'rejections': dict(data['rejections'])
+        }
+
+    failed = {}
+    for course in failed_courses:
+        failed[course['code']] = get_main_reason(profile, course['id'])
+
+    summary = {
+        'checks': checks,
+        'rejections': dict(profile['rejections']),
+        'slot_attempts': slot_attempts,
+        'courses': course_summary,
+        'failed': failed
+    }
+    if elapsed is not None:
+        summary['elapsed'] = round(elapsed, 3)
+
+    return summary
+
+
+def dump_profile(summary, file_path):
+    """Profil özetini JSON dosyasına yazar."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,288 @@
+# ==============================================
+# ARKA PLAN PLANLAMA İŞLERİ
+# ==============================================
+# Otomatik planlama uzun sürebilir. POST isteği
+# içinde çalıştırılırsa web işçisi dakikalarca
+# meşgul kalır ve tarayıcı zaman aşımına düşer.
+#
+# Bu dosya planlamayı arka plan iş parçacığında
+# (thread) çalıştırır:
+#    1. İstek bir iş kaydı oluşturur (generation_jobs)
+#    2. İş parçacığı planlamayı başlatır, ilerlemeyi
+#       (işlenen / yerleşen / toplam ders) tabloya yazar
+#    3. Planlama sayfası /schedule/jobs/<id> adresini
+#       sorgulayarak ilerlemeyi gösterir
+#
+# Aynı anda sadece bir iş çalışır. Bir iş varken
+# gelen yeni istek çalışan işi geri döndürür.
+#
+# Çalışan iş, hangi işlemde (web işçisi) olursa
+# olsun, iş kaydına düzenli canlılık sinyali
+# (heartbeat_at) yazar: ilerleme bildiriminde ve
+# ilerleme gelmese de (ör. uzun bir çoklu deneme)
+# HEARTBEAT_INTERVAL saniyede bir. Sinyali kesilen
+# iş yarıda kalmış sayılır.
+#
+# Çalışan iş iptal edilebilir (cancel_generation_job):
+# planlama bir sonraki derste durur ve o ana kadar
+# bulunan program kaydedilir (bkz. app/deadline.py).
+#
+# Yönetim sayfalarındaki düzenlemelerden sonraki
+# artımlı yeniden planlama da aynı iş tablosunda
+# çalışır (start_reschedule_job). Böylece çalışan
+# bir planlamayla aynı anda programa yazamaz.
+# ==============================================
+
+import json
+import threading
+import time
+
+from app.database import execute_query
+from app.models.exam import get_published_period
+from app.models.job import (
+    JOB_DONE, JOB_FAILED,
+    get_job_by_id, get_active_job, create_job_if_idle, mark_job_running,
+    update_job_progress, touch_job_heartbeat, finish_job, fail_job, get_job_heartbeat_age
+)
+
+# İlerleme en fazla bu sıklıkla (saniye) veritabanına yazılır
+PROGRESS_INTERVAL = 0.5
+
+# Çalışan iş canlılık sinyalini bu sıklıkla (saniye) yazar
+HEARTBEAT_INTERVAL = 10
+
+# Bu süre (saniye) canlılık sinyali yazmayan iş yarıda kalmış sayılır
+# (ör. sunucu yeniden başlatıldı)
+STALE_JOB_SECONDS = 60
+
+# Bu işlemde çalışan iş parçacıkları {iş_id: thread}
+running_threads = {}
+threads_lock = threading.Lock()
+
+# Çalışan işlerin iptal sinyalleri {iş_id: threading.Event}
+cancel_events = {}
+
+
+def is_job_alive(job_id):
+    """İş bu işlemde hâlâ çalışıyor mu?"""
+    with threads_lock:
+        thread = running_threads.get(job_id)
+    return thread is not None and thread.is_alive()
+
+
+def release_stale_job():
+    """
+    Çalışıyor görünen ama artık canlılık sinyali yazmayan işi hata olarak kapatır.
+    Böylece yarıda kalan bir iş yeni planlamaları sonsuza kadar engellemez.
+    Başka bir işlemde çalışan iş de sinyal yazdığı sürece kapatılmaz.
+    """
+    job = get_active_job()
+    if job is None or is_job_alive(job['id']):
+        return
+
+    age = get_job_heartbeat_age(job['id'])
+    if age is not None and age > STALE_JOB_SECONDS:
+        fail_job(job['id'], 'İş yarıda kaldı (sunucu yeniden başlatılmış olabilir).')
+
+
+def start_heartbeat(job_id):
+    """
+    İlerleme gelmese de iş canlı görünsün diye canlılık sinyali yazan
+    iş parçacığını başlatır.
+
+    Döndürür:
+        stop_event: Set edilince sinyal durur
+    """
+    stop_event = threading.Event()
+
+    def heartbeat():
+        while not stop_event.wait(HEARTBEAT_INTERVAL):
+            touch_job_heartbeat(job_id)
+
+    threading.Thread(target=heartbeat, daemon=True).start()
+    return stop_event
+
+
+def start_job_thread(job_id, target, args, cancel_event=None):
+    """İş fonksiyonunu arka plan iş parçacığında başlatır ve kaydeder."""
+    thread = threading.Thread(target=target, args=(job_id,) + args, daemon=True)
+    with threads_lock:
+        running_threads[job_id] = thread
+        if cancel_event is not None:
+            cancel_events[job_id] = cancel_event
+    thread.start()
+
+
+def run_generation_job(job_id, start_date, end_date, options, cancel_event=None):
+    """
+    Planlama işini çalıştırır (arka plan iş parçacığında).
+    Sonuç veya hata iş kaydına yazılır.
+    """
+    # Döngüsel import olmasın diye burada import edilir
+    from app.scheduler import generate_exam_schedule
+
+    mark_job_running(job_id)
+    last_write = [0.0]
+    stop_heartbeat = start_heartbeat(job_id)
+
+    def progress(processed_count, placed_count, total_courses):
+        now = time.perf_counter()
+        if now - last_write[0] < PROGRESS_INTERVAL and processed_count < total_courses:
+            return
+        last_write[0] = now
+        update_job_progress(job_id, processed_count, placed_count, total_courses)
+
+    try:
+        result = generate_exam_schedule(start_date, end_date, progress=progress, cancel_event=cancel_event,
+                                        **options)
+
+        message = None
+        if not result.get('completed', True):
+            message = (f"Planlama durduruldu ({result['stop_reason']}), "
+                       f"o ana kadar bulunan program kaydedildi.")
+
+        finish_job(job_id, result['placed_count'], result['total_courses'], result['failed_count'],
+                   json.dumps(result, default=str, ensure_ascii=False), message)
+    except Exception as error:
+        fail_job(job_id, str(error))
+    finally:
+        stop_heartbeat.set()
+        with threads_lock:
+            running_threads.pop(job_id, None)
+            cancel_events.pop(job_id, None)
+
+
+def start_generation_job(start_date, end_date, **options):
+    """
+    Planlama işini arka planda başlatır.
+    Çalışan bir iş varsa yenisini başlatmaz, çalışan işi döndürür.
+
+    Parametreler:
+        start_date: Sınav dönemi başlangıç tarihi (YYYY-MM-DD)
+        end_date: Sınav dönemi bitiş tarihi (YYYY-MM-DD)
+        options: generate_exam_schedule parametreleri (ordering, improve, attempts, time_limit)
+
+    Döndürür:
+        (job, created): İş kaydı ve yeni oluşturuldu mu? (True/False)
+    """
+    release_stale_job()
+
+    job_id, created = create_job_if_idle(start_date, end_date, json.dumps(options))
+
+    if created:
+        cancel_event = threading.Event()
+        start_job_thread(job_id, run_generation_job, (start_date, end_date, options, cancel_event),
+                         cancel_event)
+
+    return get_job_by_id(job_id), created
+
+
+def run_reschedule_job(job_id, start_date, end_date, scope):
+    """
+    Artımlı yeniden planlama işini çalıştırır (arka plan iş parçacığında).
+    İşlenen ders sayısı geçersiz kalan sınav sayısıdır.
+    """
+    from app.rescheduling import reschedule_incrementally, describe_reschedule_result
+
+    mark_job_running(job_id)
+    stop_heartbeat = start_heartbeat(job_id)
+
+    try:
+        result = reschedule_incrementally(start_date, end_date, verbose=False, scope=scope)
+        finish_job(job_id, result['replaced_count'], len(result['invalidated']), result['failed_count'],
+                   json.dumps(result, default=str, ensure_ascii=False), describe_reschedule_result(result))
+    except Exception as error:
+        fail_job(job_id, str(error))
+    finally:
+        stop_heartbeat.set()
+        with threads_lock:
+            running_threads.pop(job_id, None)
+
+
+def start_reschedule_job(scope):
+    """
+    Bir düzenlemeden etkilenen sınavların artımlı yeniden planlamasını
+    arka planda başlatır. Dönem yayındaki programın dönemidir.
+
+    Parametreler:
+        scope: Düzenlenen kayıtlar, bkz. app.rescheduling.placement_in_scope
+
+    Döndürür:
+        (job, created): İş kaydı ve yeni oluşturuldu mu? Yayında program
+                        yoksa (None, False). Başka bir iş çalışıyorsa
+                        çalışan iş ve False.
+    """
+    period = get_published_period()
+    if period is None:
+        # Dönemi kaydedilmemiş eski sürüm: programdaki ilk ve son gün
+        row = execute_query("SELECT MIN(exam_date) AS first_day, MAX(exam_date) AS last_day FROM exam_schedule")[0]
+        if row['first_day'] is None:
+            return None, False
+        period = (row['first_day'], row['last_day'])
+
+    release_stale_job()
+
+    options = {'reschedule': scope}
+    job_id, created = create_job_if_idle(period[0], period[1], json.dumps(options))
+
+    if created:
+        start_job_thread(job_id, run_reschedule_job, (period[0], period[1], scope))
+
+    return get_job_by_id(job_id), created
+
+
+def cancel_generation_job(job_id):
+    """
+    Çalışan işe iptal sinyali gönderir. Planlama bir sonraki derste
+    durur ve o ana kadar bulunan programı kaydeder.
+
+    Döndürür:
+        True: Sinyal gönderildi, False: İş bu işlemde çalışmıyor
+    """
+    with threads_lock:
+        cancel_event = cancel_events.get(job_id)
+    if cancel_event is None:
+        return False
+
+    cancel_event.set()
+    return True
+
+
+def wait_for_job(job_id, timeout=None):
+    """
+    İş bitene kadar bekler (testler ve komut satırı için).
+
+    Döndürür:
+        job: Son iş kaydı
+    """
+    with threads_lock:
+        thread = running_threads.get(job_id)
+    if thread is not None:
+        thread.join(timeout)
+
+    return get_job_by_id(job_id)
+
+
+def job_to_dict(job):
+    """
+    İş kaydını durum sorgusu (JSON) için sözlüğe çevirir.
+    """
+    total = job['total_courses'] or 0
+    percent = int(job['processed_count'] * 100 / total) if total else 0
+    if job['status'] in (JOB_DONE, JOB_FAILED):
+        percent = 100 if job['status'] == JOB_DONE else percent
+
+    return {
+        'id': job['id'],
+        'status': job['status'],
+        'start_date': job['start_date'],
+        'end_date': job['end_date'],
+        'processed_count': job['processed_count'],
+        'placed_count': job['placed_count'],
+        'total_courses': total,
+        'failed_count': job['failed_count'],
+        'percent': percent,
+        'message': job['message'],
+        'cancellable': is_job_alive(job['id']),
+        'finished': job['status'] in (JOB_DONE, JOB_FAILED)
+    }
@@ -0,0 +1,209 @@
+# ==============================================
+# YEREL ARAMA İLE İYİLEŞTİRME (Tabu Arama)
+# ==============================================
+# Greedy yerleştirme bir kararı asla geri almaz.
+# Yerleşemeyen bir ders, daha önce yerleşmiş bir
+# sınav başka bir slota kaydırılsa yer bulabilir.
+#
+# Bu dosya greedy sonrası isteğe bağlı bir
+# iyileştirme adımı sağlar. Tüm işlemler bellek
+# içindeki planlama durumu (state) üzerinde yapılır,
+# SQLite'a hiç sorgu atılmaz.
+#
+# Komşuluklar:
+#    - TAŞIMA (move): Yerleşemeyen dersin önündeki bir
+#      sınavı çıkar, dersi yerleştir, çıkarılan sınavı
+#      başka bir slota taşı.
+#    - DEĞİŞTİRME (swap): İki yerleşmiş sınavın slotlarını
+#      değiştir (aramayı çeşitlendirir).
+#
+# Her hamle sadece değişen sınavları indeksten
+# çıkarıp ekleyerek değerlendirilir (artımlı delta).
+# Kötüleştiren hamleler geri alınır; aynı kalan
+# hamleler tabu listesi ile döngüye girmeden kabul edilir.
+# ==============================================
+
+import random
+import time
+
+from app.deadline import get_stop_reason
+from app.scheduler import (
+    place_course_in_state, try_place_course_in_state_at,
+    add_placement_in_memory, remove_placement_in_memory
+)
+
+
+def find_blocking_placements(state, course):
+    """
+    Dersin yerleşmesini engelleyen olası sınavları bulur:
+    ortak öğrencili dersler, aynı hocanın dersleri ve
+    aynı bölümün dersleri.
+
+    Döndürür:
+        blockers: Yerleşim listesi
+    """
+    neighbors = state['conflict_graph'].get(course['id'], {})
+    blockers = []
+
+    for placement in state['placements']:
+        if placement['course_id'] in neighbors:
+            blockers.append(placement)
+        elif placement['instructor_id'] == course['instructor_id']:
+            blockers.append(placement)
+        elif course['instructor_id'] in placement['supervisors']:
+            blockers.append(placement)
+        elif placement['department_id'] == course['department_id']:
+            blockers.append(placement)
+
+    return blockers
+
+
+def try_move(state, course, courses_by_id, rng, tabu, iteration, tabu_tenure):
+    """
+    TAŞIMA hamlesi: Engelleyen bir sınavı çıkarıp dersi yerleştirmeyi dener.
+
+    Döndürür:
+        result: (delta, çıkarılan_ders) veya None (hamle geri alındı)
+                delta -1: iyileşme, 0: eşit (çıkarılan ders yerleşemedi)
+    """
+    blockers = [p for p in find_blocking_placements(state, course)
+                if tabu.get(p['course_id'], -1) < iteration]
+    if not blockers:
+        return None
+
+    ejected = rng.choice(blockers)
+    ejected_course = courses_by_id[ejected['course_id']]
+
+    remove_placement_in_memory(state, ejected)
+
+    new_placement = place_course_in_state(state, course)
+    if new_placement is None:
+        # Ders yine yerleşmedi, geri al
+        add_placement_in_memory(state, ejected)
+        return None
+
+    # Çıkarılan sınavı başka bir yere taşı
+    if place_course_in_state(state, ejected_course) is not None:
+        tabu[ejected['course_id']] = iteration + tabu_tenure
+        return (-1, ejected_course)
+
+    # Eşit hamle: ders yerleşti, çıkarılan ders yerleşemedi.
+    # Yeni yerleşen ders bir süre tekrar çıkarılmasın (tabu)
+    tabu[course['id']] = iteration + tabu_tenure
+    return (0, ejected_course)
+
+
+def try_swap(state, courses_by_id, rng):
+    """
+    DEĞİŞTİRME hamlesi: İki sınavın gün/saatlerini değiştirmeyi dener.
+    Yerleşen ders sayısını değiştirmez, sadece aramayı çeşitlendirir.
+
+    Döndürür:
+        success: Değişim yapıldı mı?
+    """
+    if len(state['placements']) < 2:
+        return False
+
+    first, second = rng.sample(state['placements'], 2)
+    if (first['exam_date'], first['start_minute']) == (second['exam_date'], second['start_minute']):
+        return False
+
+    first_course = courses_by_id[first['course_id']]
+    second_course = courses_by_id[second['course_id']]
+
+    remove_placement_in_memory(state, first)
+    remove_placement_in_memory(state, second)
+
+    new_first = try_place_course_in_state_at(state, first_course, second['exam_date'], second['start_minute'])
+    new_second = None
+    if new_first is not None:
+        new_second = try_place_course_in_state_at(state, second_course, first['exam_date'], first['start_minute'])
+
+    if new_first is not None and new_second is not None:
+        return True
+
+    # Geri al
+    if new_first is not None:
+        remove_placement_in_memory(state, new_first)
+    add_placement_in_memory(state, first)
+    add_placement_in_memory(state, second)
+    return False
+
+
+def improve_schedule(state, max_iterations=2000, time_limit=5.0, seed=None, tabu_tenure=10, swap_probability=0.2,
+                     deadline=None):
+    """
+    Greedy sonrası tabu arama ile yerleşemeyen ders sayısını azaltmaya çalışır.
+
+    Parametreler:
+        state: Planlama durumu (greedy sonrası)
+        max_iterations: En fazla hamle sayısı
+        time_limit: En fazla süre (saniye)
+        seed: Rastgele sayı üreteci tohumu (tekrarlanabilirlik için)
+        tabu_tenure: Bir ders kaç iterasyon boyunca tekrar çıkarılamaz?
+        swap_probability: Her iterasyonda DEĞİŞTİRME hamlesi deneme olasılığı
+        deadline: Planlamanın süre sınırı / iptali (bkz. app/deadline.py)
+
+    Döndürür:
+        report: Sözlük
+            'before': {'placed_count', 'failed_count'}
+            'after': {'placed_count', 'failed_count'}
+            'iterations': Yapılan iterasyon sayısı
+            'moves': Kabul edilen taşıma hamlesi sayısı
+            'swaps': Kabul edilen değiştirme hamlesi sayısı
+            'elapsed': Geçen süre (saniye)
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    courses_by_id = {}
+    for course in state['snapshot']['courses']:
+        courses_by_id[course['id']] = course
+
+    failed = state['failed_courses']
+    report = {
+        'before': {'placed_count': len(state['placements']), 'failed_count': len(failed)},
+        'iterations': 0,
+        'moves': 0,
+        'swaps': 0
+    }
+
+    tabu = {}
+    iteration = 0
+
+    while failed and iteration < max_iterations:
+        if time.perf_counter() - started > time_limit:
+            break
+        if get_stop_reason(deadline):
+            break
+        iteration += 1
+
+        # Çeşitlendirme
+        if rng.random() < swap_probability:
+            if try_swap(state, courses_by_id, rng):
+                report['swaps'] += 1
+            continue
+
+        course = rng.choice(failed)
+
+        # Önce doğrudan yerleştirmeyi dene (önceki hamleler yer açmış olabilir)
+        if place_course_in_state(state, course) is not None:
+            failed.remove(course)
+            continue
+
+        result = try_move(state, course, courses_by_id, rng, tabu, iteration, tabu_tenure)
+        if result is None:
+            continue
+
+        delta, ejected_course = result
+        report['moves'] += 1
+        failed.remove(course)
+        if delta == 0:
+            # Çıkarılan ders yerleşemeyenler listesine girer
+            failed.append(ejected_course)
+
+    report['iterations'] = iteration
+    report['after'] = {'placed_count': len(state['placements']), 'failed_count': len(failed)}
+    report['elapsed'] = round(time.perf_counter() - started, 3)
+
+    return report
@@ -6,6 +6,8 @@
 # ==============================================
 
 from app.database import execute_query, execute_insert, execute_update
+from app.availability_index import get_availability_masks, is_available_in_masks
+from app.schedule_snapshot import time_to_minutes
 
 
 def get_availability_by_instructor(instructor_id):
@@ -144,7 +146,8 @@ def delete_all_availability_by_instructor(instructor_id):
 def check_instructor_available(instructor_id, day_of_week, start_time, end_time):
     """
     Öğretim üyesinin belirtilen gün ve saatte müsait olup olmadığını kontrol eder.
-    Sınav haftasında ders olmadığı için, hoca o gün okula geliyor mu kontrol edilir.
+    Müsaitlik kayıtları ve ders saatleri bit maskesine derlenmiştir
+    (bkz. app/availability_index.py), kontrol tek bir bit testidir.
     
     Parametreler:
         instructor_id: Öğretim üyesi ID
@@ -155,24 +158,11 @@ def check_instructor_available(instructor_id, day_of_week, start_time, end_time)
     Döndürür:
         is_available: Müsait mi? (True/False)
     """
-    # instructor_availability tablosundan o gün müsait mi kontrol et
-    query = """
-        SELECT id, start_time, end_time FROM instructor_availability 
-        WHERE instructor_id = ? 
-          AND day_of_week = ?
-          AND is_available = 1
-          AND start_time <= ?
-          AND end_time >= ?
-    """
-    
-    results = execute_query(query, (instructor_id, day_of_week, start_time, end_time))
-    
-    # Müsaitlik kaydı varsa müsait
-    if len(results) > 0:
-        return True
+    # Derlenmiş müsaitlik maskeleri (sadece veri değişince yeniden derlenir)
+    masks = get_availability_masks()
     
-    # Müsaitlik kaydı yoksa müsait değil
-    return False
+    return is_available_in_masks(masks, instructor_id, day_of_week,
+                                 time_to_minutes(start_time), time_to_minutes(end_time))
 
 
 def get_all_availability_with_instructor():
@@ -5,7 +5,9 @@
 # Ekleme, listeleme, güncelleme, silme işlemleri.
 # ==============================================
 
-from app.database import execute_query, execute_insert, execute_update
+from app.database import execute_query, execute_insert, execute_update, get_db_connection
+from app.models.exam import discard_versions_using
+from app.models.draft import discard_drafts_using
 
 
 def get_all_classrooms():
@@ -188,18 +190,31 @@ def delete_classroom(classroom_id):
     
     Döndürür:
         success: Başarılı mı? (True/False)
-    """
-    # Önce bu dersliğe ait sınav planı var mı kontrol et
-    query = "SELECT COUNT(*) as count FROM exam_schedule WHERE classroom_id = ?"
-    results = execute_query(query, (classroom_id,))
-    
-    if results[0]['count'] > 0:
-        # Planlanmış sınav varsa silme
-        return False
-    
-    # Dersliği sil
-    query = "DELETE FROM classrooms WHERE id = ?"
-    affected_rows = execute_update(query, (classroom_id,))
+                 Yayındaki veya hazırlanan programda sınavı varsa False.
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Yayındaki programda sınavı varsa silme; sadece saklanan
+        # eski sürümlerde veya yayınlanmamış taslaklarda varsa onlar da silinir
+        if not discard_versions_using(cursor, 'classroom_id', classroom_id):
+            connection.rollback()
+            return False
+        discard_drafts_using(cursor, 'classroom_id', classroom_id)
+        
+        # Dersliği sil
+        cursor.execute("DELETE FROM classrooms WHERE id = ?", (classroom_id,))
+        affected_rows = cursor.rowcount
+        
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
     
     return affected_rows > 0
 
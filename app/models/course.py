@@ -5,7 +5,9 @@
 # Ekleme, listeleme, güncelleme, silme işlemleri.
 # ==============================================
 
-from app.database import execute_query, execute_insert, execute_update
+from app.database import execute_query, execute_insert, execute_update, get_db_connection
+from app.models.exam import discard_versions_using
+from app.models.draft import discard_drafts_using
 
 
 def get_all_courses():
@@ -207,18 +209,31 @@ def delete_course(course_id):
     
     Döndürür:
         success: Başarılı mı? (True/False)
+                 Yayındaki veya hazırlanan programda sınavı varsa False.
     """
-    # Önce bu derse ait sınav planı var mı kontrol et
-    query = "SELECT COUNT(*) as count FROM exam_schedule WHERE course_id = ?"
-    results = execute_query(query, (course_id,))
-    
-    if results[0]['count'] > 0:
-        # Planlanmış sınav varsa silme
-        return False
-    
-    # Dersi sil
-    query = "DELETE FROM courses WHERE id = ?"
-    affected_rows = execute_update(query, (course_id,))
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Yayındaki programda sınavı varsa silme; sadece saklanan
+        # eski sürümlerde veya yayınlanmamış taslaklarda varsa onlar da silinir
+        if not discard_versions_using(cursor, 'course_id', course_id):
+            connection.rollback()
+            return False
+        discard_drafts_using(cursor, 'course_id', course_id)
+        
+        # Dersi sil
+        cursor.execute("DELETE FROM courses WHERE id = ?", (course_id,))
+        affected_rows = cursor.rowcount
+        
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
     
     return affected_rows > 0
 
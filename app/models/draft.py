@@ -0,0 +1,88 @@
+# ==============================================
+# TASLAK PROGRAM MODELİ
+# ==============================================
+# Bu dosya deneme (dry-run) planlamalarının
+# sonuçlarını (schedule_drafts) yönetir.
+# Taslak oluşturma, getirme, yayınlandı işaretleme.
+# ==============================================
+
+import json
+
+from app.database import execute_query, execute_insert, execute_update
+
+# exam_rows JSON satırlarında sütunların sırası (bkz. app/what_if.py EXAM_ROW_FIELDS)
+DRAFT_ROW_COLUMNS = {'course_id': 0, 'classroom_id': 1, 'supervisor_id': 2}
+
+
+def create_draft(start_date, end_date, options_json, exam_rows_json, summary_json, base_version_id=None):
+    """
+    Yeni bir taslak program kaydeder.
+
+    Parametreler:
+        base_version_id: Taslak hesaplanırken yayında olan sürüm (fark buna göredir)
+
+    Döndürür:
+        draft_id: Yeni taslağın ID'si
+    """
+    query = """
+        INSERT INTO schedule_drafts (start_date, end_date, options, exam_rows, summary, base_version_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    return execute_insert(query, (start_date, end_date, options_json, exam_rows_json, summary_json,
+                                  base_version_id))
+
+
+def get_draft_by_id(draft_id):
+    """
+    ID'ye göre taslak programı getirir.
+
+    Döndürür:
+        draft: Taslak bilgileri veya None
+    """
+    results = execute_query("SELECT * FROM schedule_drafts WHERE id = ?", (draft_id,))
+
+    if len(results) == 0:
+        return None
+
+    return results[0]
+
+
+def mark_draft_published(draft_id, cursor=None):
+    """
+    Taslağı yayınlandı olarak işaretler.
+
+    Parametreler:
+        cursor: Verilirse aynı işlem içinde işaretlenir (bkz. publish_draft)
+    """
+    query = "UPDATE schedule_drafts SET published_at = CURRENT_TIMESTAMP WHERE id = ?"
+
+    if cursor is not None:
+        cursor.execute(query, (draft_id,))
+        return cursor.rowcount > 0
+
+    return execute_update(query, (draft_id,)) > 0
+
+
+def discard_drafts_using(cursor, column, item_id):
+    """
+    Bir dersi, dersliği veya gözetmeni kullanan yayınlanmamış taslakları siler
+    (açık bir işlem içinde çağrılır). Kayıt silinmeden önce çağrılır; böylece
+    artık yayınlanamayacak taslak kalmaz.
+
+    Parametreler:
+        cursor: Açık işlemin cursor'ı
+        column: 'course_id', 'classroom_id' veya 'supervisor_id'
+        item_id: Ders, derslik veya öğretim üyesi ID'si
+
+    Döndürür:
+        deleted_count: Silinen taslak sayısı
+    """
+    index = DRAFT_ROW_COLUMNS[column]
+
+    cursor.execute("SELECT id, exam_rows FROM schedule_drafts WHERE published_at IS NULL")
+    draft_ids = [(draft['id'],) for draft in cursor.fetchall()
+                 if any(row[index] == item_id for row in json.loads(draft['exam_rows']))]
+
+    cursor.executemany("DELETE FROM schedule_drafts WHERE id = ?", draft_ids)
+
+    return len(draft_ids)
@@ -3,9 +3,73 @@
 # ==============================================
 # Bu dosya sınav programı işlemlerini yönetir.
 # Planlanan sınavları kaydetme, listeleme, silme.
+#
+# Sınavlar sürümlü tutulur (exam_schedule_versions):
+#    - Planlama yeni bir sürüme yazar (create_schedule_version)
+#    - Yayınlama sadece işaretçiyi değiştirir
+#      (publish_schedule_version), tek küçük işlem
+#    - Geri alma bir önceki sürüme döner (rollback_schedule)
+# Okuma fonksiyonları exam_schedule görünümünü (VIEW)
+# kullanır; bu görünüm her zaman yayındaki sürümü
+# gösterir. Böylece sayfalar yarım bir planlamayı görmez.
+#
+# Tarih ve saatler metin olarak saklanır; çakışma
+# sorguları için tam sayı kopyaları da yazılır
+# (date_ord, start_min, end_min). Böylece her çakışma
+# kontrolü tek bir aralık koşuludur
+# (start_min < bitiş AND end_min > başlangıç) ve
+# (sürüm, derslik/gözetmen, gün, başlangıç) indeksinden
+# cevaplanır.
 # ==============================================
 
-from app.database import execute_query, execute_insert, execute_update
+from datetime import date
+
+from app.database import execute_query, execute_insert, execute_update, execute_many, get_db_connection
+from app.schedule_snapshot import time_to_minutes
+
+
+# Sürüm durumları
+VERSION_BUILDING = 'hazırlanıyor'
+VERSION_READY = 'hazır'
+
+# Yayındaki ve önceki sürüm dışında saklanan en fazla sürüm sayısı
+KEEP_SCHEDULE_VERSIONS = 5
+
+# Toplu yazma için ortak INSERT sorgusu (ilk parametre sürüm ID'si)
+INSERT_EXAM_QUERY = """
+    INSERT INTO exam_schedule_versions 
+    (version_id, course_id, classroom_id, supervisor_id, exam_date, start_time, end_time, status,
+     date_ord, start_min, end_min) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, 'planlandı', ?, ?, ?)
+"""
+
+# Sürüm verilmezse (None) yayındaki sürüm kullanılır
+VERSION_CONDITION = "version_id = COALESCE(?, (SELECT version_id FROM published_schedule WHERE id = 1))"
+
+
+def get_exam_time_columns(exam_date, start_time, end_time):
+    """
+    Sınavın tarih ve saatlerini tam sayı sütun değerlerine çevirir.
+    
+    Parametreler:
+        exam_date: Sınav tarihi (YYYY-MM-DD)
+        start_time, end_time: Saatler (HH:MM)
+    
+    Döndürür:
+        columns: (date_ord, start_min, end_min)
+    """
+    return (date.fromisoformat(exam_date).toordinal(), time_to_minutes(start_time), time_to_minutes(end_time))
+
+
+def build_exam_params(version_id, row):
+    """
+    INSERT_EXAM_QUERY parametrelerini hazırlar.
+    
+    Parametreler:
+        version_id: Yazılacak sürüm
+        row: (course_id, classroom_id, supervisor_id, exam_date, start_time, end_time)
+    """
+    return (version_id,) + tuple(row) + get_exam_time_columns(row[3], row[4], row[5])
 
 
 def get_all_exams():
@@ -73,7 +137,257 @@ def get_exam_by_id(exam_id):
     return results[0]
 
 
-def create_exam(course_id, classroom_id, exam_date, start_time, end_time, supervisor_id=None):
+# ==============================================
+# SÜRÜMLER
+# ==============================================
+
+def get_published_version_id():
+    """Yayındaki sürümün ID'si (henüz yayın yoksa None)."""
+    results = execute_query("SELECT version_id FROM published_schedule WHERE id = 1")
+    
+    if len(results) == 0:
+        return None
+    
+    return results[0]['version_id']
+
+
+def get_previous_version_id():
+    """Geri alınınca dönülecek sürümün ID'si (yoksa None)."""
+    results = execute_query("SELECT previous_version_id FROM published_schedule WHERE id = 1")
+    
+    if len(results) == 0:
+        return None
+    
+    return results[0]['previous_version_id']
+
+
+def get_published_period():
+    """
+    Yayındaki programın planlandığı sınav dönemi.
+    
+    Döndürür:
+        (start_date, end_date) veya None (yayın yoksa ya da dönem kaydedilmemişse)
+    """
+    results = execute_query("""
+        SELECT v.start_date, v.end_date
+        FROM published_schedule p
+        INNER JOIN schedule_versions v ON v.id = p.version_id
+        WHERE p.id = 1
+    """)
+    
+    if len(results) == 0 or results[0]['start_date'] is None or results[0]['end_date'] is None:
+        return None
+    
+    return results[0]['start_date'], results[0]['end_date']
+
+
+def create_schedule_version(cursor=None, period=None):
+    """
+    Yeni (boş) bir sınav programı sürümü oluşturur.
+    Sürüm yayınlanana kadar sayfalarda görünmez.
+    
+    Parametreler:
+        cursor: Verilirse aynı işlem içinde oluşturulur
+        period: (start_date, end_date) planlandığı sınav dönemi (artımlı
+                yeniden planlama bu dönemi kullanır), bilinmiyorsa None
+    
+    Döndürür:
+        version_id: Yeni sürümün ID'si
+    """
+    start_date, end_date = period if period else (None, None)
+    query = "INSERT INTO schedule_versions (status, start_date, end_date) VALUES (?, ?, ?)"
+    params = (VERSION_BUILDING, start_date, end_date)
+    
+    if cursor is not None:
+        cursor.execute(query, params)
+        return cursor.lastrowid
+    
+    return execute_insert(query, params)
+
+
+def publish_version_in_transaction(cursor, version_id):
+    """
+    İşaretçiyi verilen sürüme çevirir (açık bir işlem içinde çağrılır).
+    Önceki yayın geri alma için saklanır.
+    """
+    cursor.execute("""
+        UPDATE published_schedule
+        SET previous_version_id = version_id, version_id = ?
+        WHERE id = 1 AND (version_id IS NULL OR version_id != ?)
+    """, (version_id, version_id))
+    cursor.execute(
+        "UPDATE schedule_versions SET status = ?, published_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (VERSION_READY, version_id)
+    )
+
+
+def publish_schedule_version(version_id):
+    """
+    Sürümü yayınlar. Sadece işaretçi değişir; sınav satırlarına
+    dokunulmaz, bu yüzden sürümün büyüklüğünden bağımsız olarak anlıktır.
+    Eski sürümler KEEP_SCHEDULE_VERSIONS kadar saklanır.
+    
+    Döndürür:
+        success: Sürüm varsa True
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        cursor.execute("SELECT id FROM schedule_versions WHERE id = ?", (version_id,))
+        if cursor.fetchone() is None:
+            connection.rollback()
+            return False
+        
+        publish_version_in_transaction(cursor, version_id)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    
+    prune_schedule_versions()
+    
+    return True
+
+
+def rollback_schedule():
+    """
+    Bir önceki yayına anında geri döner (işaretçiler yer değiştirir).
+    Tekrar çağrılırsa geri alma geri alınır.
+    
+    Döndürür:
+        version_id: Yayına dönen sürüm veya None (önceki sürüm yoksa)
+    """
+    previous_version_id = get_previous_version_id()
+    if previous_version_id is None:
+        return None
+    
+    query = """
+        UPDATE published_schedule
+        SET version_id = previous_version_id, previous_version_id = version_id
+        WHERE id = 1 AND previous_version_id = ?
+    """
+    if execute_update(query, (previous_version_id,)) == 0:
+        return None
+    
+    return previous_version_id
+
+
+def discard_schedule_version(version_id):
+    """
+    Yayınlanmamış bir sürümü siler (ör. hata veren planlama).
+    Yayındaki veya önceki sürüm silinmez.
+    """
+    if version_id in (get_published_version_id(), get_previous_version_id()):
+        return False
+    
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DELETE FROM exam_schedule_versions WHERE version_id = ?", (version_id,))
+        cursor.execute("DELETE FROM schedule_versions WHERE id = ?", (version_id,))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    
+    return True
+
+
+def prune_schedule_versions(keep=KEEP_SCHEDULE_VERSIONS):
+    """
+    Eski sürümleri siler. Yayındaki, önceki ve hazırlanmakta
+    olan sürümler ile en yeni 'keep' sürüm korunur.
+    
+    Döndürür:
+        deleted_count: Silinen sürüm sayısı
+    """
+    query = """
+        SELECT id FROM schedule_versions
+        WHERE status = ?
+          AND id NOT IN (SELECT COALESCE(version_id, 0) FROM published_schedule)
+          AND id NOT IN (SELECT COALESCE(previous_version_id, 0) FROM published_schedule)
+        ORDER BY id DESC
+        LIMIT -1 OFFSET ?
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        # Seçim ve iki silme tek işlemde: yarım silinmiş sürüm kalmaz
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(query, (VERSION_READY, keep))
+        old_ids = [(row['id'],) for row in cursor.fetchall()]
+        cursor.executemany("DELETE FROM exam_schedule_versions WHERE version_id = ?", old_ids)
+        cursor.executemany("DELETE FROM schedule_versions WHERE id = ?", old_ids)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    
+    return len(old_ids)
+
+
+def discard_versions_using(cursor, column, item_id):
+    """
+    Bir dersi, dersliği veya gözetmeni kullanan eski sürümleri siler (açık bir
+    işlem içinde çağrılır). Ders / derslik / öğretim üyesi silinmeden önce
+    çağrılır; böylece saklanan bir sürüm (ör. geri alma hedefi) artık olmayan
+    bir kayda işaret etmez. Geri alma hedefi silinirse işaretçisi de temizlenir.
+    
+    Parametreler:
+        cursor: Açık işlemin cursor'ı
+        column: 'course_id', 'classroom_id' veya 'supervisor_id'
+        item_id: Ders, derslik veya öğretim üyesi ID'si
+    
+    Döndürür:
+        True: Kullanan sürüm kalmadı, kayıt silinebilir
+        False: Yayındaki veya hazırlanmakta olan sürüm kullanıyor, hiçbir şey silinmedi
+    """
+    if column not in ('course_id', 'classroom_id', 'supervisor_id'):
+        raise ValueError('Geçersiz sütun: ' + column)
+    
+    cursor.execute(f"""
+        SELECT DISTINCT e.version_id, v.status
+        FROM exam_schedule_versions e
+        LEFT JOIN schedule_versions v ON v.id = e.version_id
+        WHERE e.{column} = ?
+    """, (item_id,))
+    versions = cursor.fetchall()
+    
+    cursor.execute("SELECT version_id FROM published_schedule WHERE id = 1")
+    published_version_id = cursor.fetchone()['version_id']
+    
+    for version in versions:
+        if version['version_id'] == published_version_id or version['status'] == VERSION_BUILDING:
+            return False
+    
+    old_ids = [(version['version_id'],) for version in versions]
+    cursor.executemany("DELETE FROM exam_schedule_versions WHERE version_id = ?", old_ids)
+    cursor.executemany("DELETE FROM schedule_versions WHERE id = ?", old_ids)
+    cursor.executemany(
+        "UPDATE published_schedule SET previous_version_id = NULL WHERE id = 1 AND previous_version_id = ?",
+        old_ids
+    )
+    
+    return True
+
+
+# ==============================================
+# YAZMA
+# ==============================================
+
+def create_exam(course_id, classroom_id, exam_date, start_time, end_time, supervisor_id=None, version_id=None):
     """
     Yeni sınav kaydı oluşturur.
     
@@ -84,24 +398,191 @@ def create_exam(course_id, classroom_id, exam_date, start_time, end_time, superv
         start_time: Başlangıç saati (HH:MM)
         end_time: Bitiş saati (HH:MM)
         supervisor_id: Gözetmen ID (opsiyonel)
+        version_id: Yazılacak sürüm (varsayılan: yayındaki sürüm)
     
     Döndürür:
         exam_id: Oluşturulan sınavın ID'si
     """
+    if version_id is None:
+        version_id = get_published_version_id()
+        if version_id is None:
+            version_id = create_schedule_version()
+            publish_schedule_version(version_id)
+    
     # Yeni kayıt ekle
-    query = """
-        INSERT INTO exam_schedule 
-        (course_id, classroom_id, supervisor_id, exam_date, start_time, end_time, status) 
-        VALUES (?, ?, ?, ?, ?, ?, 'planlandı')
-    """
-    new_id = execute_insert(query, (course_id, classroom_id, supervisor_id, exam_date, start_time, end_time))
+    new_id = execute_insert(INSERT_EXAM_QUERY, build_exam_params(version_id, (course_id, classroom_id, supervisor_id,
+                                                                          exam_date, start_time, end_time)))
     
     return new_id
 
 
+def create_exams_bulk(exam_rows, version_id):
+    """
+    Birden fazla sınav kaydını bir sürüme tek işlemde ekler.
+    
+    Parametreler:
+        exam_rows: [(course_id, classroom_id, supervisor_id, exam_date, start_time, end_time), ...]
+        version_id: Yazılacak sürüm
+    
+    Döndürür:
+        inserted_count: Eklenen kayıt sayısı
+    """
+    if not exam_rows:
+        return 0
+    
+    execute_many(INSERT_EXAM_QUERY, [build_exam_params(version_id, row) for row in exam_rows])
+    
+    return len(exam_rows)
+
+
+def replace_version_exams(version_id, exam_rows):
+    """
+    Yayınlanmamış bir sürümün satırlarını tek işlemde yenileriyle değiştirir
+    (ör. SQL planlamasından sonra gözetmenler yeniden atandığında).
+    
+    Parametreler:
+        version_id: Sürüm ID'si
+        exam_rows: [(course_id, classroom_id, supervisor_id, exam_date, start_time, end_time), ...]
+    
+    Döndürür:
+        inserted_count: Eklenen kayıt sayısı
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DELETE FROM exam_schedule_versions WHERE version_id = ?", (version_id,))
+        cursor.executemany(INSERT_EXAM_QUERY, [build_exam_params(version_id, row) for row in exam_rows])
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    
+    return len(exam_rows)
+
+
+def replace_all_exams(exam_rows, period=None, before_publish=None):
+    """
+    Mevcut sınav programını yenisiyle değiştirir.
+    
+    Satırlar önce yeni bir sürüme yazılır (sayfalar bu sırada eski
+    programı görmeye devam eder), sonra işaretçi tek işlemde yeni
+    sürüme çevrilir. Sayfalar ya eski programı ya da yeni programı
+    görür, yarım bir program görmez. Hata olursa eski program
+    olduğu gibi kalır ve rollback_schedule ile geri dönülebilir.
+    
+    Parametreler:
+        exam_rows: [(course_id, classroom_id, supervisor_id, exam_date, start_time, end_time), ...]
+        period: (start_date, end_date) programın planlandığı sınav dönemi
+        before_publish: Verilirse yazma kilidi alındıktan sonra aynı işlem
+                        içinde cursor ile çağrılır (ör. taslak kontrolü ve
+                        işaretlemesi); hata fırlatırsa hiçbir şey değişmez
+    
+    Döndürür:
+        inserted_count: Eklenen kayıt sayısı
+    """
+    # Veritabanına bağlan
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        # Yazma kilidini baştan al (başka bir yazıcı araya girmesin)
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        if before_publish is not None:
+            before_publish(cursor)
+        
+        # Yeni sürüm ve satırları (henüz yayında değil)
+        version_id = create_schedule_version(cursor, period)
+        cursor.executemany(INSERT_EXAM_QUERY, [build_exam_params(version_id, row) for row in exam_rows])
+        
+        # Yayınla: sadece işaretçi değişir
+        publish_version_in_transaction(cursor, version_id)
+        
+        # Tek commit: yeni program birden görünür olur
+        connection.commit()
+    except Exception:
+        # Hata olursa eski plan korunur
+        connection.rollback()
+        raise
+    finally:
+        # Bağlantıyı kapat
+        connection.close()
+    
+    prune_schedule_versions()
+    
+    return len(exam_rows)
+
+
+def replace_course_exams(course_ids, exam_rows):
+    """
+    Sadece verilen derslerin sınav kayıtlarını değiştirir.
+    Artımlı yeniden planlamada kullanılır; diğer sınavlar yeni
+    sürüme aynen kopyalanır, sonra yeni sürüm yayınlanır.
+
+    Parametreler:
+        course_ids: Kayıtları silinecek ders ID'leri
+        exam_rows: [(course_id, classroom_id, supervisor_id, exam_date, start_time, end_time), ...]
+
+    Döndürür:
+        inserted_count: Eklenen kayıt sayısı
+    """
+    # Veritabanına bağlan
+    connection = get_db_connection()
+    cursor = connection.cursor()
+
+    try:
+        # Yazma kilidini baştan al (kopyalanan sürüm değişmesin)
+        cursor.execute("BEGIN IMMEDIATE")
+
+        cursor.execute("""
+            SELECT p.version_id, v.start_date, v.end_date
+            FROM published_schedule p
+            LEFT JOIN schedule_versions v ON v.id = p.version_id
+            WHERE p.id = 1
+        """)
+        published = cursor.fetchone()
+        published_version_id = published['version_id']
+
+        # Yeni sürüm yayındakiyle aynı sınav dönemine aittir
+        version_id = create_schedule_version(cursor, (published['start_date'], published['end_date']))
+
+        # Yayındaki programı yeni sürüme kopyala, etkilenen derslerin sınavlarını çıkar
+        cursor.execute("""
+            INSERT INTO exam_schedule_versions
+            (version_id, course_id, classroom_id, supervisor_id, exam_date, start_time, end_time, status,
+             date_ord, start_min, end_min)
+            SELECT ?, course_id, classroom_id, supervisor_id, exam_date, start_time, end_time, status,
+                   date_ord, start_min, end_min
+            FROM exam_schedule_versions
+            WHERE version_id = ?
+        """, (version_id, published_version_id))
+        cursor.executemany("DELETE FROM exam_schedule_versions WHERE version_id = ? AND course_id = ?",
+                           [(version_id, course_id) for course_id in course_ids])
+
+        # Yeni yerleşimleri ekle ve yayınla
+        cursor.executemany(INSERT_EXAM_QUERY, [build_exam_params(version_id, row) for row in exam_rows])
+        publish_version_in_transaction(cursor, version_id)
+
+        connection.commit()
+    except Exception:
+        # Hata olursa eski plan korunur
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    prune_schedule_versions()
+
+    return len(exam_rows)
+
+
 def delete_exam(exam_id):
     """
-    Sınav kaydını siler.
+    Yayındaki programdan bir sınav kaydını siler.
     
     Parametreler:
         exam_id: Silinecek sınav ID'si
@@ -109,54 +590,54 @@ def delete_exam(exam_id):
     Döndürür:
         success: Başarılı mı? (True/False)
     """
-    # Kaydı sil
-    query = "DELETE FROM exam_schedule WHERE id = ?"
-    affected_rows = execute_update(query, (exam_id,))
+    # Kaydı sil (sadece yayındaki sürümden)
+    query = f"DELETE FROM exam_schedule_versions WHERE id = ? AND {VERSION_CONDITION}"
+    affected_rows = execute_update(query, (exam_id, None))
     
     return affected_rows > 0
 
 
 def delete_all_exams():
     """
-    Tüm sınav kayıtlarını siler.
-    Yeni planlama yapmadan önce kullanılır.
+    Tüm sınav kayıtlarını kaldırır: boş bir sürüm yayınlanır.
+    Eski program rollback_schedule ile geri getirilebilir.
     
     Döndürür:
-        deleted_count: Silinen kayıt sayısı
+        deleted_count: Yayından kaldırılan kayıt sayısı
     """
-    # Tüm kayıtları sil
-    query = "DELETE FROM exam_schedule"
-    affected_rows = execute_update(query, ())
+    result = execute_query("SELECT COUNT(*) as count FROM exam_schedule")
+    deleted_count = result[0]['count']
+    
+    replace_all_exams([])
     
-    return affected_rows
+    return deleted_count
 
 
-def check_classroom_conflict(classroom_id, exam_date, start_time, end_time):
+def check_classroom_conflict(classroom_id, exam_date, start_time, end_time, version_id=None):
     """
     Derslikte çakışma var mı kontrol eder.
     
     Bir derslikte aynı tarih ve saatte 
     başka bir sınav var mı?
     
+    Parametreler:
+        version_id: Kontrol edilen sürüm (varsayılan: yayındaki sürüm)
+    
     Döndürür:
         has_conflict: Çakışma var mı? (True/False)
     """
-    # SQL sorgusu
-    query = """
-        SELECT id FROM exam_schedule 
-        WHERE classroom_id = ? 
-          AND exam_date = ?
-          AND (
-              (start_time <= ? AND end_time > ?)
-              OR (start_time < ? AND end_time >= ?)
-              OR (start_time >= ? AND end_time <= ?)
-          )
+    date_ord, start_min, end_min = get_exam_time_columns(exam_date, start_time, end_time)
+    
+    # SQL sorgusu (iki aralık start < bitiş AND end > başlangıç ise çakışır)
+    query = f"""
+        SELECT id FROM exam_schedule_versions 
+        WHERE {VERSION_CONDITION}
+          AND classroom_id = ? 
+          AND date_ord = ?
+          AND start_min < ? AND end_min > ?
     """
     
-    params = (classroom_id, exam_date, 
-              start_time, start_time,
-              end_time, end_time,
-              start_time, end_time)
+    params = (version_id, classroom_id, date_ord, end_min, start_min)
     
     results = execute_query(query, params)
     
@@ -164,39 +645,175 @@ def check_classroom_conflict(classroom_id, exam_date, start_time, end_time):
     return len(results) > 0
 
 
-def check_instructor_conflict(instructor_id, exam_date, start_time, end_time):
+def check_instructor_conflict(instructor_id, exam_date, start_time, end_time, version_id=None):
     """
     Öğretim üyesinde çakışma var mı kontrol eder.
     
     Bir hocanın aynı tarih ve saatte 
     başka bir sınavı var mı?
     
+    Parametreler:
+        version_id: Kontrol edilen sürüm (varsayılan: yayındaki sürüm)
+    
     Döndürür:
         has_conflict: Çakışma var mı? (True/False)
     """
+    date_ord, start_min, end_min = get_exam_time_columns(exam_date, start_time, end_time)
+    
     # SQL sorgusu
-    query = """
-        SELECT e.id FROM exam_schedule e
+    query = f"""
+        SELECT e.id FROM exam_schedule_versions e
         LEFT JOIN courses c ON e.course_id = c.id
-        WHERE c.instructor_id = ? 
-          AND e.exam_date = ?
-          AND (
-              (e.start_time <= ? AND e.end_time > ?)
-              OR (e.start_time < ? AND e.end_time >= ?)
-              OR (e.start_time >= ? AND e.end_time <= ?)
-          )
+        WHERE e.{VERSION_CONDITION}
+          AND c.instructor_id = ? 
+          AND e.date_ord = ?
+          AND e.start_min < ? AND e.end_min > ?
     """
     
-    params = (instructor_id, exam_date, 
-              start_time, start_time,
-              end_time, end_time,
-              start_time, end_time)
+    params = (version_id, instructor_id, date_ord, end_min, start_min)
     
     results = execute_query(query, params)
     
     return len(results) > 0
 
 
+# ==============================================
+# DOLULUK SORGULARI (R*Tree)
+# ==============================================
+# Planlayıcı dışındaki çakışma soruları ("14'ünde
+# 10:15'te hangi derslikler boş?", "bu gözetmen aynı
+# anda iki sınavda mı?", elle taşınan sınav neyle
+# çakışır?) exam_schedule_rtree aynasından cevaplanır
+# (bkz. schema.sql). Zaman ekseni günler arası tektir:
+# date_ord * 1440 + dakika.
+# ==============================================
+
+MINUTES_PER_DAY = 1440
+
+
+def get_exam_time_bounds(exam_date, start_time, end_time=None):
+    """
+    Tarih ve saatleri R*Tree zaman eksenine çevirir.
+    
+    Parametreler:
+        exam_date: Tarih (YYYY-MM-DD)
+        start_time: Başlangıç (HH:MM)
+        end_time: Bitiş (HH:MM); verilmezse tek an (başlangıçtaki 1 dakika)
+    
+    Döndürür:
+        bounds: (start_at, end_at)
+    """
+    if end_time is None:
+        end_time = start_time
+    date_ord, start_min, end_min = get_exam_time_columns(exam_date, start_time, end_time)
+    day_start = date_ord * MINUTES_PER_DAY
+    return day_start + start_min, day_start + max(end_min, start_min + 1)
+
+
+def find_overlapping_exams(exam_date, start_time, end_time=None, classroom_id=None, supervisor_id=None,
+                           exclude_exam_id=None, version_id=None):
+    """
+    Verilen aralıkla çakışan sınav satırlarını bulur.
+    
+    Parametreler:
+        classroom_id, supervisor_id: Verilirse sadece o derslik / gözetmen
+        exclude_exam_id: Elle taşınan sınavın kendisi (sonuçta yer almaz)
+        version_id: Bakılan sürüm (varsayılan: yayındaki sürüm)
+    
+    Döndürür:
+        exams: exam_schedule_versions satırları
+    """
+    if version_id is None:
+        version_id = get_published_version_id()
+        if version_id is None:
+            return []
+    
+    start_at, end_at = get_exam_time_bounds(exam_date, start_time, end_time)
+    
+    query = """
+        SELECT e.* FROM exam_schedule_rtree r
+        INNER JOIN exam_schedule_versions e ON e.id = r.id
+        WHERE r.version_min = ?
+          AND r.start_at < ? AND r.end_at > ?
+    """
+    params = [version_id, end_at, start_at]
+    
+    if classroom_id is not None:
+        query += " AND r.classroom_min = ?"
+        params.append(classroom_id)
+    if supervisor_id is not None:
+        query += " AND r.supervisor_min = ?"
+        params.append(supervisor_id)
+    if exclude_exam_id is not None:
+        query += " AND r.id != ?"
+        params.append(exclude_exam_id)
+    
+    return execute_query(query + " ORDER BY e.start_time, e.classroom_id", tuple(params))
+
+
+def get_free_classrooms(exam_date, start_time, end_time=None, version_id=None):
+    """
+    Verilen saatte sınavı olmayan, sınava uygun derslikleri getirir.
+    
+    Döndürür:
+        classrooms: Derslik listesi (kapasiteye göre büyükten küçüğe)
+    """
+    if version_id is None:
+        version_id = get_published_version_id()
+    
+    start_at, end_at = get_exam_time_bounds(exam_date, start_time, end_time)
+    
+    query = """
+        SELECT * FROM classrooms c
+        WHERE c.is_available = 1
+          AND NOT EXISTS (
+              SELECT 1 FROM exam_schedule_rtree r
+              WHERE r.version_min = ?
+                AND r.classroom_min = c.id
+                AND r.start_at < ? AND r.end_at > ?
+          )
+        ORDER BY c.capacity DESC
+    """
+    
+    return execute_query(query, (version_id, end_at, start_at))
+
+
+def find_supervisor_double_bookings(supervisor_id=None, version_id=None):
+    """
+    Aynı gözetmenin FARKLI derslerin sınavlarına aynı anda atandığı durumları bulur.
+    (Aynı dersin komşu dersliklerine tek gözetmen verilmesi bilinçlidir, sayılmaz.)
+    
+    Döndürür:
+        bookings: [{'supervisor_id', 'exam_id', 'other_exam_id'}, ...]
+    """
+    if version_id is None:
+        version_id = get_published_version_id()
+        if version_id is None:
+            return []
+    
+    query = """
+        SELECT e.supervisor_id, e.id as exam_id, o.id as other_exam_id
+        FROM exam_schedule_versions e
+        INNER JOIN exam_schedule_rtree r
+            ON r.version_min = e.version_id
+           AND r.supervisor_min = e.supervisor_id
+           AND r.start_at < e.date_ord * 1440 + e.end_min
+           AND r.end_at > e.date_ord * 1440 + e.start_min
+           AND r.id > e.id
+        INNER JOIN exam_schedule_versions o ON o.id = r.id
+        WHERE e.version_id = ?
+          AND e.supervisor_id IS NOT NULL
+          AND o.course_id != e.course_id
+    """
+    params = [version_id]
+    
+    if supervisor_id is not None:
+        query += " AND e.supervisor_id = ?"
+        params.append(supervisor_id)
+    
+    return execute_query(query + " ORDER BY e.supervisor_id, e.id", tuple(params))
+
+
 def get_exams_by_date(exam_date):
     """
     Tarihe göre sınavları getirir.
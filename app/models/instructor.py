@@ -5,7 +5,9 @@
 # Ekleme, listeleme, güncelleme, silme işlemleri.
 # ==============================================
 
-from app.database import execute_query, execute_insert, execute_update
+from app.database import execute_query, execute_insert, execute_update, get_db_connection
+from app.models.exam import discard_versions_using
+from app.models.draft import discard_drafts_using
 
 
 def get_all_instructors():
@@ -151,6 +153,8 @@ def delete_instructor(instructor_id):
     
     Döndürür:
         success: Başarılı mı? (True/False)
+                 Bağlı dersi varsa veya yayındaki ya da hazırlanan
+                 programda gözetmense False.
     """
     # Önce bu hocaya bağlı ders var mı kontrol et
     query = "SELECT COUNT(*) as count FROM courses WHERE instructor_id = ?"
@@ -160,9 +164,29 @@ def delete_instructor(instructor_id):
         # Bağlı ders varsa silme
         return False
     
-    # Öğretim üyesini sil
-    query = "DELETE FROM instructors WHERE id = ?"
-    affected_rows = execute_update(query, (instructor_id,))
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Yayındaki programda gözetmense silme; sadece saklanan
+        # eski sürümlerde veya yayınlanmamış taslaklarda varsa onlar da silinir
+        if not discard_versions_using(cursor, 'supervisor_id', instructor_id):
+            connection.rollback()
+            return False
+        discard_drafts_using(cursor, 'supervisor_id', instructor_id)
+        
+        # Öğretim üyesini sil
+        cursor.execute("DELETE FROM instructors WHERE id = ?", (instructor_id,))
+        affected_rows = cursor.rowcount
+        
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
     
     return affected_rows > 0
 
@@ -0,0 +1,171 @@
+# ==============================================
+# PLANLAMA İŞİ MODELİ
+# ==============================================
+# Bu dosya arka planda çalışan planlama
+# işlerinin (generation_jobs) kayıtlarını yönetir.
+# İş oluşturma, ilerleme güncelleme, bitirme.
+# ==============================================
+
+from app.database import execute_query, execute_update, get_db_connection
+
+
+# İş durumları
+JOB_PENDING = 'bekliyor'
+JOB_RUNNING = 'çalışıyor'
+JOB_DONE = 'tamamlandı'
+JOB_FAILED = 'hata'
+
+ACTIVE_JOB_STATUSES = (JOB_PENDING, JOB_RUNNING)
+
+
+def get_job_by_id(job_id):
+    """
+    ID'ye göre planlama işini getirir.
+
+    Döndürür:
+        job: İş bilgileri veya None
+    """
+    results = execute_query("SELECT * FROM generation_jobs WHERE id = ?", (job_id,))
+
+    if len(results) == 0:
+        return None
+
+    return results[0]
+
+
+def get_active_job():
+    """
+    Bekleyen veya çalışan planlama işini getirir (en fazla bir tane olur).
+
+    Döndürür:
+        job: İş bilgileri veya None
+    """
+    query = """
+        SELECT * FROM generation_jobs
+        WHERE status IN (?, ?)
+        ORDER BY id DESC
+        LIMIT 1
+    """
+    results = execute_query(query, ACTIVE_JOB_STATUSES)
+
+    if len(results) == 0:
+        return None
+
+    return results[0]
+
+
+def create_job_if_idle(start_date, end_date, options_json):
+    """
+    Çalışan iş yoksa yeni bir planlama işi oluşturur.
+    Kontrol ve ekleme tek işlemde yapılır; aynı anda gelen iki
+    istekten sadece biri iş oluşturabilir.
+
+    Döndürür:
+        (job_id, created): Yeni iş ID'si ve True,
+                           veya çalışan işin ID'si ve False
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+
+    try:
+        # Yazma kilidini baştan al
+        cursor.execute("BEGIN IMMEDIATE")
+
+        cursor.execute(
+            "SELECT id FROM generation_jobs WHERE status IN (?, ?) ORDER BY id DESC LIMIT 1",
+            ACTIVE_JOB_STATUSES
+        )
+        row = cursor.fetchone()
+        if row is not None:
+            connection.rollback()
+            return row['id'], False
+
+        cursor.execute("""
+            INSERT INTO generation_jobs (status, start_date, end_date, options, updated_at, heartbeat_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        """, (JOB_PENDING, start_date, end_date, options_json))
+        job_id = cursor.lastrowid
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    return job_id, True
+
+
+def mark_job_running(job_id):
+    """İşi çalışıyor durumuna alır."""
+    query = """
+        UPDATE generation_jobs
+        SET status = ?, started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP,
+            heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    return execute_update(query, (JOB_RUNNING, job_id)) > 0
+
+
+def update_job_progress(job_id, processed_count, placed_count, total_courses):
+    """İşin ilerlemesini kaydeder (işlenen / yerleşen / toplam ders)."""
+    query = """
+        UPDATE generation_jobs
+        SET processed_count = ?, placed_count = ?, total_courses = ?, updated_at = CURRENT_TIMESTAMP,
+            heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    return execute_update(query, (processed_count, placed_count, total_courses, job_id)) > 0
+
+
+def touch_job_heartbeat(job_id):
+    """Çalışan işin canlılık sinyalini yeniler (ilerleme değişmese de)."""
+    query = """
+        UPDATE generation_jobs
+        SET heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = ? AND status IN (?, ?)
+    """
+    return execute_update(query, (job_id,) + ACTIVE_JOB_STATUSES) > 0
+
+
+def finish_job(job_id, placed_count, total_courses, failed_count, result_json, message=None):
+    """
+    İşi tamamlandı olarak işaretler.
+    message: Bilgi mesajı (ör. süre dolduğu için kısmi program kaydedildi)
+    """
+    query = """
+        UPDATE generation_jobs
+        SET status = ?, processed_count = ?, placed_count = ?, total_courses = ?, failed_count = ?,
+            result = ?, message = ?, updated_at = CURRENT_TIMESTAMP, finished_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    params = (JOB_DONE, total_courses, placed_count, total_courses, failed_count, result_json, message,
+              job_id)
+    return execute_update(query, params) > 0
+
+
+def fail_job(job_id, message):
+    """İşi hata durumuna alır."""
+    query = """
+        UPDATE generation_jobs
+        SET status = ?, message = ?, updated_at = CURRENT_TIMESTAMP, finished_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    return execute_update(query, (JOB_FAILED, message, job_id)) > 0
+
+
+def get_job_heartbeat_age(job_id):
+    """
+    İşin son canlılık sinyalinden bu yana geçen süre (saniye).
+    Yarıda kalmış (sunucu veya işçi işlemi kapanmış) işleri bulmak için kullanılır.
+    """
+    query = """
+        SELECT (julianday('now') - julianday(COALESCE(heartbeat_at, updated_at, created_at))) * 86400 as age
+        FROM generation_jobs WHERE id = ?
+    """
+    results = execute_query(query, (job_id,))
+
+    if len(results) == 0:
+        return None
+
+    return results[0]['age']
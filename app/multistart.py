@@ -0,0 +1,198 @@
+# ==============================================
+# PARALEL ÇOKLU DENEME (Multi-start) PLANLAMA
+# ==============================================
+# Greedy planlamanın kalitesi derslerin sırasına
+# çok bağlıdır. Bu dosya aynı planlamayı farklı
+# tohumlarla (seed) rastgele sıralarla birden fazla
+# kez, ayrı işlemlerde (ProcessPoolExecutor) çalıştırır.
+#
+#    - Her işlem verileri KENDİSİ okur (snapshot)
+#    - Hiçbir işlem veritabanına yazmaz
+#    - En iyi sonuç seçilir:
+#        1. Yerleşemeyen ders sayısı (az olan)
+#        2. Gözetmensiz kalan sınav sayısı (az olan)
+#        3. Kullanılan derslik sayısı (az olan)
+#        4. Bir günde en fazla sınav sayısı (az olan)
+#        5. Bir gözetmenin en fazla görev sayısı (az olan)
+#    - Sadece kazanan program kaydedilir
+#
+# İlk deneme her zaman istenen sıralamayla
+# (rastgelelik olmadan) yapılır; böylece sonuç
+# tek denemeden asla kötü olmaz.
+#
+# Süre sınırı ve iptal her denemenin İÇİNDE de
+# kontrol edilir: iptal sinyali işlemlere paylaşılan
+# bir Event (multiprocessing.Manager) ile aktarılır,
+# uzun süren tek bir deneme de ilk fırsatta durur.
+# ==============================================
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Manager
+
+import app.database as database
+from app.deadline import CANCEL_POLL_SECONDS, STOP_CANCELLED, create_deadline, get_stop_reason
+from app.scheduler import compute_schedule_in_memory, save_placements
+
+
+def schedule_objective(result, placements):
+    """
+    Bir denemenin karşılaştırma anahtarını hesaplar (küçük olan daha iyi).
+
+    Döndürür:
+        objective: (yerleşemeyen, gözetmensiz sınav, kullanılan derslik,
+                    günlük en fazla sınav, gözetmen başına en fazla görev)
+                   Gözetmen eşleştirmesi yapılmadıysa gözetmen değerleri 0 olur.
+    """
+    supervisor_report = result.get('supervisor_assignment') or {}
+
+    rooms_used = 0
+    daily_counts = {}
+    for placement in placements:
+        rooms_used += len(placement['rooms'])
+        daily_counts[placement['exam_date']] = daily_counts.get(placement['exam_date'], 0) + 1
+
+    max_daily = max(daily_counts.values()) if daily_counts else 0
+
+    return (result['failed_count'], supervisor_report.get('unsupervised', 0), rooms_used, max_daily,
+            supervisor_report.get('max_load', 0))
+
+
+def run_schedule_attempt(database_path, start_date, end_date, ordering, seed, improve, supervisor_matching=True,
+                         expires_at=None, cancel_event=None, deadline=None):
+    """
+    Tek bir planlama denemesi yapar (ayrı işlemde çalışır).
+    Veritabanından sadece okur, sonucu döndürür.
+    supervisor_matching: True ise gözetmenler yük dengeli eşleştirmeyle atanır
+    expires_at: Ortak bitiş anı (time.time() değeri)
+    cancel_event: İşlemler arası paylaşılan iptal sinyali (Manager().Event())
+    deadline: Aynı işlemde çalışırken expires_at ve cancel_event yerine kullanılır
+
+    Döndürür:
+        attempt: {'seed', 'ordering', 'result', 'objective', 'placements'}
+    """
+    # Ayrı işlemde (Windows'ta spawn) config yeniden yüklenir,
+    # test veritabanı gibi farklı bir yol kullanılıyorsa onu ayarla
+    database.DATABASE_PATH = database_path
+
+    if deadline is None:
+        deadline = create_deadline(expires_at=expires_at, cancel_event=cancel_event)
+
+    state, result = compute_schedule_in_memory(start_date, end_date, ordering, improve=improve,
+                                               seed=seed, verbose=False, supervisor_matching=supervisor_matching,
+                                               deadline=deadline)
+
+    attempt = {
+        'seed': seed,
+        'ordering': ordering,
+        'result': result,
+        'objective': schedule_objective(result, state['placements']),
+        'placements': state['placements']
+    }
+    return attempt
+
+
+def generate_multistart_schedule(start_date, end_date, attempts=8, workers=None, ordering='dsatur',
+                                 improve=False, base_seed=0, progress=None, deadline=None, save=True,
+                                 supervisor_matching=True):
+    """
+    Birden fazla planlama denemesini paralel çalıştırır, en iyisini kaydeder.
+
+    Parametreler:
+        start_date: Sınav dönemi başlangıç tarihi (YYYY-MM-DD)
+        end_date: Sınav dönemi bitiş tarihi (YYYY-MM-DD)
+        attempts: Deneme sayısı
+        workers: İşlem sayısı (varsayılan: çekirdek sayısı)
+        ordering: İlk denemenin sıralama stratejisi (diğerleri 'random')
+        improve: Her denemede yerel arama yapılsın mı?
+        base_seed: Tohumlar base_seed, base_seed+1, ... olur
+        progress: Her deneme bitince progress(biten deneme, en iyi yerleşen, deneme sayısı)
+        deadline: Süre sınırı / iptal (bkz. app/deadline.py). Çalışan denemeler
+                  ilk fırsatta durur, başlamamış denemeler atlanır; biten denemelerin
+                  en iyisi kaydedilir.
+        save: False ise kazanan program kaydedilmez, result['placements'] ile
+              döndürülür (deneme planlaması, bkz. app/what_if.py)
+        supervisor_matching: True ise her denemede gözetmenler yük dengeli eşleştirmeyle
+                             atanır ve gözetmen sonucu da karşılaştırmaya girer
+
+    Döndürür:
+        result: Kazanan denemenin sonucu + 'attempts' ve 'attempt_summary'
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, attempts))
+
+    expires_at = deadline['expires_at'] if deadline else None
+
+    jobs = []
+    for i in range(attempts):
+        attempt_ordering = ordering if i == 0 else 'random'
+        jobs.append((database.DATABASE_PATH, start_date, end_date, attempt_ordering, base_seed + i, improve,
+                     supervisor_matching, expires_at))
+
+    outcomes = []
+
+    def report(attempt):
+        outcomes.append(attempt)
+        if progress:
+            best_placed = max(outcome['result']['placed_count'] for outcome in outcomes)
+            progress(len(outcomes), best_placed, attempts)
+
+    # İlk deneme her zaman başlatılır (süre dolmuşsa hemen durur, kısmi program döner)
+    if workers == 1:
+        for job in jobs:
+            if outcomes and get_stop_reason(deadline):
+                break
+            report(run_schedule_attempt(*job, deadline=deadline))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor, Manager() as manager:
+            shared_cancel = manager.Event()
+            futures = [executor.submit(run_schedule_attempt, *job, cancel_event=shared_cancel) for job in jobs]
+            pending = set(futures)
+            while pending:
+                stop_reason = get_stop_reason(deadline)
+                if stop_reason and not shared_cancel.is_set():
+                    # Başlamamış denemeleri iptal et, çalışanlar ilk fırsatta durur
+                    # (süre dolduysa bunu kendileri de görür)
+                    for future in pending:
+                        future.cancel()
+                    if stop_reason == STOP_CANCELLED:
+                        shared_cancel.set()
+
+                done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if not future.cancelled():
+                        report(future.result())
+
+    # Hepsi başlamadan iptal edildiyse ilk deneme burada yapılır (hemen durur, kısmi program döner)
+    if not outcomes:
+        report(run_schedule_attempt(*jobs[0], deadline=deadline))
+
+    # En iyi deneme (eşitlikte küçük tohum)
+    best = min(outcomes, key=lambda attempt: (attempt['objective'], attempt['seed']))
+
+    result = dict(best['result'])
+
+    # Sadece kazananı kaydet
+    if save:
+        save_placements(best['placements'], (start_date, end_date))
+    else:
+        result['placements'] = best['placements']
+
+    result['seed'] = best['seed']
+    result['ordering'] = best['ordering']
+    result['attempts'] = len(outcomes)
+    stop_reason = get_stop_reason(deadline)
+    if len(outcomes) < attempts and stop_reason:
+        result['completed'] = False
+        result['stop_reason'] = result['stop_reason'] or stop_reason
+    result['attempt_summary'] = [
+        {'seed': attempt['seed'], 'ordering': attempt['ordering'],
+         'failed_count': attempt['result']['failed_count']}
+        for attempt in outcomes
+    ]
+
+    print(f"Coklu deneme: {len(outcomes)} deneme, en iyi tohum {best['seed']} "
+          f"({result['failed_count']} yerlesemeyen ders)")
+
+    return result
@@ -0,0 +1,151 @@
+# ==============================================
+# BELLEK İÇİ DOLULUK İNDEKSİ
+# ==============================================
+# Planlama sırasında yerleştirilen sınavları
+# veritabanına yazmadan bellekte takip eder.
+#
+# Her kaynak (derslik, hoca, gözetmen) için
+# (tarih, kaynak_id) anahtarıyla dolu zaman
+# aralıkları tutulur. Aralıklar dakika cinsindendir.
+#
+# İki aralık çakışır mı?
+#    başlangıç1 < bitiş2 VE bitiş1 > başlangıç2
+# ==============================================
+
+
+def create_occupancy_index():
+    """
+    Boş bir doluluk indeksi oluşturur.
+
+    Döndürür:
+        index: Sözlük
+            'rooms': {(tarih, derslik_id): [(başlangıç, bitiş), ...]}
+            'instructors': {(tarih, hoca_id): [(başlangıç, bitiş), ...]}  (dersin hocası)
+            'supervisors': {(tarih, hoca_id): [(başlangıç, bitiş), ...]}  (gözetmen)
+            'courses': {tarih: [(başlangıç, bitiş, ders_id), ...]}
+    """
+    index = {
+        'rooms': {},
+        'instructors': {},
+        'supervisors': {},
+        'courses': {}
+    }
+    return index
+
+
+def intervals_overlap(start_a, end_a, start_b, end_b):
+    """İki zaman aralığı çakışıyor mu?"""
+    return start_a < end_b and end_a > start_b
+
+
+def is_busy(table, key, start_minute, end_minute):
+    """
+    Bir kaynağın verilen aralıkta dolu olup olmadığını kontrol eder.
+
+    Parametreler:
+        table: İndeksteki tablo (ör. index['rooms'])
+        key: (tarih, kaynak_id)
+        start_minute: Başlangıç (dakika)
+        end_minute: Bitiş (dakika)
+
+    Döndürür:
+        busy: Dolu mu? (True/False)
+    """
+    intervals = table.get(key)
+    if not intervals:
+        return False
+
+    for busy_start, busy_end in intervals:
+        if intervals_overlap(busy_start, busy_end, start_minute, end_minute):
+            return True
+
+    return False
+
+
+def mark_busy(table, key, start_minute, end_minute):
+    """Bir kaynağı verilen aralıkta dolu olarak işaretler."""
+    if key not in table:
+        table[key] = []
+    table[key].append((start_minute, end_minute))
+
+
+def unmark_busy(table, key, start_minute, end_minute):
+    """mark_busy ile eklenen bir aralığı geri alır."""
+    intervals = table.get(key)
+    if not intervals:
+        return
+    intervals.remove((start_minute, end_minute))
+    if not intervals:
+        del table[key]
+
+
+def is_room_busy(index, classroom_id, exam_date, start_minute, end_minute):
+    """Derslikte çakışma var mı? (check_classroom_conflict karşılığı)"""
+    return is_busy(index['rooms'], (exam_date, classroom_id), start_minute, end_minute)
+
+
+def is_instructor_busy(index, instructor_id, exam_date, start_minute, end_minute):
+    """Hocanın kendi dersinin sınavı var mı? (check_instructor_conflict karşılığı)"""
+    return is_busy(index['instructors'], (exam_date, instructor_id), start_minute, end_minute)
+
+
+def is_supervisor_busy(index, instructor_id, exam_date, start_minute, end_minute):
+    """Hoca başka bir sınavda gözetmen mi? (check_supervisor_conflict karşılığı)"""
+    return is_busy(index['supervisors'], (exam_date, instructor_id), start_minute, end_minute)
+
+
+def get_overlapping_courses(index, exam_date, start_minute, end_minute):
+    """
+    Verilen aralıkla çakışan sınavların ders ID'lerini döndürür.
+
+    Döndürür:
+        course_ids: Ders ID kümesi
+    """
+    course_ids = set()
+    for busy_start, busy_end, course_id in index['courses'].get(exam_date, []):
+        if intervals_overlap(busy_start, busy_end, start_minute, end_minute):
+            course_ids.add(course_id)
+    return course_ids
+
+
+def add_exam_to_index(index, course_id, instructor_id, exam_date, start_minute, end_minute, rooms, supervisors):
+    """
+    Yerleştirilen bir sınavı indekse ekler.
+
+    Parametreler:
+        index: Doluluk indeksi
+        course_id: Ders ID
+        instructor_id: Dersin hocası
+        exam_date: Sınav tarihi
+        start_minute: Başlangıç (dakika)
+        end_minute: Bitiş (dakika)
+        rooms: Derslik ID listesi
+        supervisors: Gözetmen ID listesi (derslik sırasıyla)
+    """
+    for classroom_id in rooms:
+        mark_busy(index['rooms'], (exam_date, classroom_id), start_minute, end_minute)
+
+    mark_busy(index['instructors'], (exam_date, instructor_id), start_minute, end_minute)
+
+    # Aynı gözetmen birden fazla dersliğe bakabilir, bir kere işaretlemek yeterli
+    for supervisor_id in set(supervisors):
+        mark_busy(index['supervisors'], (exam_date, supervisor_id), start_minute, end_minute)
+
+    if exam_date not in index['courses']:
+        index['courses'][exam_date] = []
+    index['courses'][exam_date].append((start_minute, end_minute, course_id))
+
+
+def remove_exam_from_index(index, course_id, instructor_id, exam_date, start_minute, end_minute, rooms, supervisors):
+    """add_exam_to_index ile eklenen bir sınavı indeksten çıkarır."""
+    for classroom_id in rooms:
+        unmark_busy(index['rooms'], (exam_date, classroom_id), start_minute, end_minute)
+
+    unmark_busy(index['instructors'], (exam_date, instructor_id), start_minute, end_minute)
+
+    for supervisor_id in set(supervisors):
+        unmark_busy(index['supervisors'], (exam_date, supervisor_id), start_minute, end_minute)
+
+    day_exams = index['courses'].get(exam_date)
+    if day_exams:
+        day_exams.remove((start_minute, end_minute, course_id))
@@ -0,0 +1,249 @@
+# ==============================================
+# DERS SIRALAMA STRATEJİLERİ
+# ==============================================
+# Greedy planlamada derslerin hangi sırayla
+# yerleştirileceğini belirler.
+#
+# Her strateji bir generator fonksiyondur:
+#    for course in strategy(state, courses, exam_days, slot_grid):
+#        place_course_exam_in_memory(state, course, ...)
+#
+# Generator, her dersi verdikten sonra
+# state['placements'] listesine bakarak dersin
+# yerleşip yerleşmediğini anlar. Böylece dinamik
+# stratejiler (DSATUR) sonraki seçimi güncel
+# duruma göre yapabilir.
+#
+# Stratejiler:
+#    'student_count': Öğrenci sayısına göre (büyükten küçüğe)
+#    'department': Bölümlere göre round-robin
+#    'dsatur': En kısıtlı dersi önce seç (DSATUR graf boyama)
+#    'random': Öğrenci sayısına göre, rastgele sapmalı
+#              (çoklu denemede her tohum farklı sıra verir)
+# ==============================================
+
+import heapq
+import random
+
+from app.schedule_snapshot import is_instructor_available_in_snapshot
+from app.slot_grid import get_day_name, get_exam_starts
+
+
+def shuffle_by_department(courses):
+    """
+    Dersleri bölümlere göre karıştırır.
+    Aynı bölüm sınavları ardışık gelmesin.
+
+    Round-robin yöntemi kullanır:
+    Bölüm1-Ders1, Bölüm2-Ders1, Bölüm3-Ders1, Bölüm1-Ders2, ...
+    """
+    # Bölümlere göre grupla
+    dept_courses = {}
+    for course in courses:
+        dept_id = course['department_id']
+        if dept_id not in dept_courses:
+            dept_courses[dept_id] = []
+        dept_courses[dept_id].append(course)
+
+    # Round-robin şeklinde birleştir
+    shuffled = []
+    max_len = max(len(courses) for courses in dept_courses.values()) if dept_courses else 0
+
+    for i in range(max_len):
+        for dept_id in dept_courses:
+            if i < len(dept_courses[dept_id]):
+                shuffled.append(dept_courses[dept_id][i])
+
+    return shuffled
+
+
+def iterate_by_student_count(state, courses, exam_days, slot_grid, department_spacing=True):
+    """Dersleri verilen sırayla döndürür (öğrenci sayısına göre sıralı gelir)."""
+    for course in courses:
+        yield course
+
+
+def iterate_by_department(state, courses, exam_days, slot_grid, department_spacing=True):
+    """Dersleri bölüm round-robin sırasıyla döndürür."""
+    for course in shuffle_by_department(courses):
+        yield course
+
+
+def iterate_randomized(state, courses, exam_days, slot_grid, department_spacing=True):
+    """
+    Dersleri öğrenci sayısına göre ama rastgele sapmayla döndürür.
+    Her ders için öğrenci sayısı %70-%130 arası bir katsayıyla çarpılıp sıralanır.
+    Tohum state['settings']['seed'] değeridir; aynı tohum aynı sırayı verir.
+    """
+    rng = random.Random(state['settings'].get('seed'))
+
+    keyed = []
+    for i, course in enumerate(courses):
+        keyed.append((course['student_count'] * rng.uniform(0.7, 1.3), -i, course))
+    keyed.sort(key=lambda x: (x[0], x[1]), reverse=True)
+
+    for _, _, course in keyed:
+        yield course
+
+
+def get_candidate_slots(snapshot, course, exam_days, slot_grid):
+    """
+    Bir dersin statik olarak uygun olduğu (tarih, başlangıç, bitiş) slotlarını bulur.
+    Sadece değişmeyen kısıtlar kullanılır: saat ızgarası (gün sonu, molalar) ve hoca müsaitliği.
+
+    Döndürür:
+        slots: [(tarih, başlangıç_dk, bitiş_dk), ...]
+    """
+    duration = course['exam_duration'] if course['exam_duration'] else 60
+    slots = []
+
+    for exam_date in exam_days:
+        day_name = get_day_name(slot_grid, exam_date)
+        for start_minute, end_minute, _, _, _ in get_exam_starts(slot_grid, day_name, duration):
+            if not is_instructor_available_in_snapshot(snapshot, course['instructor_id'], day_name,
+                                                       start_minute, end_minute):
+                continue
+            slots.append((exam_date, start_minute, end_minute))
+
+    return slots
+
+
+def iterate_dsatur(state, courses, exam_days, slot_grid, department_spacing=True):
+    """
+    DSATUR benzeri dinamik sıralama: her adımda EN KISITLI dersi seçer.
+
+    Öncelik (küçük olan önce):
+        1. Kalan uygun slot sayısı (az olan önce)
+        2. Çakışma derecesi (çok olan önce)
+        3. Hocanın müsait olduğu gün sayısı (az olan önce)
+        4. Derslik ihtiyacı / öğrenci sayısı (büyük olan önce)
+
+    Bir ders yerleştirildiğinde sadece etkilenen derslerin
+    (ortak öğrencili, aynı hocalı, aynı bölümlü) kalan slotları
+    güncellenir ve heap'e yeni kayıt eklenir. Eski kayıtlar
+    sürüm numarasıyla ayıklanır (lazy deletion).
+
+    Parametreler:
+        department_spacing: True ise aynı bölümün aynı güne ikinci
+                            sınavı konamayacağı varsayılır.
+    """
+    snapshot = state['snapshot']
+    graph = state['conflict_graph']
+
+    courses_by_id = {}
+    open_slots = {}
+    availability_days = {}
+    by_instructor = {}
+    by_department = {}
+
+    for course in courses:
+        course_id = course['id']
+        courses_by_id[course_id] = course
+        open_slots[course_id] = set(get_candidate_slots(snapshot, course, exam_days, slot_grid))
+        availability_days[course_id] = len(set(slot[0] for slot in open_slots[course_id]))
+
+        if course['instructor_id'] not in by_instructor:
+            by_instructor[course['instructor_id']] = []
+        by_instructor[course['instructor_id']].append(course_id)
+
+        if course['department_id'] not in by_department:
+            by_department[course['department_id']] = []
+        by_department[course['department_id']].append(course_id)
+
+    # Orijinal sıra son eşitlik bozucu olarak kullanılır
+    original_order = {}
+    for i, course in enumerate(courses):
+        original_order[course['id']] = i
+
+    versions = {}
+    heap = []
+
+    def push(course_id):
+        course = courses_by_id[course_id]
+        versions[course_id] = versions.get(course_id, 0) + 1
+        entry = (len(open_slots[course_id]),
+                 -len(graph.get(course_id, {})),
+                 availability_days[course_id],
+                 -course['student_count'],
+                 original_order[course_id],
+                 course_id,
+                 versions[course_id])
+        heapq.heappush(heap, entry)
+
+    for course in courses:
+        push(course['id'])
+
+    done = set()
+
+    while heap:
+        entry = heapq.heappop(heap)
+        course_id = entry[5]
+        if course_id in done or entry[6] != versions[course_id]:
+            continue  # Eski kayıt
+
+        done.add(course_id)
+        placed_before = len(state['placements'])
+
+        yield courses_by_id[course_id]
+
+        if len(state['placements']) == placed_before:
+            continue  # Yerleşemedi, kimseyi etkilemez
+
+        placement = state['placements'][-1]
+        exam_date = placement['exam_date']
+        start_minute = placement['start_minute']
+        end_minute = placement['end_minute']
+
+        # Aynı saatte kullanılamayacak dersler
+        time_blocked = set(graph.get(course_id, {}))
+        busy_instructors = set(placement['supervisors'])
+        busy_instructors.add(placement['instructor_id'])
+        for instructor_id in busy_instructors:
+            time_blocked.update(by_instructor.get(instructor_id, []))
+
+        # Aynı gün kullanılamayacak dersler
+        day_blocked = set()
+        if department_spacing:
+            day_blocked.update(by_department.get(placement['department_id'], []))
+
+        for other_id in time_blocked | day_blocked:
+            if other_id in done or other_id not in open_slots:
+                continue  # Zaten seçildi veya bu grupta değil
+
+            removed = False
+            for slot in list(open_slots[other_id]):
+                if slot[0] != exam_date:
+                    continue
+                if other_id in day_blocked or (slot[1] < end_minute and slot[2] > start_minute):
+                    open_slots[other_id].discard(slot)
+                    removed = True
+
+            if removed:
+                push(other_id)
+
+
+ORDERING_STRATEGIES = {
+    'student_count': iterate_by_student_count,
+    'department': iterate_by_department,
+    'dsatur': iterate_dsatur,
+    'random': iterate_randomized
+}
+
+
+def iterate_courses(strategy_name, state, courses, exam_days, slot_grid, department_spacing=True):
+    """
+    Seçilen stratejiye göre dersleri sırayla döndürür.
+
+    Parametreler:
+        strategy_name: 'student_count', 'department', 'dsatur' veya 'random'
+        state: Planlama durumu (create_run_state)
+        courses: Yerleştirilecek dersler
+        exam_days: Bu derslerin konabileceği günler
+        slot_grid: Sınav saat ızgarası (bkz. app/slot_grid.py)
+        department_spacing: Bölüm aralığı kuralı uygulanıyor mu?
+    """
+    if strategy_name not in ORDERING_STRATEGIES:
+        raise ValueError('Bilinmeyen sıralama stratejisi: ' + str(strategy_name))
+
+    strategy = ORDERING_STRATEGIES[strategy_name]
+    return strategy(state, courses, exam_days, slot_grid, department_spacing)
@@ -0,0 +1,361 @@
+# ==============================================
+# ARTIMLI YENİDEN PLANLAMA
+# ==============================================
+# Bir derslik kapatıldığında, bir müsaitlik kaydı
+# silindiğinde veya bir dersin öğrenci sayısı
+# değiştiğinde tüm dönemi baştan planlamak gerekmez.
+#
+# Bu dosya mevcut programı (exam_schedule) okur ve
+# her sınavı GÜNCEL verilere göre yeniden doğrular:
+#    - Derslik hâlâ var ve kullanılabilir mi?
+#    - Toplam kapasite yeterli mi?
+#    - Hoca ve gözetmenler o saatte müsait mi?
+#    - Sınav süresi ve ortak gün kuralı hâlâ tutuyor mu?
+#    - Önceki sınavlarla derslik/hoca/öğrenci çakışması var mı?
+#
+# Geçerli sınavlar sabit kalır. Sadece geçersiz
+# olanlar çıkarılıp kalan programın etrafına yeniden
+# yerleştirilir. Daha önce de yerleşemeyen (sınavı
+# hiç olmayan) dersler sadece istenirse denenir.
+# Veritabanına sadece değişen dersler yazılır; hiçbir
+# satır değişmediyse yeni sürüm yayınlanmaz (geri
+# alma hedefi korunur).
+#
+# Bir düzenlemeden sonra (ör. tek bir derslik
+# kapatıldığında) kapsam (scope) verilebilir: o
+# zaman sadece düzenlenen ders, derslik veya hocayı
+# içeren sınavlar doğrulanır, diğerleri olduğu gibi
+# sabitlenir. Yönetim sayfaları bunu arka plan işi
+# olarak çalıştırır (bkz. app/jobs.py).
+# ==============================================
+
+import time
+
+from app.database import execute_query
+from app.models.exam import VERSION_CONDITION, replace_course_exams, get_published_period
+from app.schedule_snapshot import (
+    DAY_NAMES, load_schedule_snapshot, time_to_minutes, is_instructor_available_in_snapshot
+)
+from app.occupancy import mark_busy, is_room_busy, is_instructor_busy, is_supervisor_busy
+from app.student_load import violates_student_load
+from app.slot_grid import fits_in_day
+from app.scheduler import (
+    create_run_state, build_schedule_settings, check_student_conflict_in_memory,
+    get_course_rooms_in_memory, add_placement_in_memory, place_course_in_state,
+    is_common_course, placements_to_exam_rows
+)
+
+
+def load_existing_placements(snapshot, version_id=None):
+    """
+    Bir sürümdeki sınavları yerleşim listesine çevirir.
+    Aynı dersin aynı saatteki derslik satırları tek yerleşimde birleştirilir.
+
+    Parametreler:
+        snapshot: load_schedule_snapshot() sonucu
+        version_id: Okunacak sürüm (varsayılan: yayındaki sürüm)
+
+    Döndürür:
+        placements: Yerleşim listesi (kayıt sırasıyla)
+        orphan_course_ids: Dersi silinmiş sınavların ders ID'leri
+    """
+    rows = execute_query(f"""
+        SELECT course_id, classroom_id, supervisor_id, exam_date, start_time, end_time
+        FROM exam_schedule_versions
+        WHERE {VERSION_CONDITION}
+        ORDER BY id
+    """, (version_id,))
+
+    courses_by_id = {}
+    for course in snapshot['courses']:
+        courses_by_id[course['id']] = course
+
+    placements = []
+    by_key = {}
+    orphan_course_ids = set()
+
+    for row in rows:
+        course = courses_by_id.get(row['course_id'])
+        if course is None:
+            orphan_course_ids.add(row['course_id'])
+            continue
+
+        key = (row['course_id'], row['exam_date'], row['start_time'], row['end_time'])
+        if key not in by_key:
+            by_key[key] = {
+                'course_id': course['id'],
+                'instructor_id': course['instructor_id'],
+                'department_id': course['department_id'],
+                'exam_date': row['exam_date'],
+                'start_minute': time_to_minutes(row['start_time']),
+                'end_minute': time_to_minutes(row['end_time']),
+                'rooms': [],
+                'supervisors': []
+            }
+            placements.append(by_key[key])
+
+        by_key[key]['rooms'].append(row['classroom_id'])
+        by_key[key]['supervisors'].append(row['supervisor_id'])
+
+    return placements, orphan_course_ids
+
+
+def find_invalid_reason(state, course, placement):
+    """
+    Mevcut bir sınavın güncel verilere göre neden geçersiz olduğunu bulur.
+    Çakışma kontrolleri o ana kadar kabul edilen sınavlara göre yapılır.
+
+    Döndürür:
+        reason: Geçersizlik sebebi veya None (sınav geçerli)
+    """
+    from datetime import datetime
+
+    snapshot = state['snapshot']
+    settings = state['settings']
+    occupancy = state['occupancy']
+
+    exam_date = placement['exam_date']
+    start_minute = placement['start_minute']
+    end_minute = placement['end_minute']
+    day_name = DAY_NAMES[datetime.strptime(exam_date, '%Y-%m-%d').weekday()]
+
+    # Süre, gün sonu veya mola
+    duration = course['exam_duration'] if course['exam_duration'] else 60
+    if end_minute - start_minute != duration or not fits_in_day(settings['slot_grid'], start_minute, end_minute):
+        return 'süre'
+
+    # Ortak gün kuralı (öğrenci sayısı 100 sınırını geçmiş olabilir)
+    common_exam_day = settings['common_exam_day']
+    if common_exam_day and is_common_course(course) != (exam_date == common_exam_day):
+        return 'ortak gün'
+
+    # Derslikler (planlamayla aynı kural: get_course_rooms_in_memory)
+    allowed_ids = set(room['id'] for room in get_course_rooms_in_memory(
+        state, course, settings['classrooms'], settings['computer_classrooms']))
+    total_capacity = 0
+    for classroom_id in placement['rooms']:
+        if classroom_id not in allowed_ids:
+            return 'derslik'
+        total_capacity += snapshot['classrooms_by_id'][classroom_id]['capacity']
+    if total_capacity < course['student_count']:
+        return 'kapasite'
+
+    # Hoca ve gözetmen müsaitliği
+    instructor_id = course['instructor_id']
+    if not is_instructor_available_in_snapshot(snapshot, instructor_id, day_name, start_minute, end_minute):
+        return 'hoca müsaitliği'
+
+    for supervisor_id in placement['supervisors']:
+        if supervisor_id is None or supervisor_id == instructor_id:
+            return 'gözetmen'
+        if not is_instructor_available_in_snapshot(snapshot, supervisor_id, day_name, start_minute, end_minute):
+            return 'gözetmen'
+
+    # Kabul edilmiş sınavlarla çakışmalar
+    for classroom_id in placement['rooms']:
+        if is_room_busy(occupancy, classroom_id, exam_date, start_minute, end_minute):
+            return 'çakışma'
+
+    for person_id in set(placement['supervisors']) | {instructor_id}:
+        if is_instructor_busy(occupancy, person_id, exam_date, start_minute, end_minute):
+            return 'çakışma'
+        if is_supervisor_busy(occupancy, person_id, exam_date, start_minute, end_minute):
+            return 'çakışma'
+
+    if check_student_conflict_in_memory(state, course['id'], exam_date, start_minute, end_minute):
+        return 'öğrenci çakışması'
+
+    if violates_student_load(state['student_load'], course['id'], exam_date, start_minute, end_minute):
+        return 'öğrenci günlük yükü'
+
+    return None
+
+
+def block_unavailable_classrooms(state):
+    """
+    Kullanıma kapatılmış (is_available = 0) derslikleri tüm sınav
+    günleri boyunca dolu işaretler. Böylece ne doğrudan ne de yakınlık
+    birleştirmesiyle yeni bir sınava verilirler.
+    """
+    for room in state['snapshot']['classrooms']:
+        if room['is_available']:
+            continue
+        for exam_date in state['settings']['exam_days']:
+            mark_busy(state['occupancy']['rooms'], (exam_date, room['id']), 0, 24 * 60)
+
+
+def placement_in_scope(placement, scope):
+    """
+    Sınav düzenlenen ders, derslik veya hocayı içeriyor mu?
+
+    Parametreler:
+        placement: Yerleşim
+        scope: {'course_ids', 'classroom_ids', 'instructor_ids'} (her biri ID listesi, isteğe bağlı)
+    """
+    if placement['course_id'] in scope.get('course_ids', ()):
+        return True
+
+    classroom_ids = scope.get('classroom_ids', ())
+    if any(classroom_id in classroom_ids for classroom_id in placement['rooms']):
+        return True
+
+    instructor_ids = scope.get('instructor_ids', ())
+    people = set(placement['supervisors']) | {placement['instructor_id']}
+    return any(person_id in instructor_ids for person_id in people)
+
+
+def reschedule_incrementally(start_date=None, end_date=None, verbose=True, retry_unplaced=False, scope=None):
+    """
+    Mevcut programı güncel verilere göre onarır.
+    Geçerli sınavlar yerinde kalır, sadece geçersiz olanlar yeniden yerleştirilir.
+
+    Parametreler:
+        start_date: Sınav dönemi başlangıcı (varsayılan: yayındaki programın planlandığı
+                    dönem; dönemi kaydedilmemiş eski sürümlerde programdaki ilk gün)
+        end_date: Sınav dönemi bitişi (varsayılan: aynı şekilde dönem sonu / programdaki son gün)
+        verbose: False ise ekrana ders bazında mesaj yazılmaz
+        retry_unplaced: True ise sınavı olmayan (daha önce yerleşemeyen veya
+                        yeni eklenen) dersler de denenir
+        scope: Verilirse sadece bu kapsamdaki sınavlar doğrulanır
+               (bkz. placement_in_scope); diğerleri doğrulanmadan sabitlenir
+
+    Döndürür:
+        result: Sözlük
+            'kept_count': Yerinde kalan sınav sayısı
+            'invalidated': [(ders_kodu, sebep), ...]
+            'replaced_count': Yeniden yerleşen ders sayısı
+            'placed_courses': Yeniden yerleşen ders kodları
+            'failed_count': Yerleşemeyen ders sayısı
+            'failed_courses': Yerleşemeyen ders kodları
+            'changed': Program değişip yeni sürüm yayınlandı mı?
+            'elapsed': Geçen süre (saniye)
+    """
+    started = time.perf_counter()
+
+    snapshot = load_schedule_snapshot()
+    existing, orphan_course_ids = load_existing_placements(snapshot)
+
+    if start_date is None or end_date is None:
+        if not existing:
+            # Onarılacak program yok
+            return {'kept_count': 0, 'invalidated': [], 'replaced_count': 0, 'placed_courses': [],
+                    'failed_count': 0, 'failed_courses': [], 'changed': False, 'elapsed': 0.0}
+        period = get_published_period()
+        if period is None:
+            exam_dates = sorted(placement['exam_date'] for placement in existing)
+            period = (exam_dates[0], exam_dates[-1])
+        start_date = start_date or period[0]
+        end_date = end_date or period[1]
+
+    state = create_run_state(snapshot)
+    state['settings'] = build_schedule_settings(snapshot, start_date, end_date)
+
+    courses_by_id = {}
+    for course in snapshot['courses']:
+        courses_by_id[course['id']] = course
+
+    # Ortak gün, mevcut programdaki ortak derslerin günüdür (varsa)
+    for placement in existing:
+        if is_common_course(courses_by_id[placement['course_id']]):
+            state['settings']['common_exam_day'] = placement['exam_date']
+            break
+
+    block_unavailable_classrooms(state)
+
+    # 1. Mevcut sınavları doğrula, geçerli olanları sabitle. Kapsam verildiyse
+    # kapsam dışındaki sınavlar önce doğrulanmadan sabitlenir, kapsamdakiler
+    # onlara göre doğrulanır.
+    invalidated = []
+    invalidated_ids = set()
+    scheduled_ids = set()
+    if scope is not None:
+        in_scope = []
+        for placement in existing:
+            if placement_in_scope(placement, scope) or placement['course_id'] in scheduled_ids:
+                in_scope.append(placement)
+            else:
+                add_placement_in_memory(state, placement)
+                scheduled_ids.add(placement['course_id'])
+        existing_to_check = in_scope
+    else:
+        existing_to_check = existing
+
+    for placement in existing_to_check:
+        course = courses_by_id[placement['course_id']]
+        if placement['course_id'] in scheduled_ids:
+            reason = 'tekrar'
+        elif placement['exam_date'] not in state['settings']['exam_days']:
+            reason = 'dönem dışı'
+        else:
+            reason = find_invalid_reason(state, course, placement)
+
+        if reason is None:
+            add_placement_in_memory(state, placement)
+            scheduled_ids.add(placement['course_id'])
+        else:
+            invalidated.append((course['code'], reason))
+            invalidated_ids.add(course['id'])
+            if verbose:
+                print(f"Gecersiz sinav: {course['code']} ({reason})")
+
+    kept_count = len(state['placements'])
+
+    # 2. Sınavı geçersiz kalan dersleri kalan programın etrafına yerleştir
+    # (öğrenci sayısına göre, tam planlamayla aynı sıra). Daha önce de
+    # yerleşemeyen dersler her değişiklikte boşuna denenmesin diye atlanır.
+    pending = []
+    for course in snapshot['courses']:
+        if course['id'] in scheduled_ids:
+            continue
+        if retry_unplaced or course['id'] in invalidated_ids:
+            pending.append(course)
+    pending.sort(key=lambda c: not is_common_course(c))
+
+    placed_courses = []
+    for course in pending:
+        if place_course_in_state(state, course) is None:
+            state['failed_courses'].append(course)
+            if verbose:
+                print(f"UYARI: Ders {course['code']} yerlestirilemedi!")
+        else:
+            placed_courses.append(course['code'])
+
+    # 3. Sadece değişen dersleri yaz; satırları aynı kaldıysa yeni sürüm yayınlanmaz
+    changed_ids = invalidated_ids | set(course['id'] for course in pending)
+    old_rows = placements_to_exam_rows([p for p in existing if p['course_id'] in changed_ids])
+    new_rows = placements_to_exam_rows([p for p in state['placements'] if p['course_id'] in changed_ids])
+    changed = bool(orphan_course_ids) or sorted(old_rows, key=repr) != sorted(new_rows, key=repr)
+    if changed:
+        replace_course_exams(sorted(changed_ids | orphan_course_ids), new_rows)
+
+    result = {
+        'kept_count': kept_count,
+        'invalidated': invalidated,
+        'replaced_count': len(placed_courses),
+        'placed_courses': placed_courses,
+        'failed_count': len(state['failed_courses']),
+        'failed_courses': [course['code'] for course in state['failed_courses']],
+        'changed': changed,
+        'elapsed': round(time.perf_counter() - started, 3)
+    }
+
+    return result
+
+
+def describe_reschedule_result(result):
+    """
+    Yeniden planlama sonucunu yönetici için tek satırlık mesaja çevirir.
+
+    Döndürür:
+        message: Mesaj veya None (geçersiz sınav yoksa)
+    """
+    if not result['invalidated']:
+        return None
+
+    message = f"{len(result['invalidated'])} sınav geçersiz kaldı"
+    if result['placed_courses']:
+        message += f"; yeniden yerleşen: {', '.join(result['placed_courses'])}"
+    if result['failed_courses']:
+        message += f"; yerleşemeyen: {', '.join(result['failed_courses'])}"
+    return message + '.'
+
@@ -0,0 +1,158 @@
+# ==============================================
+# DERSLİK KÜMELERİ (Yakınlık + Kümülatif Kapasite)
+# ==============================================
+# Büyük sınavlar birden fazla dersliğe bölünür.
+# Dersliklerin birbirine yakın olması istenir.
+#
+# Bu dosya planlama başında BİR KERE hesaplanan
+# derslik kümelerini sağlar:
+#    - Her derslik için yakın derslikler (öncelik sırasıyla)
+#    - Kümenin kümülatif kapasiteleri (prefix sum):
+#        cumulative[k] = ana derslik + ilk k yakın derslik
+#      Kümenin toplam kapasitesi yetmiyorsa o ana derslik
+#      hiç denenmez.
+#    - Kümeye sadece ana derslikle AYNI türden (bilgisayarlı /
+#      bilgisayarsız) ve sınava açık yakın derslikler girer.
+#      Böylece her küme dersin kullanabileceği derslik
+#      kümesi içinde kalır: LAB sınavı normal dersliğe
+#      taşmaz, kapalı derslik kapasiteye sayılmaz.
+#
+# Yakınlık ile birleştirme bulunamazsa önce AYNI
+# binadaki derslikler birleştirilir. Kampüs genelinde
+# birleştirme sadece son çaredir.
+# ==============================================
+
+from app.database import execute_query
+
+
+def load_proximity_lists():
+    """
+    classroom_proximity tablosunu tek sorguyla okur.
+
+    Döndürür:
+        proximity: {derslik_id: [yakın derslik, ...]} (öncelik sırasına göre)
+    """
+    rows = execute_query("""
+        SELECT cp.classroom_id as base_id,
+               c.id, c.name, c.capacity, c.block, c.has_computer, c.is_available
+        FROM classroom_proximity cp
+        INNER JOIN classrooms c ON c.id = cp.nearby_classroom_id
+        ORDER BY cp.classroom_id, cp.priority ASC
+    """)
+
+    proximity = {}
+    for row in rows:
+        base_id = row['base_id']
+        if base_id not in proximity:
+            proximity[base_id] = []
+        proximity[base_id].append({
+            'id': row['id'],
+            'name': row['name'],
+            'capacity': row['capacity'],
+            'block': row['block'],
+            'has_computer': row['has_computer'],
+            'is_available': row['is_available']
+        })
+
+    return proximity
+
+
+def build_room_clusters(classrooms, proximity):
+    """
+    Her derslik için yakınlık kümesini ve kümülatif kapasitelerini hesaplar.
+    Yakın dersliklerden sadece ana derslikle aynı türde (has_computer)
+    ve kullanılabilir (is_available) olanlar kümeye alınır.
+
+    Parametreler:
+        classrooms: Tüm derslikler
+        proximity: {derslik_id: [yakın derslik, ...]}
+
+    Döndürür:
+        clusters: {derslik_id: {'neighbors': [...], 'cumulative': [kapasite, ...]}}
+    """
+    clusters = {}
+
+    for room in classrooms:
+        neighbors = [nearby for nearby in proximity.get(room['id'], [])
+                     if nearby['has_computer'] == room['has_computer'] and nearby['is_available']]
+        cumulative = [room['capacity']]
+        for nearby in neighbors:
+            cumulative.append(cumulative[-1] + nearby['capacity'])
+
+        clusters[room['id']] = {
+            'neighbors': neighbors,
+            'cumulative': cumulative
+        }
+
+    return clusters
+
+
+def cluster_can_fit(clusters, classroom_id, needed_capacity):
+    """Kümenin tamamı boş olsa bile kapasite yeter mi? (yetmiyorsa denemeye gerek yok)"""
+    cluster = clusters.get(classroom_id)
+    if cluster is None:
+        return False
+    return cluster['cumulative'][-1] >= needed_capacity
+
+
+def combine_rooms_in_one_building(available, needed_capacity):
+    """
+    Müsait derslikleri AYNI binadan birleştirmeye çalışır.
+    Binalar, en büyük müsait dersliği içeren binadan başlayarak denenir.
+
+    Parametreler:
+        available: Müsait derslikler (kapasiteye göre büyükten küçüğe)
+        needed_capacity: Gereken kapasite
+
+    Döndürür:
+        rooms: Derslik listesi veya None
+    """
+    buildings = []
+    rooms_by_building = {}
+    for room in available:
+        building = room['building']
+        if building not in rooms_by_building:
+            rooms_by_building[building] = []
+            buildings.append(building)
+        rooms_by_building[building].append(room)
+
+    for building in buildings:
+        rooms = rooms_by_building[building]
+        if sum(room['capacity'] for room in rooms) < needed_capacity:
+            continue
+
+        selected = []
+        current_capacity = 0
+        for room in rooms:
+            selected.append(room)
+            current_capacity += room['capacity']
+            if current_capacity >= needed_capacity:
+                return selected
+
+    return None
+
+
+def combine_rooms_anywhere(available, needed_capacity):
+    """
+    Son çare: müsait derslikleri bina ayırt etmeden birleştirir.
+
+    Parametreler:
+        available: Müsait derslikler (kapasiteye göre büyükten küçüğe)
+        needed_capacity: Gereken kapasite
+
+    Döndürür:
+        rooms: Derslik listesi veya None
+    """
+    total_capacity = sum(room['capacity'] for room in available)
+    if total_capacity < needed_capacity:
+        return None
+
+    selected = []
+    current_capacity = 0
+    for room in available:
+        selected.append(room)
+        current_capacity += room['capacity']
+        if current_capacity >= needed_capacity:
+            return selected
+
+    return None
@@ -41,6 +41,7 @@ from app.models.student import (
     get_all_students, get_student_by_id, get_students_by_department,
     get_student_courses, get_student_count, get_departments_with_student_count
 )
+from app.jobs import start_reschedule_job
 
 # Blueprint oluştur
 bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -121,6 +122,30 @@ def get_user_department_id():
     return user['department_id'] if 'department_id' in user.keys() else None
 
 
+def reschedule_after_change(course_ids=(), classroom_ids=(), instructor_ids=()):
+    """
+    Derslik, müsaitlik veya ders değişikliğinden sonra çağrılır.
+    Sadece düzenlenen ders, derslik veya hocayı içeren sınavları
+    doğrulayan artımlı yeniden planlamayı arka plan işi olarak
+    başlatır; sonuç (yeniden yerleşen ve yerleştirilemeyen
+    dersler) iş kaydına yazılır. Çalışan bir planlama varsa
+    programa aynı anda yazılmasın diye iş başlatılmaz.
+    """
+    scope = {'course_ids': list(course_ids), 'classroom_ids': list(classroom_ids),
+             'instructor_ids': list(instructor_ids)}
+    job, created = start_reschedule_job(scope)
+    
+    if job is None:
+        # Yayında program yok
+        return
+    
+    if created:
+        flash('Programdaki etkilenen sınavlar arka planda kontrol ediliyor.', 'info')
+    else:
+        flash('Şu anda çalışan bir planlama işi var; program bu değişiklik için kontrol edilemedi. '
+              'İş bittikten sonra değişikliği tekrar kaydedin.', 'warning')
+
+
 # ==============================================
 # FAKÜLTE YÖNETİMİ
 # ==============================================
@@ -483,7 +508,7 @@ def instructor_delete(instructor_id):
     if success:
         flash('Öğretim üyesi başarıyla silindi!', 'success')
     else:
-        flash('Bu öğretim üyesine bağlı dersler var, önce onları silin!', 'error')
+        flash('Bu öğretim üyesine bağlı dersler veya sınav planında gözetmenlik görevi var, önce onları değiştirin!', 'error')
     
     return redirect(url_for('admin.instructors_list'))
 
@@ -659,6 +684,8 @@ def course_edit(course_id):
         
         if success:
             flash('Ders başarıyla güncellendi!', 'success')
+            reschedule_after_change(course_ids=[course_id],
+                                    instructor_ids=[course['instructor_id'], int(instructor_id)])
             return redirect(url_for('admin.courses_list'))
         else:
             flash('Güncelleme sırasında hata oluştu!', 'error')
@@ -778,6 +805,7 @@ def classroom_edit(classroom_id):
         
         if success:
             flash('Derslik başarıyla güncellendi!', 'success')
+            reschedule_after_change(classroom_ids=[classroom_id])
             return redirect(url_for('admin.classrooms_list'))
         else:
             flash('Güncelleme sırasında hata oluştu!', 'error')
@@ -929,10 +957,13 @@ def availability_delete(availability_id):
         flash('Bu sayfaya erişim yetkiniz yok!', 'error')
         return redirect(url_for('auth.login'))
     
+    availability = get_availability_by_id(availability_id)
     success = delete_availability(availability_id)
     
     if success:
         flash('Müsaitlik kaydı başarıyla silindi!', 'success')
+        if availability:
+            reschedule_after_change(instructor_ids=[availability['instructor_id']])
     else:
         flash('Silme sırasında hata oluştu!', 'error')
     
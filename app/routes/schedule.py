@@ -5,15 +5,22 @@
 # otomatik planlama işlemlerini yönetir.
 # ==============================================
 
+import json
+
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, send_file
 from datetime import datetime, timedelta
 
 from app.models.exam import (
-    get_all_exams, delete_exam, delete_all_exams, get_exams_by_department,
+    get_all_exams, delete_exam, delete_all_exams, rollback_schedule, get_exams_by_department,
     get_exams_by_student, get_exams_by_instructor, get_supervised_exams_by_instructor
 )
 from app.models.department import get_all_departments
-from app.scheduler import generate_exam_schedule, get_schedule_statistics
+from app.scheduler import get_schedule_statistics
+from app.jobs import start_generation_job, cancel_generation_job, job_to_dict
+from app.what_if import get_draft_summary, publish_draft
+from app.coenrollment import get_conflict_pair_report
+from app.models.job import JOB_DONE, get_job_by_id, get_active_job
+from app.ordering import ORDERING_STRATEGIES
 from app.export import export_to_pdf, export_to_excel
 from app.database import execute_query
 
@@ -181,17 +188,74 @@ def generate():
             flash('Başlangıç tarihi bitiş tarihinden sonra olamaz!', 'error')
             return render_template('schedule/generate.html')
         
-        # Planlamayı çalıştır
-        result = generate_exam_schedule(start_date, end_date)
+        # Sıralama yöntemi (varsayılan: en kısıtlı ders önce)
+        ordering = request.form.get('ordering', 'dsatur')
+        if ordering not in ORDERING_STRATEGIES:
+            flash('Geçersiz sıralama yöntemi!', 'error')
+            return render_template('schedule/generate.html')
         
-        # Sonucu göster
-        if result['failed_count'] == 0:
-            flash('Tüm sınavlar başarıyla planlandı! (' + 
-                  str(result['placed_count']) + ' sınav)', 'success')
+        # Greedy sonrası yerel arama yapılsın mı?
+        improve = True if request.form.get('improve') else False
+        
+        # Deneme: yayındaki program değişmez, sonuç taslak olarak saklanır
+        dry_run = True if request.form.get('dry_run') else False
+        
+        # Paralel deneme sayısı
+        try:
+            attempts = int(request.form.get('attempts', 1))
+        except ValueError:
+            attempts = 1
+        attempts = max(1, min(attempts, 32))
+        
+        # Bağımsız fakülteleri ayrı işlemlerde paralel planla
+        components = True if request.form.get('components') else False
+        if components and attempts > 1:
+            flash('Paralel parça planlaması birden fazla denemeyle birlikte kullanılamaz!', 'error')
+            return render_template('schedule/generate.html')
+        
+        # Süre sınırı (saniye, boş ise sınırsız). Dolunca o ana kadarki program kaydedilir
+        time_limit = request.form.get('time_limit', '').strip()
+        if time_limit:
+            try:
+                time_limit = float(time_limit)
+            except ValueError:
+                time_limit = 0
+            if time_limit <= 0:
+                flash('Süre sınırı pozitif bir sayı olmalıdır!', 'error')
+                return render_template('schedule/generate.html')
         else:
-            flash(str(result['placed_count']) + ' sınav planlandı, ' +
-                  str(result['failed_count']) + ' sınav yerleştirilemedi.', 'warning')
+            time_limit = None
+        
+        # Planlamayı arka planda başlat (istek beklemeden döner)
+        job, created = start_generation_job(start_date, end_date, ordering=ordering, improve=improve,
+                                            attempts=attempts, time_limit=time_limit, dry_run=dry_run,
+                                            components=components)
+        
+        if not created:
+            flash('Zaten çalışan bir planlama var, ilerlemesi gösteriliyor.', 'info')
         
+        return redirect(url_for('schedule.generate', job_id=job['id']))
+    
+    # İş takibi: ?job_id=... verilmişse o iş, yoksa çalışan iş gösterilir
+    job_id = request.args.get('job_id', type=int)
+    job = get_job_by_id(job_id) if job_id else get_active_job()
+    
+    # Biten iş: sonucu bildir ve programa git
+    if job and job_id and job['status'] == JOB_DONE:
+        if job['message']:
+            flash(job['message'], 'info')
+        
+        # Deneme planlaması: taslak ve farkı göster
+        result = json.loads(job['result'] or '{}')
+        if result.get('dry_run'):
+            return redirect(url_for('schedule.view_draft', draft_id=result['draft_id']))
+        
+        if job['failed_count'] == 0:
+            flash('Tüm sınavlar başarıyla planlandı! (' + 
+                  str(job['placed_count']) + ' sınav)', 'success')
+        else:
+            flash(str(job['placed_count']) + ' sınav planlandı, ' +
+                  str(job['failed_count']) + ' sınav yerleştirilemedi.', 'warning')
         return redirect(url_for('schedule.view_schedule'))
     
     # Varsayılan tarihler (bugünden 2 hafta sonrasına)
@@ -201,7 +265,105 @@ def generate():
     
     return render_template('schedule/generate.html',
                            default_start=default_start,
-                           default_end=default_end)
+                           default_end=default_end,
+                           job=job_to_dict(job) if job else None)
+
+
+@bp.route('/jobs/<int:job_id>')
+def job_status(job_id):
+    """
+    Planlama işinin durumunu JSON olarak döndürür.
+    Planlama sayfası bu adresi sorgulayarak ilerlemeyi gösterir.
+    """
+    # Admin kontrolü
+    if not check_admin():
+        return {'error': 'Yetkisiz erişim'}, 403
+    
+    job = get_job_by_id(job_id)
+    if job is None:
+        return {'error': 'İş bulunamadı'}, 404
+    
+    return job_to_dict(job)
+
+
+@bp.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """
+    Çalışan planlama işini iptal eder (JSON).
+    Planlama bir sonraki derste durur, o ana kadarki program kaydedilir.
+    """
+    # Admin kontrolü
+    if not check_admin():
+        return {'error': 'Yetkisiz erişim'}, 403
+    
+    job = get_job_by_id(job_id)
+    if job is None:
+        return {'error': 'İş bulunamadı'}, 404
+    
+    cancelled = cancel_generation_job(job_id)
+    
+    return {'id': job_id, 'cancelled': cancelled}
+
+
+@bp.route('/conflict-pairs')
+def conflict_pairs():
+    """
+    Ortak öğrencisi olduğu için aynı slota konamayacak ders çiftlerini
+    JSON olarak döndürür (?min_shared=N: en az N ortak öğrenci).
+    """
+    # Admin kontrolü
+    if not check_admin():
+        return {'error': 'Yetkisiz erişim'}, 403
+    
+    min_shared = request.args.get('min_shared', 1, type=int)
+    pairs = get_conflict_pair_report(min_shared)
+    
+    return {'min_shared': min_shared, 'count': len(pairs), 'pairs': pairs}
+
+
+@bp.route('/drafts/<int:draft_id>')
+def view_draft(draft_id):
+    """
+    Deneme planlamasının sonucunu, istatistiklerini ve
+    yayındaki programla farkını gösterir.
+    """
+    # Admin kontrolü
+    if not check_admin():
+        flash('Bu sayfaya erişim yetkiniz yok!', 'error')
+        return redirect(url_for('auth.login'))
+    
+    draft = get_draft_summary(draft_id)
+    if draft is None:
+        flash('Taslak bulunamadı!', 'error')
+        return redirect(url_for('schedule.generate'))
+    
+    return render_template('schedule/draft.html', draft=draft)
+
+
+@bp.route('/drafts/<int:draft_id>/publish', methods=['POST'])
+def publish_draft_route(draft_id):
+    """
+    Deneme planlamasını yeniden hesaplamadan yayınlar.
+    """
+    # Admin kontrolü
+    if not check_admin():
+        flash('Bu sayfaya erişim yetkiniz yok!', 'error')
+        return redirect(url_for('auth.login'))
+    
+    # Yayındaki program taslaktan sonra değiştiyse açık onay gerekir
+    force = request.form.get('force') == '1'
+    
+    try:
+        saved_count = publish_draft(draft_id, force=force)
+    except ValueError as error:
+        flash(str(error), 'error')
+        if get_draft_summary(draft_id) is None:
+            return redirect(url_for('schedule.generate'))
+        return redirect(url_for('schedule.view_draft', draft_id=draft_id))
+    
+    flash('Taslak yayınlandı (' + str(saved_count) + ' sınav kaydı).', 'success')
+    
+    return redirect(url_for('schedule.view_schedule'))
 
 
 @bp.route('/clear')
@@ -223,6 +385,27 @@ def clear_schedule():
     return redirect(url_for('schedule.view_schedule'))
 
 
+@bp.route('/rollback', methods=['POST'])
+def rollback():
+    """
+    Bir önceki sınav programına geri döner.
+    Sadece yayın işaretçisi değişir, anında gerçekleşir.
+    """
+    # Admin kontrolü
+    if not check_admin():
+        flash('Bu sayfaya erişim yetkiniz yok!', 'error')
+        return redirect(url_for('auth.login'))
+    
+    version_id = rollback_schedule()
+    
+    if version_id is None:
+        flash('Geri dönülecek önceki bir program yok.', 'warning')
+    else:
+        flash('Önceki sınav programına geri dönüldü.', 'success')
+    
+    return redirect(url_for('schedule.view_schedule'))
+
+
 @bp.route('/delete/<int:exam_id>')
 def delete_single_exam(exam_id):
     """
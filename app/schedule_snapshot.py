@@ -0,0 +1,134 @@
+# ==============================================
+# PLANLAMA VERİ ANLIK GÖRÜNTÜSÜ (Snapshot)
+# ==============================================
+# Bu dosya planlama için gereken tüm verileri
+# TEK bir veritabanı bağlantısıyla bir kere okur.
+#
+# Planlama sırasında her kontrol için ayrı SQL
+# sorgusu çalıştırmak yerine bu veriler bellekte
+# tutulur ve sorgular sözlüklerden cevaplanır:
+#    - Derslikler ve yakınlık listeleri
+#    - Dersler
+#    - Öğretim üyeleri ve müsaitlikleri (bit maskesi olarak)
+#    - Öğrenci-ders kayıtları
+# ==============================================
+
+from app.database import get_db_connection
+from app.room_clusters import build_room_clusters
+from app.availability_index import (
+    get_availability_masks, is_available_in_masks, count_available_instructors_by_day
+)
+
+# Gün isimleri (datetime.weekday() sırasıyla)
+DAY_NAMES = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar']
+
+
+def time_to_minutes(time_text):
+    """
+    'HH:MM' formatındaki saati gün başından itibaren dakikaya çevirir.
+    Örnek: '09:30' -> 570
+    """
+    hour, minute = time_text.split(':')
+    return int(hour) * 60 + int(minute)
+
+
+def minutes_to_time(minutes):
+    """
+    Dakika değerini 'HH:MM' formatına çevirir.
+    Örnek: 570 -> '09:30'
+    """
+    return '%02d:%02d' % (minutes // 60, minutes % 60)
+
+
+def load_schedule_snapshot():
+    """
+    Planlama için gereken tüm verileri bir kerede yükler.
+
+    Döndürür:
+        snapshot: Sözlük
+            'classrooms': Tüm derslikler (bina, ad sırasına göre)
+            'classrooms_by_id': {derslik_id: derslik}
+            'courses': Tüm dersler (öğrenci sayısına göre azalan)
+            'instructor_ids': Öğretim üyesi ID listesi
+            'availability': {(hoca_id, gün_adı): müsaitlik maskesi} (bkz. app/availability_index.py)
+            'enrollments': {ders_id: {öğrenci_id, ...}}
+            'proximity': {derslik_id: [yakın derslik, ...]} (öncelik sırasına göre)
+            'room_clusters': {derslik_id: {'neighbors', 'cumulative'}} (bkz. app/room_clusters.py)
+            'available_instructor_count_by_day': {gün_adı: müsait hoca sayısı}
+    """
+    # Tek bağlantı aç, tüm verileri oku, kapat
+    connection = get_db_connection()
+    cursor = connection.cursor()
+
+    # Derslikler (get_all_classrooms ile aynı sıralama)
+    cursor.execute("SELECT * FROM classrooms ORDER BY building, name")
+    classrooms = [dict(row) for row in cursor.fetchall()]
+    classrooms_by_id = {}
+    for room in classrooms:
+        classrooms_by_id[room['id']] = room
+
+    # Dersler (büyükten küçüğe)
+    cursor.execute("SELECT * FROM courses ORDER BY student_count DESC")
+    courses = [dict(row) for row in cursor.fetchall()]
+
+    # Öğretim üyeleri (find_available_supervisors ile aynı sorgu, aynı sıra)
+    cursor.execute("SELECT id FROM instructors")
+    instructor_ids = [row['id'] for row in cursor.fetchall()]
+
+    # Öğrenci-ders kayıtları
+    cursor.execute("SELECT student_id, course_id FROM student_courses")
+    enrollments = {}
+    for row in cursor.fetchall():
+        course_id = row['course_id']
+        if course_id not in enrollments:
+            enrollments[course_id] = set()
+        enrollments[course_id].add(row['student_id'])
+
+    # Derslik yakınlıkları (get_nearby_classrooms ile aynı sıralama)
+    cursor.execute("""
+        SELECT cp.classroom_id as base_id,
+               c.id, c.name, c.capacity, c.block, c.has_computer, c.is_available
+        FROM classroom_proximity cp
+        INNER JOIN classrooms c ON c.id = cp.nearby_classroom_id
+        ORDER BY cp.classroom_id, cp.priority ASC
+    """)
+    proximity = {}
+    for row in cursor.fetchall():
+        base_id = row['base_id']
+        if base_id not in proximity:
+            proximity[base_id] = []
+        proximity[base_id].append({
+            'id': row['id'],
+            'name': row['name'],
+            'capacity': row['capacity'],
+            'block': row['block'],
+            'has_computer': row['has_computer'],
+            'is_available': row['is_available']
+        })
+
+    connection.close()
+
+    # Müsaitlik maskeleri (veri değişmediyse önbellekten gelir)
+    availability = get_availability_masks()
+
+    snapshot = {
+        'classrooms': classrooms,
+        'classrooms_by_id': classrooms_by_id,
+        'courses': courses,
+        'instructor_ids': instructor_ids,
+        'availability': availability,
+        'enrollments': enrollments,
+        'proximity': proximity,
+        'room_clusters': build_room_clusters(classrooms, proximity),
+        'available_instructor_count_by_day': count_available_instructors_by_day(availability)
+    }
+
+    return snapshot
+
+
+def is_instructor_available_in_snapshot(snapshot, instructor_id, day_name, start_minute, end_minute):
+    """
+    check_instructor_available fonksiyonunun bellek içi karşılığı.
+    Hoca o gün verilen aralığın tamamında müsait mi? (tek bit testi)
+    """
+    return is_available_in_masks(snapshot['availability'], instructor_id, day_name, start_minute, end_minute)
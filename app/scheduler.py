@@ -17,112 +17,106 @@
 # 6. Uygunsa yerleştir, değilse sonraki slotu dene
 # ==============================================
 
+import time
+
+from config import SINAV_OGRENCI_GUNLUK_EN_FAZLA, SINAV_OGRENCI_EN_AZ_ARA, SINAV_GUN_DENGELEME
 from app.database import execute_query
-from app.models.exam import create_exam, delete_all_exams, check_classroom_conflict, check_instructor_conflict
-from app.models.classroom import get_available_classrooms, get_computer_classrooms, get_all_classrooms
-from app.models.course import get_courses_with_exam
+from app.models.exam import (
+    VERSION_CONDITION, get_exam_time_columns, create_exams_bulk, delete_all_exams, replace_all_exams,
+    check_classroom_conflict, check_instructor_conflict, create_schedule_version, publish_schedule_version,
+    discard_schedule_version, replace_version_exams
+)
+from app.models.classroom import get_all_classrooms
 from app.models.availability import check_instructor_available
+from app.availability_index import (
+    get_availability_masks, is_available_in_masks, count_available_instructors_by_day
+)
+from app.schedule_snapshot import (
+    DAY_NAMES, load_schedule_snapshot, time_to_minutes, minutes_to_time, is_instructor_available_in_snapshot
+)
+from app.occupancy import (
+    create_occupancy_index, is_room_busy, is_instructor_busy, is_supervisor_busy,
+    get_overlapping_courses, add_exam_to_index, remove_exam_from_index
+)
+from app.conflict_graph import load_enrollments, build_conflict_graph, has_conflict_with_any, find_student_clashes
+from app.student_load import (
+    create_student_load_index, violates_student_load, add_exam_to_student_load, remove_exam_from_student_load
+)
+from app.day_load import (
+    create_day_load_index, add_exam_to_day_load, remove_exam_from_day_load, iterate_balanced_days, order_day_slots
+)
+from app.slot_grid import (
+    compile_slot_grid, get_day_name, get_day_slots, get_exam_starts, fits_in_day, get_time_slots
+)
+from app.ordering import iterate_courses
+from app.room_clusters import (
+    load_proximity_lists, build_room_clusters, cluster_can_fit,
+    combine_rooms_in_one_building, combine_rooms_anywhere
+)
+from app.instrumentation import (
+    CHECK_DURATION, CHECK_DEPARTMENT, CHECK_INSTRUCTOR_AVAILABILITY, CHECK_INSTRUCTOR_CONFLICT,
+    CHECK_STUDENT, CHECK_STUDENT_LOAD, CHECK_ROOM, CHECK_SUPERVISOR, CHECK_COMMON_DAY,
+    create_profile, record_check, record_attempt, record_rejection, get_main_reason,
+    summarize_profile, dump_profile
+)
+from app.deadline import create_deadline, get_stop_reason, get_remaining_time
 
 
-# Her gün için hangi bölümün sınavları yapıldığını takip et
-daily_department_exams = {}
-
-def clear_exam_schedule():
+def create_sql_run_state(classrooms=None, version_id=None):
     """
-    Sınav programını temizler.
-    """
-    delete_all_exams()
-
+    SQL ile çalışan planlamanın çalıştırma durumunu oluşturur.
+    Bölüm aralıkları, derslik kümeleri ve müsaitlik maskeleri modül
+    değişkeninde değil bu sözlükte tutulur; böylece aynı işlemde
+    birden fazla planlama (thread) birbirini bozmadan çalışabilir.
 
-def generate_exam_schedule(start_date, end_date):
-    """
-    Sınav programı oluşturur.
-    
     Parametreler:
-        start_date: Sınav dönemi başlangıç tarihi (YYYY-MM-DD)
-        end_date: Sınav dönemi bitiş tarihi (YYYY-MM-DD)
-    
+        classrooms: Tüm derslikler (verilmezse veritabanından okunur)
+        version_id: Sınavların yazıldığı ve kontrol edildiği sürüm
+                    (None ise yayındaki sürüm)
+
     Döndürür:
-        result: Sonuç bilgisi (başarılı sayısı, başarısız listesi)
+        state: Sözlük
+            'version_id': Yazılan sürüm
+            'conflict_graph': Ders çakışma grafı (öğrenci çakışması kontrolü için)
+            'student_load': Öğrenci günlük sınav sayaçları (bkz. app/student_load.py)
+            'day_load': Gün ve slot yük sayaçları (bkz. app/day_load.py)
+            'slot_grid': Sınav saat ızgarası (bkz. app/slot_grid.py)
+            'department_exams': {(tarih, bölüm_id): son bitiş (dakika)}
+            'room_clusters': Derslik yakınlık kümeleri (bkz. app/room_clusters.py)
+            'availability_masks': Derlenmiş hoca müsaitlik maskeleri
+            'counters': {'placed': yerleşen, 'failed': yerleşemeyen}
+            'profile': Kontrol süreleri ve red nedenleri (bkz. app/instrumentation.py)
     """
-    global daily_department_exams
-    daily_department_exams = {}
-    
-    # Önce mevcut planı temizle
-    delete_all_exams()
-    
-    # Sınavı olan dersleri al (öğrenci sayısına göre sıralı)
-    courses = get_courses_with_exam()
-    
-    # Dersleri bölüme göre grupla ve karıştır
-    # Aynı bölüm sınavlarının ardışık gelmemesi için
-    courses = shuffle_by_department(courses)
-    
-    # Uygun derslikleri al
-    classrooms = get_available_classrooms()
-    
-    # Bilgisayarlı derslikleri ayrı al
-    computer_classrooms = get_computer_classrooms()
-    
-    # Sınav günlerini oluştur
-    exam_days = generate_exam_days(start_date, end_date)
-    
-    # Sınav saatlerini tanımla
-    time_slots = generate_time_slots()
-    
-    # Sonuçları takip et
-    placed_count = 0
-    failed_courses = []
-    
-    # Her ders için planlama yap
-    for course in courses:
-        # Bu dersi yerleştir
-        success = place_course_exam(course, classrooms, computer_classrooms, 
-                                    exam_days, time_slots)
-        
-        if success:
-            placed_count = placed_count + 1
-        else:
-            # Yerleştirilemedi
-            failed_courses.append(course)
-    
-    # Sonuç döndür
-    result = {
-        'total_courses': len(courses),
-        'placed_count': placed_count,
-        'failed_count': len(failed_courses),
-        'failed_courses': failed_courses
+    if classrooms is None:
+        classrooms = get_all_classrooms()
+
+    enrollments = load_enrollments()
+
+    seats_by_course = {}
+    for row in execute_query("SELECT id, student_count FROM courses"):
+        seats_by_course[row['id']] = row['student_count']
+
+    state = {
+        'version_id': version_id,
+        'conflict_graph': build_conflict_graph(enrollments),
+        'student_load': create_student_load_index(enrollments, SINAV_OGRENCI_GUNLUK_EN_FAZLA,
+                                                  SINAV_OGRENCI_EN_AZ_ARA),
+        'day_load': create_day_load_index(seats_by_course, SINAV_GUN_DENGELEME),
+        'slot_grid': compile_slot_grid(),
+        'department_exams': {},
+        'room_clusters': build_room_clusters(classrooms, load_proximity_lists()),
+        'availability_masks': get_availability_masks(),
+        'counters': {'placed': 0, 'failed': 0},
+        'profile': create_profile()
     }
-    
-    return result
+    return state
 
 
-def shuffle_by_department(courses):
+def clear_exam_schedule():
     """
-    Dersleri bölümlere göre karıştırır.
-    Aynı bölüm sınavları ardışık gelmesin.
-    
-    Round-robin yöntemi kullanır:
-    Bölüm1-Ders1, Bölüm2-Ders1, Bölüm3-Ders1, Bölüm1-Ders2, ...
+    Sınav programını temizler.
     """
-    # Bölümlere göre grupla
-    dept_courses = {}
-    for course in courses:
-        dept_id = course['department_id']
-        if dept_id not in dept_courses:
-            dept_courses[dept_id] = []
-        dept_courses[dept_id].append(course)
-    
-    # Round-robin şeklinde birleştir
-    shuffled = []
-    max_len = max(len(courses) for courses in dept_courses.values()) if dept_courses else 0
-    
-    for i in range(max_len):
-        for dept_id in dept_courses:
-            if i < len(dept_courses[dept_id]):
-                shuffled.append(dept_courses[dept_id][i])
-    
-    return shuffled
+    delete_all_exams()
 
 
 def generate_exam_days(start_date, end_date):
@@ -173,15 +167,8 @@ def generate_time_slots():
     Döndürür:
         slots: Saat dilimleri listesi [(başlangıç, bitiş), ...]
     """
-    # Sabit sınav saatleri - daha fazla slot
-    slots = [
-        ('09:00', '11:00'),
-        ('11:00', '13:00'),
-        ('14:00', '16:00'),
-        ('16:00', '18:00')
-    ]
-    
-    return slots
+    # Saatler config.SINAV_SLOT_IZGARASI içindeki varsayılan şablondan gelir
+    return get_time_slots(compile_slot_grid())
 
 
 def calculate_end_time(start_time, duration_minutes):
@@ -197,29 +184,40 @@ def calculate_end_time(start_time, duration_minutes):
     return end_time
 
 
-def check_student_conflict(course_id, exam_date, start_time, end_time):
+def check_student_conflict(course_id, exam_date, start_time, end_time, version_id=None, graph=None):
     """
     Öğrenci çakışması olup olmadığını kontrol eder.
+    version_id: Kontrol edilen sürüm (varsayılan: yayındaki sürüm)
+    graph: Çakışma grafı verilirse student_courses ile self-join yapılmaz;
+           sadece o saatteki dersler okunur ve grafta aranır.
     """
-    query = """
+    date_ord, start_min, end_min = get_exam_time_columns(exam_date, start_time, end_time)
+    
+    if graph is not None:
+        query = f"""
+            SELECT DISTINCT course_id FROM exam_schedule_versions
+            WHERE {VERSION_CONDITION}
+              AND date_ord = ?
+              AND start_min < ? AND end_min > ?
+              AND course_id != ?
+        """
+        params = (version_id, date_ord, end_min, start_min, course_id)
+        overlapping = set(row['course_id'] for row in execute_query(query, params))
+        return has_conflict_with_any(graph, course_id, overlapping)
+    
+    query = f"""
         SELECT COUNT(*) as count
         FROM student_courses sc1
         INNER JOIN student_courses sc2 ON sc1.student_id = sc2.student_id
-        INNER JOIN exam_schedule e ON sc2.course_id = e.course_id
-        WHERE sc1.course_id = ?
+        INNER JOIN exam_schedule_versions e ON sc2.course_id = e.course_id
+        WHERE e.{VERSION_CONDITION}
+          AND sc1.course_id = ?
           AND sc2.course_id != ?
-          AND e.exam_date = ?
-          AND (
-              (e.start_time <= ? AND e.end_time > ?)
-              OR (e.start_time < ? AND e.end_time >= ?)
-              OR (e.start_time >= ? AND e.end_time <= ?)
-          )
+          AND e.date_ord = ?
+          AND e.start_min < ? AND e.end_min > ?
     """
     
-    params = (course_id, course_id, exam_date,
-              start_time, start_time,
-              end_time, end_time,
-              start_time, end_time)
+    params = (version_id, course_id, course_id, date_ord, end_min, start_min)
     
     results = execute_query(query, params)
     
@@ -229,46 +227,34 @@ def check_student_conflict(course_id, exam_date, start_time, end_time):
     return False
 
 
-def check_department_consecutive(department_id, exam_date, start_time):
+def check_department_consecutive(state, department_id, exam_date, start_minute):
     """
     Aynı bölümün sınavının aynı gün ardışık olup olmadığını kontrol eder.
-    En az 2 saat ara olmalı.
+    En az 2 saat ara olmalı. Saatler gün başından itibaren dakikadır.
     """
-    global daily_department_exams
-    
-    key = f"{exam_date}_{department_id}"
+    key = (exam_date, department_id)
     
-    if key not in daily_department_exams:
+    if key not in state['department_exams']:
         return False  # Bu gün bu bölümün sınavı yok, OK
     
-    # Bu gündeki son sınav saatini kontrol et
-    last_end_time = daily_department_exams[key]
+    # Bu gündeki son sınavın bitişi ile arada en az 2 saat olmalı
+    last_end = state['department_exams'][key]
     
-    # En az 2 saat ara olmalı
-    from datetime import datetime, timedelta
-    
-    last_end = datetime.strptime(last_end_time, '%H:%M')
-    current_start = datetime.strptime(start_time, '%H:%M')
-    
-    diff = (current_start - last_end).total_seconds() / 3600  # Saat farkı
-    
-    if diff < 2:
+    if start_minute - last_end < 120:
         return True  # Çok yakın, çakışma
     
     return False
 
 
-def update_department_schedule(department_id, exam_date, end_time):
+def update_department_schedule(state, department_id, exam_date, end_minute):
     """
-    Bölümün günlük sınav programını günceller.
+    Bölümün günlük sınav programını günceller (son bitiş, dakika).
     """
-    global daily_department_exams
-    
-    key = f"{exam_date}_{department_id}"
+    key = (exam_date, department_id)
     
     # Son bitiş saatini güncelle
-    if key not in daily_department_exams or end_time > daily_department_exams[key]:
-        daily_department_exams[key] = end_time
+    if key not in state['department_exams'] or end_minute > state['department_exams'][key]:
+        state['department_exams'][key] = end_minute
 
 
 def get_day_exam_count(exam_date):
@@ -280,17 +266,23 @@ def get_day_exam_count(exam_date):
     return results[0]['count']
 
 
-def get_nearby_classrooms(classroom_id):
+def get_nearby_classrooms(state, classroom_id):
     """
     Bir dersliğin yakın dersliklerini öncelik sırasına göre döndürür.
     classroom_proximity tablosundan veri çeker.
     
     Parametreler:
+        state: Çalıştırma durumu (create_sql_run_state)
         classroom_id: Ana derslik ID'si
     
     Döndürür:
         nearby_rooms: Yakın derslik listesi (öncelik sırasına göre)
     """
+    # Planlama başında yüklenen kümeler varsa sorgu atma
+    clusters = state['room_clusters']
+    if clusters is not None and classroom_id in clusters:
+        return clusters[classroom_id]['neighbors']
+    
     query = """
         SELECT c.id, c.name, c.capacity, c.block, c.has_computer, c.is_available
         FROM classrooms c
@@ -301,7 +293,7 @@ def get_nearby_classrooms(classroom_id):
     return execute_query(query, (classroom_id,))
 
 
-def find_available_classrooms(classrooms, exam_date, start_time, end_time, needed_capacity):
+def find_available_classrooms(state, classrooms, exam_date, start_time, end_time, needed_capacity):
     """
     Belirtilen kapasiteyi karşılayan müsait derslik(ler)i bulur.
     Yakınlık bilgisini kullanarak akıllı dağıtım yapar.
@@ -309,16 +301,19 @@ def find_available_classrooms(classrooms, exam_date, start_time, end_time, neede
     Algoritma:
     1. Önce tek başına yeterli kapasiteli derslik ara
     2. Bulunamazsa, en büyük dersliği seç ve yakınlarından tamamla
-    3. Yakınlık yoksa, kapasiteye göre birleştir
+    3. Yakınlık yoksa, aynı binadaki derslikleri birleştir
+    4. O da olmazsa, kapasiteye göre birleştir (son çare)
     
     Döndürür:
-        rooms: Uygun derslik listesi veya None
+        rooms: Uygun derslik listesi veya None (yakın derslikler de sadece
+               verilen derslik listesinden seçilir)
     """
+    allowed_ids = set(room['id'] for room in classrooms)
     available = []
     
     # Önce müsait derslikleri bul
     for room in classrooms:
-        room_busy = check_classroom_conflict(room['id'], exam_date, start_time, end_time)
+        room_busy = check_classroom_conflict(room['id'], exam_date, start_time, end_time, state['version_id'])
         if not room_busy:
             # Tek derslik yeterli mi?
             if room['capacity'] >= needed_capacity:
@@ -333,24 +328,30 @@ def find_available_classrooms(classrooms, exam_date, start_time, end_time, neede
     available.sort(key=lambda x: x['capacity'], reverse=True)
     
     # Her büyük derslik için yakınlık bazlı birleştirme dene
+    clusters = state['room_clusters']
     for base_room in available:
+        # Kümenin tamamı bile yetmiyorsa yakınlarını hiç kontrol etme
+        if clusters is not None and not cluster_can_fit(clusters, base_room['id'], needed_capacity):
+            continue
+        
         selected = [base_room]
         current_capacity = base_room['capacity']
         used_ids = {base_room['id']}
         
         # Yakın derslikleri al
-        nearby_rooms = get_nearby_classrooms(base_room['id'])
+        nearby_rooms = get_nearby_classrooms(state, base_room['id'])
         
         # Yakın ve müsait derslikleri ekle
         for nearby in nearby_rooms:
             if current_capacity >= needed_capacity:
                 break  # Yeterli kapasite sağlandı
             
-            if nearby['id'] in used_ids:
-                continue  # Zaten eklendi
+            if nearby['id'] in used_ids or nearby['id'] not in allowed_ids:
+                continue  # Zaten eklendi veya bu ders için uygun değil
             
             # Yakın derslik müsait mi?
-            nearby_busy = check_classroom_conflict(nearby['id'], exam_date, start_time, end_time)
+            nearby_busy = check_classroom_conflict(nearby['id'], exam_date, start_time, end_time,
+                                                   state['version_id'])
             if not nearby_busy:
                 # Derslik bilgisini tam olarak al
                 selected.append({
@@ -368,54 +369,56 @@ def find_available_classrooms(classrooms, exam_date, start_time, end_time, neede
         if current_capacity >= needed_capacity:
             return selected
     
-    # Yakınlık ile bulunamadı, genel birleştirme dene
-    total_capacity = sum(room['capacity'] for room in available)
+    # Yakınlık ile bulunamadı, aynı binadan birleştirme dene
+    selected = combine_rooms_in_one_building(available, needed_capacity)
+    if selected:
+        return selected
     
-    if total_capacity >= needed_capacity:
-        selected = []
-        current_capacity = 0
-        
-        for room in available:
-            selected.append(room)
-            current_capacity += room['capacity']
-            
-            if current_capacity >= needed_capacity:
-                return selected
+    # Son çare: genel birleştirme (yoksa None)
+    return combine_rooms_anywhere(available, needed_capacity)
+
+
+def check_instructor_available_fast(state, instructor_id, day_name, start_time, end_time):
+    """
+    check_instructor_available ile aynı sonucu verir.
+    Planlama başında alınan maskeler varsa veritabanına hiç gitmez (tek bit testi).
+    """
+    masks = state['availability_masks']
+    if masks is None:
+        return check_instructor_available(instructor_id, day_name, start_time, end_time)
     
-    # Hiçbir kombinasyon yeterli değil
-    return None
+    return is_available_in_masks(masks, instructor_id, day_name,
+                                 time_to_minutes(start_time), time_to_minutes(end_time))
 
 
-def check_supervisor_conflict(instructor_id, exam_date, start_time, end_time):
+def check_supervisor_conflict(instructor_id, exam_date, start_time, end_time, version_id=None):
     """
     Gözetmenin (supervisor) başka bir sınavda görevli olup olmadığını kontrol eder.
+    version_id: Kontrol edilen sürüm (varsayılan: yayındaki sürüm)
     """
-    query = """
-        SELECT id FROM exam_schedule 
-        WHERE supervisor_id = ? 
-          AND exam_date = ?
-          AND (
-              (start_time <= ? AND end_time > ?)
-              OR (start_time < ? AND end_time >= ?)
-              OR (start_time >= ? AND end_time <= ?)
-          )
+    date_ord, start_min, end_min = get_exam_time_columns(exam_date, start_time, end_time)
+    
+    query = f"""
+        SELECT id FROM exam_schedule_versions 
+        WHERE {VERSION_CONDITION}
+          AND supervisor_id = ? 
+          AND date_ord = ?
+          AND start_min < ? AND end_min > ?
     """
     
-    params = (instructor_id, exam_date, 
-              start_time, start_time,
-              end_time, end_time,
-              start_time, end_time)
+    params = (version_id, instructor_id, date_ord, end_min, start_min)
     
     results = execute_query(query, params)
     
     return len(results) > 0
 
 
-def find_available_supervisors(day_name, exam_date, start_time, end_time, exclude_ids=None):
+def find_available_supervisors(state, day_name, exam_date, start_time, end_time, exclude_ids=None):
     """
     Belirtilen saatte müsait olan gözetmenleri bulur.
     
     Parametreler:
+        state: Çalıştırma durumu (create_sql_run_state)
         day_name: Gün adı (Pazartesi, Salı, ...)
         exam_date: Sınav tarihi
         start_time: Başlangıç saati
@@ -442,17 +445,19 @@ def find_available_supervisors(day_name, exam_date, start_time, end_time, exclud
             continue
         
         # O gün müsait mi?
-        is_free = check_instructor_available(instructor_id, day_name, start_time, end_time)
+        is_free = check_instructor_available_fast(state, instructor_id, day_name, start_time, end_time)
         if not is_free:
             continue
         
         # Dersi var mı? (course instructor olarak başka sınavda)
-        instructor_busy = check_instructor_conflict(instructor_id, exam_date, start_time, end_time)
+        instructor_busy = check_instructor_conflict(instructor_id, exam_date, start_time, end_time,
+                                                    state['version_id'])
         if instructor_busy:
             continue
         
         # Gözetmen olarak başka sınavda mı?
-        supervisor_busy = check_supervisor_conflict(instructor_id, exam_date, start_time, end_time)
+        supervisor_busy = check_supervisor_conflict(instructor_id, exam_date, start_time, end_time,
+                                                    state['version_id'])
         if supervisor_busy:
             continue
         
@@ -461,7 +466,7 @@ def find_available_supervisors(day_name, exam_date, start_time, end_time, exclud
     return available
 
 
-def find_best_exam_day(start_date, end_date):
+def find_best_exam_day(state, start_date, end_date):
     """
     Ortak sınavlar için en uygun günü bulur (en çok hocanın müsait olduğu gün).
     """
@@ -473,20 +478,15 @@ def find_best_exam_day(start_date, end_date):
     
     best_day = None
     max_availability = -1
+    available_counts = count_available_instructors_by_day(state['availability_masks'])
     
     while current_date <= end:
         if current_date.weekday() < 5:  # Sadece hafta içi
             day_name = days_tr[current_date.weekday()]
             date_str = current_date.strftime('%Y-%m-%d')
             
-            # O gün müsait olan hoca sayısını bul
-            query = """
-                SELECT COUNT(DISTINCT instructor_id) as count 
-                FROM instructor_availability 
-                WHERE day_of_week = ? AND is_available = 1
-            """
-            result = execute_query(query, (day_name,))
-            count = result[0]['count']
+            # O gün müsait olan hoca sayısını bul (derlenmiş maskelerden)
+            count = available_counts.get(day_name, 0)
             
             if count > max_availability:
                 max_availability = count
@@ -496,12 +496,13 @@ def find_best_exam_day(start_date, end_date):
     
     return best_day
 
-def place_course_exam(course, classrooms, computer_classrooms, exam_days, time_slots, common_exam_day=None, force_common_day=False):
+def place_course_exam(state, course, classrooms, computer_classrooms, exam_days, common_exam_day=None, force_common_day=False):
     """
     Bir dersin sınavını yerleştirir.
     force_common_day=True ise SADECE ortak sınav gününe yerleştirir.
     Birden fazla sınıf gerekirse ve gözetmen yetmezse bir gözetmene birden fazla sınıf verebilir.
     Özel derslik ataması varsa (special_classroom_id) sadece o dersliği kullanır.
+    Saatler state['slot_grid'] ızgarasından gelir (bkz. app/slot_grid.py).
     """
     course_id = course['id']
     course_code = course['code']
@@ -523,7 +524,7 @@ def place_course_exam(course, classrooms, computer_classrooms, exam_days, time_s
         # Özel derslik atanmışsa sadece onu kullan
         from app.models.classroom import get_classroom_by_id
         special_room = get_classroom_by_id(special_classroom_id)
-        if special_room:
+        if special_room and special_room['is_available']:
             available_rooms = [special_room]
         else:
             available_rooms = []
@@ -542,73 +543,107 @@ def place_course_exam(course, classrooms, computer_classrooms, exam_days, time_s
     else:
         target_days = exam_days
         
-    # Günleri sınav yoğunluğuna göre sırala (yoğundan aza değil, azdan çoğa)
-    # sorted_days = sorted(target_days, key=lambda x: get_day_exam_count(x[0]))
-    # Basitlik için sıralamayı şimdilik pass geçelim veya mevcut sırayı kullanalım
+    # Ölçümler (kontrol süreleri ve red nedenleri)
+    profile = state['profile']
     
-    for exam_date in target_days:
+    # Günler yoğunluğa göre (azdan çoğa) bellekteki sayaçlardan sıralanır
+    day_load = state['day_load']
+    slot_grid = state['slot_grid']
+    
+    for exam_date in iterate_balanced_days(day_load, target_days):
         # Tarihten gün adını bul
-        from datetime import datetime
-        dt = datetime.strptime(exam_date, '%Y-%m-%d')
-        days = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar']
-        day_name = days[dt.weekday()]
+        day_name = get_day_name(slot_grid, exam_date)
+        day_slots = get_day_slots(slot_grid, day_name)
         
         # Bölüm için ardışık sınav kontrolü
         # Ortak sınav gününde bu kuralı esnetebiliriz çünkü tek o gün var
         if not force_common_day:
+            started = time.perf_counter()
             has_dept_conflict = False
-            for start_time, _ in time_slots:
-                if check_department_consecutive(department_id, exam_date, start_time):
+            for start_minute, _ in day_slots:
+                if check_department_consecutive(state, department_id, exam_date, start_minute):
                     has_dept_conflict = True
                     break
+            record_check(profile, CHECK_DEPARTMENT, started)
             if has_dept_conflict:
+                record_attempt(profile, course_id, len(day_slots))
+                record_rejection(profile, course_id, CHECK_DEPARTMENT, len(day_slots))
                 continue
         
-        for start_time, slot_end_time in time_slots:
-            # Gerçek bitiş saati
-            actual_end_time = calculate_end_time(start_time, duration)
-            
-            # Bitiş saati 18:00'ı geçiyorsa bu slotu atla
-            if actual_end_time > '18:00':
-                continue
+        # Bu süredeki sınavın başlayabileceği slotlar (gün sonunu / molaları
+        # aşanlar ızgarada baştan elenmiştir)
+        exam_starts = get_exam_starts(slot_grid, day_name, duration)
+        too_long = len(day_slots) - len(exam_starts)
+        if too_long:
+            record_attempt(profile, course_id, too_long)
+            record_rejection(profile, course_id, CHECK_DURATION, too_long)
+        
+        for start_minute, end_minute, start_time, actual_end_time, _ in order_day_slots(
+                day_load, exam_date, exam_starts, lambda slot: slot[4]):
+            record_attempt(profile, course_id)
             
             # Hoca müsait mi? (Dersi veren hoca)
-            is_instructor_free = check_instructor_available(instructor_id, day_name, start_time, actual_end_time)
+            started = time.perf_counter()
+            is_instructor_free = check_instructor_available_fast(state, instructor_id, day_name, start_time, actual_end_time)
+            record_check(profile, CHECK_INSTRUCTOR_AVAILABILITY, started)
             if not is_instructor_free:
+                record_rejection(profile, course_id, CHECK_INSTRUCTOR_AVAILABILITY)
                 continue
             
             # Hocanın başka sınavı/görevi var mı?
-            instructor_busy = check_instructor_conflict(instructor_id, exam_date, start_time, actual_end_time)
+            started = time.perf_counter()
+            version_id = state['version_id']
+            instructor_busy = (check_instructor_conflict(instructor_id, exam_date, start_time, actual_end_time,
+                                                         version_id)
+                               or check_supervisor_conflict(instructor_id, exam_date, start_time, actual_end_time,
+                                                            version_id))
+            record_check(profile, CHECK_INSTRUCTOR_CONFLICT, started)
             if instructor_busy:
-                continue
-                
-            supervisor_busy = check_supervisor_conflict(instructor_id, exam_date, start_time, actual_end_time)
-            if supervisor_busy:
+                record_rejection(profile, course_id, CHECK_INSTRUCTOR_CONFLICT)
                 continue
                 
             # Öğrenci çakışması var mı?
-            student_conflict = check_student_conflict(course_id, exam_date, start_time, actual_end_time)
+            started = time.perf_counter()
+            student_conflict = check_student_conflict(course_id, exam_date, start_time, actual_end_time,
+                                                      version_id, state['conflict_graph'])
+            record_check(profile, CHECK_STUDENT, started)
             if student_conflict:
+                record_rejection(profile, course_id, CHECK_STUDENT)
+                continue
+            
+            # Öğrencinin o günkü sınav sayısı ve sınavlar arası süre
+            started = time.perf_counter()
+            overloaded = violates_student_load(state['student_load'], course_id, exam_date,
+                                               start_minute, end_minute)
+            record_check(profile, CHECK_STUDENT_LOAD, started)
+            if overloaded:
+                record_rejection(profile, course_id, CHECK_STUDENT_LOAD)
                 continue
             
             # Uygun derslik(ler) bul
-            rooms = find_available_classrooms(available_rooms, exam_date, start_time, actual_end_time, student_count)
+            started = time.perf_counter()
+            rooms = find_available_classrooms(state, available_rooms, exam_date, start_time, actual_end_time, student_count)
+            record_check(profile, CHECK_ROOM, started)
             
             if rooms is None:
+                record_rejection(profile, course_id, CHECK_ROOM)
                 continue
             
             needed_supervisors = len(rooms)
             
             # Gözetmen bul (dersin hocası HARİÇ)
+            started = time.perf_counter()
             available_supervisors = find_available_supervisors(
-                day_name, exam_date, start_time, actual_end_time, 
+                state, day_name, exam_date, start_time, actual_end_time, 
                 exclude_ids=[instructor_id]
             )
+            record_check(profile, CHECK_SUPERVISOR, started)
             
             # Çoklu gözetmen mantığı (Multi-room supervision)
             final_supervisors = []
             
             if len(available_supervisors) == 0:
+                record_rejection(profile, course_id, CHECK_SUPERVISOR)
                 continue # Hiç kimse yok!
             
             # Mevcut gözetmenleri sırayla ata
@@ -627,28 +662,921 @@ def place_course_exam(course, classrooms, computer_classrooms, exam_days, time_s
             if len(final_supervisors) < needed_supervisors:
                 continue
             
-            # Sınavı yerleştir
-            for i, room in enumerate(rooms):
-                supervisor = final_supervisors[i]
-                create_exam(course_id, room['id'], exam_date, start_time, actual_end_time, supervisor)
+            # Sınavı yerleştir (tüm derslik satırları tek işlemde)
+            exam_rows = [(course_id, room['id'], final_supervisors[i], exam_date, start_time, actual_end_time)
+                         for i, room in enumerate(rooms)]
+            create_exams_bulk(exam_rows, state['version_id'])
             
-            # Bölüm programını güncelle
-            update_department_schedule(department_id, exam_date, actual_end_time)
+            # Bölüm programını ve öğrenci sayaçlarını güncelle
+            update_department_schedule(state, department_id, exam_date, end_minute)
+            add_exam_to_student_load(state['student_load'], course_id, exam_date, start_minute, end_minute)
+            add_exam_to_day_load(day_load, course_id, exam_date, start_minute, len(rooms))
             
             return True
     
     return False
 
 
-def generate_exam_schedule(start_date, end_date):
+# ==============================================
+# BELLEK İÇİ PLANLAMA
+# ==============================================
+# Aşağıdaki fonksiyonlar yukarıdakilerin aynısını
+# yapar ama her kontrol için SQL sorgusu çalıştırmaz.
+# Veriler planlama başında bir kere yüklenir
+# (load_schedule_snapshot), yerleştirilen sınavlar
+# doluluk indeksinde tutulur ve sonuç en sonda
+# veritabanına yazılır.
+# ==============================================
+
+
+def create_run_state(snapshot):
+    """
+    Bir planlama çalıştırmasının bellek içi durumunu oluşturur.
+
+    Parametreler:
+        snapshot: load_schedule_snapshot() sonucu
+
+    Döndürür:
+        state: Sözlük
+            'snapshot': Yüklenen veriler
+            'occupancy': Doluluk indeksi
+            'conflict_graph': Ders çakışma grafı (ortak öğrenciler)
+            'student_load': Öğrenci günlük sınav sayaçları (bkz. app/student_load.py)
+            'day_load': Gün ve slot yük sayaçları (bkz. app/day_load.py)
+            'department_exams': {(tarih, bölüm_id): son bitiş dakikası}
+            'placements': Yerleştirilen sınavlar listesi
+            'failed_courses': Yerleşemeyen dersler listesi
+            'counters': {'placed': yerleşen, 'failed': yerleşemeyen}
+            'profile': Kontrol süreleri ve red nedenleri (bkz. app/instrumentation.py)
+            'settings': Gün, saat ve derslik ayarları (planlama başında doldurulur)
+    """
+    seats_by_course = {}
+    for course in snapshot['courses']:
+        seats_by_course[course['id']] = course['student_count']
+
+    state = {
+        'snapshot': snapshot,
+        'occupancy': create_occupancy_index(),
+        'conflict_graph': build_conflict_graph(snapshot['enrollments']),
+        'student_load': create_student_load_index(snapshot['enrollments'], SINAV_OGRENCI_GUNLUK_EN_FAZLA,
+                                                  SINAV_OGRENCI_EN_AZ_ARA),
+        'day_load': create_day_load_index(seats_by_course, SINAV_GUN_DENGELEME),
+        'department_exams': {},
+        'placements': [],
+        'failed_courses': [],
+        'counters': {'placed': 0, 'failed': 0},
+        'profile': create_profile(),
+        'settings': {}
+    }
+    return state
+
+
+def check_department_consecutive_in_memory(state, department_id, exam_date, start_minute):
+    """
+    check_department_consecutive fonksiyonunun bellek içi karşılığı.
+    Aynı bölümün o günkü son sınavı ile arada en az 2 saat olmalı.
+    """
+    last_end = state['department_exams'].get((exam_date, department_id))
+
+    if last_end is None:
+        return False  # Bu gün bu bölümün sınavı yok, OK
+
+    if start_minute - last_end < 120:
+        return True  # Çok yakın, çakışma
+
+    return False
+
+
+def update_department_schedule_in_memory(state, department_id, exam_date, end_minute):
+    """update_department_schedule fonksiyonunun bellek içi karşılığı."""
+    key = (exam_date, department_id)
+    last_end = state['department_exams'].get(key)
+    if last_end is None or end_minute > last_end:
+        state['department_exams'][key] = end_minute
+
+
+def check_student_conflict_in_memory(state, course_id, exam_date, start_minute, end_minute):
+    """
+    check_student_conflict fonksiyonunun bellek içi karşılığı.
+    Çakışan saatte sınavı olan derslerle ortak öğrenci var mı?
+    Cevap çakışma grafındaki komşularla küme kesişiminden gelir.
+    """
+    if course_id not in state['conflict_graph']:
+        return False  # Hiçbir dersle ortak öğrencisi yok
+
+    overlapping = get_overlapping_courses(state['occupancy'], exam_date, start_minute, end_minute)
+    overlapping.discard(course_id)
+
+    return has_conflict_with_any(state['conflict_graph'], course_id, overlapping)
+
+
+def find_available_classrooms_in_memory(state, classrooms, exam_date, start_minute, end_minute, needed_capacity):
+    """
+    find_available_classrooms fonksiyonunun bellek içi karşılığı.
+    Aynı algoritma: tek derslik -> yakınlık ile birleştirme -> genel birleştirme.
+    Yakın derslikler de sadece verilen derslik listesinden seçilir.
+    """
+    occupancy = state['occupancy']
+    clusters = state['snapshot']['room_clusters']
+    allowed_ids = set(room['id'] for room in classrooms)
+    available = []
+
+    # Önce müsait derslikleri bul
+    for room in classrooms:
+        if not is_room_busy(occupancy, room['id'], exam_date, start_minute, end_minute):
+            if room['capacity'] >= needed_capacity:
+                return [room]  # Tek derslik yeterli
+            available.append(room)
+
+    if not available:
+        return None
+
+    # Kapasiteye göre sırala (büyükten küçüğe)
+    available.sort(key=lambda x: x['capacity'], reverse=True)
+
+    # Yakınlık bazlı birleştirme
+    for base_room in available:
+        # Kümülatif kapasite: kümenin tamamı bile yetmiyorsa atla
+        if not cluster_can_fit(clusters, base_room['id'], needed_capacity):
+            continue
+
+        selected = [base_room]
+        current_capacity = base_room['capacity']
+        used_ids = {base_room['id']}
+
+        for nearby in clusters[base_room['id']]['neighbors']:
+            if current_capacity >= needed_capacity:
+                break
+
+            if nearby['id'] in used_ids or nearby['id'] not in allowed_ids:
+                continue
+
+            if not is_room_busy(occupancy, nearby['id'], exam_date, start_minute, end_minute):
+                selected.append(nearby)
+                current_capacity += nearby['capacity']
+                used_ids.add(nearby['id'])
+
+        if current_capacity >= needed_capacity:
+            return selected
+
+    # Aynı binadan birleştirme, olmazsa genel birleştirme (son çare)
+    selected = combine_rooms_in_one_building(available, needed_capacity)
+    if selected:
+        return selected
+
+    return combine_rooms_anywhere(available, needed_capacity)
+
+
+def find_available_supervisors_in_memory(state, day_name, exam_date, start_minute, end_minute, exclude_ids=None):
+    """
+    find_available_supervisors fonksiyonunun bellek içi karşılığı.
+    """
+    if exclude_ids is None:
+        exclude_ids = []
+
+    snapshot = state['snapshot']
+    occupancy = state['occupancy']
+    available = []
+
+    for instructor_id in snapshot['instructor_ids']:
+        if instructor_id in exclude_ids:
+            continue
+
+        if not is_instructor_available_in_snapshot(snapshot, instructor_id, day_name, start_minute, end_minute):
+            continue
+
+        if is_instructor_busy(occupancy, instructor_id, exam_date, start_minute, end_minute):
+            continue
+
+        if is_supervisor_busy(occupancy, instructor_id, exam_date, start_minute, end_minute):
+            continue
+
+        available.append(instructor_id)
+
+    return available
+
+
+def find_best_exam_day_in_memory(snapshot, exam_days):
+    """
+    find_best_exam_day fonksiyonunun bellek içi karşılığı.
+    En çok hocanın müsait olduğu günü döndürür.
+    """
+    from datetime import datetime
+
+    best_day = None
+    max_availability = -1
+
+    for exam_date in exam_days:
+        day_name = DAY_NAMES[datetime.strptime(exam_date, '%Y-%m-%d').weekday()]
+        count = snapshot['available_instructor_count_by_day'].get(day_name, 0)
+
+        if count > max_availability:
+            max_availability = count
+            best_day = exam_date
+
+    return best_day
+
+
+def get_course_rooms_in_memory(state, course, classrooms, computer_classrooms):
+    """
+    Dersin sınavının yapılabileceği derslik listesini döndürür.
+    Özel derslik ataması varsa sadece o derslik, bilgisayar gerekiyorsa
+    laboratuvarlar, yoksa normal derslikler (kapalı derslikler hariç).
+    Planlama da artımlı doğrulama da (app/rescheduling.py) bu kuralı kullanır.
+    """
+    special_classroom_id = course.get('special_classroom_id')
+
+    if special_classroom_id:
+        special_room = state['snapshot']['classrooms_by_id'].get(special_classroom_id)
+        return [special_room] if special_room and special_room['is_available'] else []
+
+    if 'LAB' in course['code']:
+        return computer_classrooms
+
+    return classrooms
+
+
+def try_place_course_at(state, course, available_rooms, exam_date, day_name, start_minute):
+    """
+    Dersin sınavını BELİRLİ bir gün ve saate yerleştirmeyi dener.
+    Bölüm aralığı kuralı burada kontrol edilmez (çağıran kontrol eder).
+    Her kontrolün süresi ve slotun red nedeni state['profile'] içine yazılır.
+
+    Döndürür:
+        placement: Yerleşim bilgisi (state'e eklenmiş) veya None
+    """
+    snapshot = state['snapshot']
+    occupancy = state['occupancy']
+    profile = state['profile']
+
+    course_id = course['id']
+    instructor_id = course['instructor_id']
+    duration = course['exam_duration'] if course['exam_duration'] else 60
+    end_minute = start_minute + duration
+
+    record_attempt(profile, course_id)
+
+    # Gün sonunu geçiyorsa veya molaya denk geliyorsa bu slotu atla
+    if not fits_in_day(state['settings']['slot_grid'], start_minute, end_minute):
+        record_rejection(profile, course_id, CHECK_DURATION)
+        return None
+
+    started = time.perf_counter()
+    is_free = is_instructor_available_in_snapshot(snapshot, instructor_id, day_name, start_minute, end_minute)
+    record_check(profile, CHECK_INSTRUCTOR_AVAILABILITY, started)
+    if not is_free:
+        record_rejection(profile, course_id, CHECK_INSTRUCTOR_AVAILABILITY)
+        return None
+
+    # Hocanın kendi sınavı veya gözetmenlik görevi var mı?
+    started = time.perf_counter()
+    instructor_busy = (is_instructor_busy(occupancy, instructor_id, exam_date, start_minute, end_minute)
+                       or is_supervisor_busy(occupancy, instructor_id, exam_date, start_minute, end_minute))
+    record_check(profile, CHECK_INSTRUCTOR_CONFLICT, started)
+    if instructor_busy:
+        record_rejection(profile, course_id, CHECK_INSTRUCTOR_CONFLICT)
+        return None
+
+    started = time.perf_counter()
+    has_clash = check_student_conflict_in_memory(state, course_id, exam_date, start_minute, end_minute)
+    record_check(profile, CHECK_STUDENT, started)
+    if has_clash:
+        record_rejection(profile, course_id, CHECK_STUDENT)
+        return None
+
+    started = time.perf_counter()
+    overloaded = violates_student_load(state['student_load'], course_id, exam_date, start_minute, end_minute)
+    record_check(profile, CHECK_STUDENT_LOAD, started)
+    if overloaded:
+        record_rejection(profile, course_id, CHECK_STUDENT_LOAD)
+        return None
+
+    started = time.perf_counter()
+    rooms = find_available_classrooms_in_memory(state, available_rooms, exam_date,
+                                                start_minute, end_minute, course['student_count'])
+    record_check(profile, CHECK_ROOM, started)
+    if rooms is None:
+        record_rejection(profile, course_id, CHECK_ROOM)
+        return None
+
+    started = time.perf_counter()
+    available_supervisors = find_available_supervisors_in_memory(
+        state, day_name, exam_date, start_minute, end_minute,
+        exclude_ids=[instructor_id]
+    )
+    record_check(profile, CHECK_SUPERVISOR, started)
+
+    if len(available_supervisors) == 0:
+        record_rejection(profile, course_id, CHECK_SUPERVISOR)
+        return None
+
+    # Gözetmenleri sırayla ata, yetmezse sonuncuyu tekrar kullan
+    final_supervisors = []
+    for i in range(len(rooms)):
+        if i < len(available_supervisors):
+            final_supervisors.append(available_supervisors[i])
+        else:
+            final_supervisors.append(final_supervisors[-1])
+
+    placement = {
+        'course_id': course_id,
+        'instructor_id': instructor_id,
+        'department_id': course['department_id'],
+        'exam_date': exam_date,
+        'start_minute': start_minute,
+        'end_minute': end_minute,
+        'rooms': [room['id'] for room in rooms],
+        'supervisors': final_supervisors
+    }
+    add_placement_in_memory(state, placement)
+
+    return placement
+
+
+def add_placement_in_memory(state, placement):
+    """Bir yerleşimi doluluk indeksine, öğrenci ve gün sayaçlarına, bölüm programına ve listeye ekler."""
+    add_exam_to_index(state['occupancy'], placement['course_id'], placement['instructor_id'],
+                      placement['exam_date'], placement['start_minute'], placement['end_minute'],
+                      placement['rooms'], placement['supervisors'])
+    add_exam_to_student_load(state['student_load'], placement['course_id'], placement['exam_date'],
+                             placement['start_minute'], placement['end_minute'])
+    add_exam_to_day_load(state['day_load'], placement['course_id'], placement['exam_date'],
+                         placement['start_minute'], len(placement['rooms']))
+    update_department_schedule_in_memory(state, placement['department_id'],
+                                         placement['exam_date'], placement['end_minute'])
+    state['placements'].append(placement)
+
+
+def remove_placement_in_memory(state, placement):
+    """
+    add_placement_in_memory ile eklenen bir yerleşimi geri alır.
+    Bölümün o günkü son bitiş saati kalan yerleşimlerden yeniden hesaplanır.
+    """
+    remove_exam_from_index(state['occupancy'], placement['course_id'], placement['instructor_id'],
+                           placement['exam_date'], placement['start_minute'], placement['end_minute'],
+                           placement['rooms'], placement['supervisors'])
+    remove_exam_from_student_load(state['student_load'], placement['course_id'], placement['exam_date'],
+                                  placement['start_minute'], placement['end_minute'])
+    remove_exam_from_day_load(state['day_load'], placement['course_id'], placement['exam_date'],
+                              placement['start_minute'], len(placement['rooms']))
+    state['placements'].remove(placement)
+
+    key = (placement['exam_date'], placement['department_id'])
+    last_end = None
+    for other in state['placements']:
+        if (other['exam_date'], other['department_id']) == key:
+            if last_end is None or other['end_minute'] > last_end:
+                last_end = other['end_minute']
+
+    if last_end is None:
+        state['department_exams'].pop(key, None)
+    else:
+        state['department_exams'][key] = last_end
+
+
+def place_course_exam_in_memory(state, course, classrooms, computer_classrooms, exam_days, common_exam_day=None, force_common_day=False):
+    """
+    place_course_exam fonksiyonunun bellek içi karşılığı.
+    Sınavı veritabanına yazmaz, state['placements'] listesine ekler.
+    Saatler state['settings']['slot_grid'] ızgarasından gelir.
+
+    Döndürür:
+        success: Yerleştirildi mi? (True/False)
+    """
+    department_id = course['department_id']
+    available_rooms = get_course_rooms_in_memory(state, course, classrooms, computer_classrooms)
+
+    # Günleri filtrele
+    if force_common_day and common_exam_day:
+        target_days = [d for d in exam_days if d == common_exam_day]
+    elif common_exam_day:
+        target_days = [d for d in exam_days if d != common_exam_day]
+    else:
+        target_days = exam_days
+
+    duration = course['exam_duration'] if course['exam_duration'] else 60
+    slot_grid = state['settings']['slot_grid']
+    profile = state['profile']
+
+    # En az yüklü gün ve slot önce (bkz. app/day_load.py)
+    day_load = state['day_load']
+
+    for exam_date in iterate_balanced_days(day_load, target_days):
+        day_name = get_day_name(slot_grid, exam_date)
+        day_slots = get_day_slots(slot_grid, day_name)
+
+        # Bölüm için ardışık sınav kontrolü (günün bütün slotlarını kapatır)
+        if not force_common_day:
+            started = time.perf_counter()
+            has_dept_conflict = False
+            for start_minute, _ in day_slots:
+                if check_department_consecutive_in_memory(state, department_id, exam_date, start_minute):
+                    has_dept_conflict = True
+                    break
+            record_check(profile, CHECK_DEPARTMENT, started)
+            if has_dept_conflict:
+                record_attempt(profile, course['id'], len(day_slots))
+                record_rejection(profile, course['id'], CHECK_DEPARTMENT, len(day_slots))
+                continue
+
+        # Süreye uymayan slotlar ızgarada baştan elenmiştir
+        exam_starts = get_exam_starts(slot_grid, day_name, duration)
+        too_long = len(day_slots) - len(exam_starts)
+        if too_long:
+            record_attempt(profile, course['id'], too_long)
+            record_rejection(profile, course['id'], CHECK_DURATION, too_long)
+
+        for exam_start in order_day_slots(day_load, exam_date, exam_starts, lambda slot: slot[4]):
+            if try_place_course_at(state, course, available_rooms, exam_date, day_name, exam_start[0]):
+                return True
+
+    return False
+
+
+def is_common_course(course):
+    """Ders ortak sınav gününe konacak kadar kalabalık mı? (100+ öğrenci)"""
+    return course['student_count'] >= 100
+
+
+def place_course_in_state(state, course):
+    """
+    Dersi state['settings'] içindeki gün, saat ve derslik ayarlarıyla yerleştirir.
+    Ortak dersler sadece ortak güne, diğerleri ortak gün hariç günlere konur.
+
+    Döndürür:
+        placement: Yerleşim bilgisi veya None
+    """
+    settings = state['settings']
+    success = place_course_exam_in_memory(state, course, settings['classrooms'], settings['computer_classrooms'],
+                                          settings['exam_days'], settings['common_exam_day'], force_common_day=is_common_course(course))
+    if not success:
+        return None
+
+    return state['placements'][-1]
+
+
+def try_place_course_in_state_at(state, course, exam_date, start_minute):
+    """
+    Dersi belirli bir gün ve saate yerleştirmeyi dener.
+    Ortak gün ve bölüm aralığı kuralları place_course_exam_in_memory ile aynıdır.
+
+    Döndürür:
+        placement: Yerleşim bilgisi veya None
+    """
+    settings = state['settings']
+    slot_grid = settings['slot_grid']
+    day_name = get_day_name(slot_grid, exam_date)
+    force_common_day = is_common_course(course)
+    common_exam_day = settings['common_exam_day']
+
+    profile = state['profile']
+
+    if common_exam_day:
+        if (force_common_day and exam_date != common_exam_day) or \
+                (not force_common_day and exam_date == common_exam_day):
+            record_attempt(profile, course['id'])
+            record_rejection(profile, course['id'], CHECK_COMMON_DAY)
+            return None
+
+    if not force_common_day:
+        started = time.perf_counter()
+        has_dept_conflict = False
+        for slot_start, _ in get_day_slots(slot_grid, day_name):
+            if check_department_consecutive_in_memory(state, course['department_id'], exam_date, slot_start):
+                has_dept_conflict = True
+                break
+        record_check(profile, CHECK_DEPARTMENT, started)
+        if has_dept_conflict:
+            record_attempt(profile, course['id'])
+            record_rejection(profile, course['id'], CHECK_DEPARTMENT)
+            return None
+
+    available_rooms = get_course_rooms_in_memory(state, course, settings['classrooms'],
+                                                 settings['computer_classrooms'])
+
+    return try_place_course_at(state, course, available_rooms, exam_date, day_name, start_minute)
+
+
+def placements_to_exam_rows(placements):
+    """
+    Bellekteki yerleşimleri exam_schedule satırlarına çevirir.
+    Her derslik için ayrı bir satır oluşturulur.
+
+    Döndürür:
+        rows: [(course_id, classroom_id, supervisor_id, exam_date, start_time, end_time), ...]
+    """
+    rows = []
+
+    for placement in placements:
+        start_time = minutes_to_time(placement['start_minute'])
+        end_time = minutes_to_time(placement['end_minute'])
+        for i, classroom_id in enumerate(placement['rooms']):
+            rows.append((placement['course_id'], classroom_id, placement['supervisors'][i],
+                         placement['exam_date'], start_time, end_time))
+
+    return rows
+
+
+def save_placements(placements, period=None):
+    """
+    Bellekte hesaplanan sınavları veritabanına yazar.
+    Eski programın silinmesi ve yenisinin eklenmesi tek işlemde yapılır.
+    period: (start_date, end_date) planlanan sınav dönemi (sürüme kaydedilir)
+
+    Döndürür:
+        saved_count: Yazılan kayıt sayısı
+    """
+    return replace_all_exams(placements_to_exam_rows(placements), period)
+
+
+def split_exam_classrooms(classrooms):
+    """
+    Sınava açık derslikleri normal ve bilgisayarlı olarak ayırır.
+    SQL ve bellek içi planlama aynı listeleri kullanır.
+
+    Döndürür:
+        (normal_classrooms, computer_classrooms)
+    """
+    available = [c for c in classrooms if c['is_available']]
+    normal_classrooms = [c for c in available if c['has_computer'] == 0]
+    computer_classrooms = [c for c in available if c['has_computer'] == 1]
+    return normal_classrooms, computer_classrooms
+
+
+def build_schedule_settings(snapshot, start_date, end_date, seed=None):
+    """
+    Bellek içi planlamanın gün, saat ve derslik ayarlarını hazırlar.
+    Tam planlama ve artımlı yeniden planlama aynı ayarları kullanır.
+
+    Döndürür:
+        settings: {'exam_days', 'slot_grid', 'common_exam_day',
+                   'classrooms', 'computer_classrooms', 'seed'}
+    """
+    from datetime import datetime, timedelta
+
+    # Tarih aralığındaki hafta içi günler
+    date_list = []
+    current_date = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+
+    while current_date <= end:
+        if current_date.weekday() < 5:
+            date_list.append(current_date.strftime('%Y-%m-%d'))
+        current_date += timedelta(days=1)
+
+    normal_classrooms, computer_classrooms = split_exam_classrooms(snapshot['classrooms'])
+
+    common_exam_day = None
+    if any(is_common_course(c) for c in snapshot['courses']):
+        common_exam_day = find_best_exam_day_in_memory(snapshot, date_list)
+
+    settings = {
+        'exam_days': date_list,
+        'slot_grid': compile_slot_grid(),
+        'common_exam_day': common_exam_day,
+        'classrooms': normal_classrooms,
+        'computer_classrooms': computer_classrooms,
+        'seed': seed
+    }
+    return settings
+
+
+def restrict_to_part(state, part):
+    """
+    Planlamayı bağımsız bir parçayla sınırlar (bkz. app/components.py).
+    Gün ve ortak gün ayarları build_schedule_settings ile tüm derslere
+    göre seçildikten sonra çağrılır; böylece bütün parçalar aynı ayarı kullanır.
+
+    Parametreler:
+        state: Planlama durumu (state['settings'] doldurulmuş)
+        part: {'course_ids': planlanacak dersler,
+               'classroom_ids': parçaya ayrılan derslikler (özel derslik atamaları yine geçerli),
+               'supervisor_ids': gözetmen olabilecek hocalar}
+
+    Döndürür:
+        courses: Parçanın dersleri (öğrenci sayısına göre azalan)
+    """
+    snapshot = state['snapshot']
+    settings = state['settings']
+
+    classroom_ids = set(part['classroom_ids'])
+    settings['classrooms'] = [c for c in settings['classrooms'] if c['id'] in classroom_ids]
+    settings['computer_classrooms'] = [c for c in settings['computer_classrooms'] if c['id'] in classroom_ids]
+
+    # Yakınlık birleştirmesi de havuz dışına taşmasın
+    proximity = {}
+    for classroom_id, neighbors in snapshot['proximity'].items():
+        proximity[classroom_id] = [room for room in neighbors if room['id'] in classroom_ids]
+    snapshot['room_clusters'] = build_room_clusters(
+        [c for c in snapshot['classrooms'] if c['id'] in classroom_ids], proximity
+    )
+
+    supervisor_ids = set(part['supervisor_ids'])
+    snapshot['instructor_ids'] = [i for i in snapshot['instructor_ids'] if i in supervisor_ids]
+
+    course_ids = set(part['course_ids'])
+    return [c for c in snapshot['courses'] if c['id'] in course_ids]
+
+
+def compute_schedule_in_memory(start_date, end_date, ordering='student_count', improve=False,
+                               improve_iterations=2000, improve_time_limit=5.0, seed=None, verbose=True,
+                               supervisor_matching=True, progress=None, deadline=None, part=None):
+    """
+    Planlamayı tamamen bellek içinde yapar, veritabanına YAZMAZ.
+    Veriler bir kere okunur (load_schedule_snapshot).
+
+    Parametreler:
+        ordering: Ders sıralama stratejisi (bkz. app/ordering.py)
+        improve: True ise greedy sonrası yerel arama ile iyileştirme yapılır
+        improve_iterations: Yerel arama için en fazla iterasyon
+        improve_time_limit: Yerel arama için en fazla süre (saniye)
+        seed: Rastgele sıralama ve yerel arama için tohum
+        verbose: False ise ekrana ders bazında mesaj yazılmaz
+        supervisor_matching: True ise gözetmenler en sonda yük dengeli
+                             eşleştirmeyle yeniden atanır (bkz. app/supervisors.py)
+        progress: Her dersten sonra progress(işlenen, yerleşen, toplam) şeklinde
+                  çağrılır (arka plan işleri için, bkz. app/jobs.py)
+        deadline: Süre sınırı / iptal (bkz. app/deadline.py). Dolarsa kalan
+                  dersler denenmez, o ana kadarki kısmi program döner.
+        part: Verilirse sadece bu parça planlanır (bkz. restrict_to_part ve
+              app/components.py)
+
+    Döndürür:
+        state: Planlama durumu (state['placements'] yerleşimleri içerir)
+        result: Sonuç bilgisi ('profile': kontrol süreleri ve red nedenleri,
+                'completed': planlama bitti mi, 'stop_reason': durma nedeni)
+    """
+    started = time.perf_counter()
+
+    snapshot = load_schedule_snapshot()
+    state = create_run_state(snapshot)
+
+    # Sıralama ve yerel arama gibi sonraki adımlar aynı ayarları kullanır
+    state['settings'] = build_schedule_settings(snapshot, start_date, end_date, seed)
+    settings = state['settings']
+
+    courses = snapshot['courses']
+    if part is not None:
+        courses = restrict_to_part(state, part)
+
+    date_list = settings['exam_days']
+    slot_grid = settings['slot_grid']
+    common_exam_day = settings['common_exam_day']
+    normal_classrooms = settings['classrooms']
+    computer_classrooms = settings['computer_classrooms']
+
+    common_courses = [c for c in courses if is_common_course(c)]
+    regular_courses = [c for c in courses if not is_common_course(c)]
+
+    if common_exam_day and verbose:
+        print(f"Ortak sinav gunu olarak belirlendi: {common_exam_day}")
+
+    counters = state['counters']
+    stop_reason = None
+
+    # 1. Ortak dersler (sadece ortak güne)
+    common_days = [common_exam_day] if common_exam_day else []
+    for course in iterate_courses(ordering, state, common_courses, common_days, slot_grid,
+                                  department_spacing=False):
+        stop_reason = get_stop_reason(deadline)
+        if stop_reason:
+            break
+        if verbose:
+            print(f"Ortak ders yerlestiriliyor: {course['code']}")
+        if place_course_exam_in_memory(state, course, normal_classrooms, computer_classrooms,
+                                       date_list, common_exam_day, force_common_day=True):
+            counters['placed'] += 1
+            if verbose:
+                print(f"   [OK] Yerlestirildi")
+        else:
+            counters['failed'] += 1
+            state['failed_courses'].append(course)
+            if verbose:
+                print(f"   [X] BASARISIZ! Ortak ders {course['code']} yerlestirilemedi! "
+                      f"(en sik neden: {get_main_reason(state['profile'], course['id'])})")
+        if progress:
+            progress(counters['placed'] + counters['failed'], counters['placed'], len(courses))
+
+    # 2. Diğer dersler (ortak gün hariç)
+    regular_days = [d for d in date_list if d != common_exam_day]
+    for course in iterate_courses(ordering, state, regular_courses, regular_days, slot_grid):
+        if stop_reason:
+            break
+        stop_reason = get_stop_reason(deadline)
+        if stop_reason:
+            break
+        if place_course_exam_in_memory(state, course, normal_classrooms, computer_classrooms,
+                                       date_list, common_exam_day, force_common_day=False):
+            counters['placed'] += 1
+        else:
+            counters['failed'] += 1
+            state['failed_courses'].append(course)
+            if verbose:
+                print(f"UYARI: Ders {course['code']} yerlestirilemedi! "
+                      f"(en sik neden: {get_main_reason(state['profile'], course['id'])})")
+        if progress:
+            progress(counters['placed'] + counters['failed'], counters['placed'], len(courses))
+
+    # Süre dolduysa denenmeyen dersler de yerleşemeyen sayılır
+    skipped_count = 0
+    if stop_reason:
+        skipped_count = mark_skipped_courses(state, courses)
+        counters['failed'] += skipped_count
+        if verbose:
+            print(f"Planlama durduruldu ({stop_reason}): {skipped_count} ders denenmedi")
+
+    result = {
+        'total_courses': len(courses),
+        'placed_count': counters['placed'],
+        'failed_count': counters['failed'],
+        'skipped_count': skipped_count,
+        'ordering': ordering
+    }
+
+    # 3. İsteğe bağlı yerel arama ile iyileştirme (kalan süre kadar)
+    if improve and state['failed_courses'] and not stop_reason:
+        from app.local_search import improve_schedule
+        time_limit = improve_time_limit
+        remaining = get_remaining_time(deadline)
+        if remaining is not None:
+            time_limit = min(time_limit, remaining)
+        report = improve_schedule(state, max_iterations=improve_iterations,
+                                  time_limit=time_limit, seed=seed, deadline=deadline)
+        result['local_search'] = report
+        counters['placed'] = report['after']['placed_count']
+        counters['failed'] = report['after']['failed_count']
+        result['placed_count'] = counters['placed']
+        result['failed_count'] = counters['failed']
+        if verbose:
+            print(f"Yerel arama: {report['before']['failed_count']} -> "
+                  f"{report['after']['failed_count']} yerlesemeyen ders")
+
+    # 4. Gözetmen ataması (derslikler ve saatler sabitlendikten sonra).
+    # Süre dolduysa atlanır; greedy'nin atadığı gözetmenler geçerlidir.
+    if not stop_reason:
+        stop_reason = get_stop_reason(deadline)
+    if supervisor_matching and not stop_reason:
+        from app.supervisors import assign_supervisors
+        result['supervisor_assignment'] = assign_supervisors(state)
+
+    result['completed'] = stop_reason is None
+    result['stop_reason'] = stop_reason
+    result['profile'] = summarize_profile(state['profile'], courses, state['failed_courses'],
+                                          time.perf_counter() - started)
+
+    return state, result
+
+
+def mark_skipped_courses(state, courses):
+    """
+    Planlama yarıda kesildiğinde hiç denenmeyen dersleri
+    yerleşemeyenler listesine ekler.
+
+    Döndürür:
+        skipped_count: Denenmeyen ders sayısı
+    """
+    processed_ids = set()
+    for placement in state['placements']:
+        processed_ids.add(placement['course_id'])
+    for course in state['failed_courses']:
+        processed_ids.add(course['id'])
+
+    skipped_count = 0
+    for course in courses:
+        if course['id'] not in processed_ids:
+            state['failed_courses'].append(course)
+            skipped_count += 1
+
+    return skipped_count
+
+
+def generate_exam_schedule_in_memory(start_date, end_date, ordering='student_count', improve=False,
+                                     improve_iterations=2000, improve_time_limit=5.0, seed=None,
+                                     supervisor_matching=True, progress=None, deadline=None):
+    """
+    generate_exam_schedule ile aynı planlamayı bellek içinde yapar.
+    Veriler bir kere okunur, sonuç en sonda tek seferde yazılır.
+    Parametreler için bkz. compute_schedule_in_memory.
+    """
+    state, result = compute_schedule_in_memory(start_date, end_date, ordering, improve,
+                                               improve_iterations, improve_time_limit, seed,
+                                               supervisor_matching=supervisor_matching, progress=progress,
+                                               deadline=deadline)
+
+    # Eski planı yenisiyle tek işlemde değiştir
+    save_placements(state['placements'], (start_date, end_date))
+
+    return result
+
+
+def generate_exam_schedule(start_date, end_date, use_memory_index=True, ordering='student_count', improve=False,
+                           attempts=1, workers=None, supervisor_matching=True, progress=None, profile_path=None,
+                           time_limit=None, cancel_event=None, dry_run=False, components=False):
     """
     Sınav takvimini oluşturur.
     SEC908 gibi ortak dersleri özel bir güne yerleştirir.
     Ortak sınav günü: Mümkün olduğunca çok hocanın müsait olduğu gün seçilir.
     O güne sadece ortak sınavlar konur.
+
+    Parametreler:
+        start_date: Sınav dönemi başlangıç tarihi (YYYY-MM-DD)
+        end_date: Sınav dönemi bitiş tarihi (YYYY-MM-DD)
+        use_memory_index: True ise kontroller bellek içi indeksle yapılır
+                          (varsayılan). False ise her kontrol SQL ile yapılır.
+        ordering: Ders sıralama stratejisi ('student_count', 'department', 'dsatur').
+                  Sadece bellek içi planlamada kullanılır.
+        improve: True ise greedy sonrası yerel arama yapılır (bellek içi planlama).
+        attempts: 1'den büyükse o kadar rastgele sıralı deneme paralel çalıştırılır,
+                  en iyisi kaydedilir (bkz. app/multistart.py).
+        workers: Paralel deneme için işlemci (process) sayısı (varsayılan: çekirdek sayısı)
+        supervisor_matching: True ise gözetmenler yerleşim bittikten sonra yük dengeli
+                             eşleştirmeyle yeniden atanır (SQL planlamasında da).
+                             False ise yerleştirmede ID sırasıyla alınanlar kalır.
+        progress: İlerleme bildirimi, progress(işlenen, yerleşen, toplam)
+        profile_path: Verilirse ölçüm özeti (result['profile']) bu JSON dosyasına yazılır
+        time_limit: En fazla süre (saniye). Dolunca o ana kadar bulunan en iyi
+                    (kısmi olabilir) program kaydedilir. None ise sınırsız.
+        cancel_event: threading.Event; set edilirse planlama ilk fırsatta durur
+                      ve o ana kadarki program kaydedilir (bkz. app/jobs.py)
+        dry_run: True ise exam_schedule'a dokunulmaz; program bellekte hesaplanıp
+                 taslak olarak saklanır, sonuçta yerleşimler, istatistikler ve
+                 yayındaki programla fark döner (bkz. app/what_if.py)
+        components: True ise ortak öğrencisi, hocası ve bölümü olmayan ders grupları
+                    ayrı işlemlerde paralel planlanır, derslik çakışmaları birleştirirken
+                    çözülür (bkz. app/components.py). attempts > 1 ile birlikte kullanılamaz.
+
+    Döndürür:
+        result: Sonuç bilgisi. result['profile'] kontrol sayılarını, sürelerini
+                ve reddedilen slotların nedenlerini içerir (bkz. app/instrumentation.py).
+                result['completed'] planlamanın sonuna kadar çalışıp çalışmadığını,
+                result['stop_reason'] durduysa nedenini ('süre doldu', 'iptal edildi') verir.
+    """
+    if components and (attempts > 1 or not use_memory_index):
+        raise ValueError("Paralel parça planlaması tek denemeli bellek içi planlamayla yapılabilir.")
+
+    deadline = create_deadline(time_limit, cancel_event)
+
+    if dry_run:
+        if not use_memory_index:
+            raise ValueError("Deneme planlaması sadece bellek içi planlamayla yapılabilir.")
+        from app.what_if import run_dry_run
+        result = run_dry_run(start_date, end_date, ordering, improve, attempts, workers,
+                             supervisor_matching, progress, deadline, components)
+    elif components:
+        from app.components import generate_component_schedule
+        result = generate_component_schedule(start_date, end_date, workers, ordering, improve,
+                                             supervisor_matching, progress, deadline)
+    elif use_memory_index and attempts > 1:
+        from app.multistart import generate_multistart_schedule
+        result = generate_multistart_schedule(start_date, end_date, attempts, workers, ordering, improve,
+                                              progress=progress, deadline=deadline,
+                                              supervisor_matching=supervisor_matching)
+    elif use_memory_index:
+        result = generate_exam_schedule_in_memory(start_date, end_date, ordering, improve=improve,
+                                                  supervisor_matching=supervisor_matching, progress=progress,
+                                                  deadline=deadline)
+    else:
+        result = generate_exam_schedule_with_sql(start_date, end_date, deadline, progress, supervisor_matching)
+
+    if profile_path:
+        dump_profile(result['profile'], profile_path)
+
+    return result
+
+
+def generate_exam_schedule_with_sql(start_date, end_date, deadline=None, progress=None, supervisor_matching=True):
+    """
+    Planlamayı her kontrol için SQL sorgusu çalıştırarak yapar
+    (generate_exam_schedule, use_memory_index=False).
+
+    Sınavlar yerleştikçe yeni bir sürüme yazılır; sayfalar bu sırada
+    yayındaki programı görmeye devam eder. Planlama bitince (veya süre
+    dolunca) sürüm tek adımda yayınlanır. Hata olursa sürüm silinir,
+    yayındaki program değişmez.
     """
-    # Önce mevcut programı temizle
-    clear_exam_schedule()
+    version_id = create_schedule_version(period=(start_date, end_date))
+
+    try:
+        result = schedule_version_with_sql(version_id, start_date, end_date, deadline, progress,
+                                           supervisor_matching)
+    except Exception:
+        discard_schedule_version(version_id)
+        raise
+
+    publish_schedule_version(version_id)
+
+    return result
+
+
+def schedule_version_with_sql(version_id, start_date, end_date, deadline=None, progress=None,
+                              supervisor_matching=True):
+    """
+    SQL ile planlamayı verilen (yayınlanmamış) sürüme yapar.
+    Kontroller de sadece bu sürümdeki sınavlara bakar.
+    supervisor_matching True ise gözetmenler en sonda bellek içi
+    planlamadaki gibi yük dengeli eşleştirmeyle yeniden atanır.
+    """
+    started = time.perf_counter()
     
     # Tarih aralığındaki günleri bul
     from datetime import datetime, timedelta
@@ -661,18 +1589,15 @@ def generate_exam_schedule(start_date, end_date):
             date_list.append(current_date.strftime('%Y-%m-%d'))
         current_date += timedelta(days=1)
     
-    # Zaman dilimleri
-    time_slots = [
-        ('09:00', '10:30'),
-        ('11:00', '12:30'),
-        ('13:30', '15:00'),
-        ('15:30', '17:00')
-    ]
+    # Zaman dilimleri state['slot_grid'] ızgarasından gelir (config.SINAV_SLOT_IZGARASI)
     
     # Derslikleri getir
     classrooms = get_all_classrooms()
-    normal_classrooms = [c for c in classrooms if c['has_computer'] == 0]
-    computer_classrooms = [c for c in classrooms if c['has_computer'] == 1]
+    normal_classrooms, computer_classrooms = split_exam_classrooms(classrooms)
+    
+    # Bu çalıştırmanın durumu: bölüm aralıkları, yakınlık kümeleri ve
+    # müsaitlik maskeleri (her kontrol bir bit testi olur) bir kere yüklenir
+    state = create_sql_run_state(classrooms, version_id)
     
     # Dersleri getir
     courses = execute_query("SELECT * FROM courses ORDER BY student_count DESC")
@@ -680,50 +1605,133 @@ def generate_exam_schedule(start_date, end_date):
     # Dersleri ayır: Ortak (>100) ve Normal
     common_courses = [c for c in courses if c['student_count'] >= 100]
     regular_courses = [c for c in courses if c['student_count'] < 100]
+    failed_courses = []
     
     # Ortak sınav gününü bul
     common_exam_day = None
     if common_courses:
-        common_exam_day = find_best_exam_day(start_date, end_date)
+        common_exam_day = find_best_exam_day(state, start_date, end_date)
         print(f"Ortak sinav gunu olarak belirlendi: {common_exam_day}")
     
-    success_count = 0
-    fail_count = 0
+    counters = state['counters']
+    stop_reason = None
     
     # 1. ÖNCE ORTAK DERSLERİ YERLEŞTİR (Sadece ortak güne)
     for course in common_courses:
+        stop_reason = get_stop_reason(deadline)
+        if stop_reason:
+            break
         print(f"Ortak ders yerlestiriliyor: {course['code']}")
-        if place_course_exam(course, normal_classrooms, computer_classrooms, date_list, time_slots, common_exam_day, force_common_day=True):
-            success_count += 1
+        if place_course_exam(state, course, normal_classrooms, computer_classrooms, date_list, common_exam_day, force_common_day=True):
+            counters['placed'] += 1
             print(f"   [OK] Yerlestirildi")
         else:
-            fail_count += 1
-            print(f"   [X] BASARISIZ! Ortak ders {course['code']} yerlestirilemedi!")
+            counters['failed'] += 1
+            failed_courses.append(course)
+            print(f"   [X] BASARISIZ! Ortak ders {course['code']} yerlestirilemedi! "
+                  f"(en sik neden: {get_main_reason(state['profile'], course['id'])})")
+        if progress:
+            progress(counters['placed'] + counters['failed'], counters['placed'], len(courses))
             
     # 2. SONRA DİĞER DERSLERİ YERLEŞTİR (Ortak gün HARİÇ)
     for course in regular_courses:
-        if place_course_exam(course, normal_classrooms, computer_classrooms, date_list, time_slots, common_exam_day, force_common_day=False):
-            success_count += 1
+        if stop_reason:
+            break
+        stop_reason = get_stop_reason(deadline)
+        if stop_reason:
+            break
+        if place_course_exam(state, course, normal_classrooms, computer_classrooms, date_list, common_exam_day, force_common_day=False):
+            counters['placed'] += 1
         else:
-            fail_count += 1
-            print(f"UYARI: Ders {course['code']} yerlestirilemedi!")
+            counters['failed'] += 1
+            failed_courses.append(course)
+            print(f"UYARI: Ders {course['code']} yerlestirilemedi! "
+                  f"(en sik neden: {get_main_reason(state['profile'], course['id'])})")
+        if progress:
+            progress(counters['placed'] + counters['failed'], counters['placed'], len(courses))
+
+    # Süre dolduysa denenmeyen dersler de yerleşemeyen sayılır
+    skipped_count = len(courses) - counters['placed'] - counters['failed']
+    if stop_reason:
+        processed_ids = set(c['id'] for c in failed_courses)
+        for row in execute_query("SELECT DISTINCT course_id FROM exam_schedule_versions WHERE version_id = ?",
+                                 (version_id,)):
+            processed_ids.add(row['course_id'])
+        failed_courses.extend(c for c in courses if c['id'] not in processed_ids)
+        counters['failed'] += skipped_count
+        print(f"Planlama durduruldu ({stop_reason}): {skipped_count} ders denenmedi")
 
-    return {
+    result = {
         'total_courses': len(courses),
-        'placed_count': success_count,
-        'failed_count': fail_count
+        'placed_count': counters['placed'],
+        'failed_count': counters['failed'],
+        'skipped_count': skipped_count,
+        'completed': stop_reason is None,
+        'stop_reason': stop_reason,
+        'profile': summarize_profile(state['profile'], courses, failed_courses,
+                                     time.perf_counter() - started)
     }
 
+    # Gözetmen ataması (bellek içi planlamayla aynı son aşama). Süre dolduysa
+    # atlanır; yerleştirmede ID sırasıyla atanan gözetmenler geçerlidir.
+    if not stop_reason:
+        stop_reason = get_stop_reason(deadline)
+        result['completed'] = stop_reason is None
+        result['stop_reason'] = stop_reason
+    if supervisor_matching and not stop_reason:
+        result['supervisor_assignment'] = match_version_supervisors(version_id)
+
+    return result
+
+
+def match_version_supervisors(version_id):
+    """
+    SQL planlamasının yazdığı sürümün gözetmenlerini yük dengeli
+    eşleştirmeyle yeniden atar (bkz. app/supervisors.py).
+
+    Döndürür:
+        report: assign_supervisors raporu
+    """
+    # Döngüsel import olmasın diye burada import edilir
+    from app.rescheduling import load_existing_placements
+    from app.supervisors import assign_supervisors
+
+    snapshot = load_schedule_snapshot()
+    state = create_run_state(snapshot)
+    placements, _ = load_existing_placements(snapshot, version_id)
+    for placement in placements:
+        add_placement_in_memory(state, placement)
+
+    report = assign_supervisors(state)
+    replace_version_exams(version_id, placements_to_exam_rows(state['placements']))
+
+    return report
+
 
 def get_schedule_statistics():
     """
     Sınav programı istatistiklerini hesaplar.
     """
+    exams = execute_query("SELECT course_id, classroom_id, exam_date, start_time, end_time FROM exam_schedule")
+    return calculate_schedule_statistics(exams)
+
+
+def calculate_schedule_statistics(exams):
+    """
+    Verilen sınav satırlarının istatistiklerini hesaplar.
+    Yayındaki program ve deneme (dry-run) programı aynı şekilde ölçülür.
+
+    Parametreler:
+        exams: exam_schedule satırları (course_id, classroom_id, exam_date, start_time, end_time)
+
+    Döndürür:
+        stats: {'total_exams', 'total_courses_with_exam', 'unplanned_courses',
+                'used_classrooms', 'exam_days', 'student_conflicts'}
+    """
     stats = {}
     
     # Toplam planlanmış sınav sayısı (ders bazında)
-    result = execute_query("SELECT COUNT(DISTINCT course_id) as count FROM exam_schedule")
-    stats['total_exams'] = result[0]['count']
+    stats['total_exams'] = len(set(exam['course_id'] for exam in exams))
     
     # Sınavı olan ders sayısı
     result = execute_query("SELECT COUNT(*) as count FROM courses WHERE has_exam = 1")
@@ -733,11 +1741,12 @@ def get_schedule_statistics():
     stats['unplanned_courses'] = stats['total_courses_with_exam'] - stats['total_exams']
     
     # Kullanılan derslik sayısı
-    result = execute_query("SELECT COUNT(DISTINCT classroom_id) as count FROM exam_schedule")
-    stats['used_classrooms'] = result[0]['count']
+    stats['used_classrooms'] = len(set(exam['classroom_id'] for exam in exams))
     
     # Sınav yapılan gün sayısı
-    result = execute_query("SELECT COUNT(DISTINCT exam_date) as count FROM exam_schedule")
-    stats['exam_days'] = result[0]['count']
+    stats['exam_days'] = len(set(exam['exam_date'] for exam in exams))
+    
+    # Öğrenci çakışması olan sınav çifti sayısı
+    stats['student_conflicts'] = len(find_student_clashes(build_conflict_graph(), exams))
     
     return stats
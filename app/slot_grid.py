@@ -0,0 +1,166 @@
+# ==============================================
+# SINAV SAAT IZGARASI (Slotlar)
+# ==============================================
+# Sınav saatleri iki yerde farklı tanımlıydı
+# (generate_time_slots: 2 saatlik 4 slot, planlama:
+# sabit 90 dakikalık 4 slot) ve her denemede bitiş
+# saati strptime ile hesaplanıp '18:00' ile metin
+# olarak karşılaştırılıyordu.
+#
+# Artık ızgara tek yerde, config.SINAV_SLOT_IZGARASI
+# içinde tanımlanır:
+#    - Varsayılan gün şablonu (slotlar)
+#    - Gün adına göre farklı şablonlar (ör. Cuma)
+#    - Dakika adımı (şablon yerine her N dakikada bir başlangıç)
+#    - Gün başı / sonu ve molalar
+#
+# Izgara planlama başında bir kere derlenir
+# (compile_slot_grid). Her (gün adı, sınav süresi)
+# için geçerli başlangıçlar, bitişleri ve kapladıkları
+# slotlar tam sayı dakika olarak önceden hesaplanır;
+# planlama döngüsü saat metni ayrıştırmaz.
+# ==============================================
+
+from datetime import datetime
+
+from config import SINAV_SLOT_IZGARASI, SINAV_SURELERI
+from app.schedule_snapshot import DAY_NAMES, time_to_minutes, minutes_to_time
+
+
+def build_day_template(slots, day_start, day_end, step=None):
+    """
+    Bir günün slot listesini dakikaya çevirir.
+
+    Parametreler:
+        slots: [('HH:MM', 'HH:MM'), ...]
+        day_start, day_end: Gün başı / sonu (dakika)
+        step: Verilirse slotlar yerine gün başından itibaren her step dakikada bir slot
+
+    Döndürür:
+        template: [(başlangıç_dk, bitiş_dk), ...] (başlangıca göre sıralı)
+
+    Hata:
+        ValueError: Bitişi başlangıcından önce olan slot
+    """
+    if step:
+        return [(start, min(start + step, day_end)) for start in range(day_start, day_end, step)]
+
+    template = []
+    for start_time, end_time in slots:
+        start_minute = time_to_minutes(start_time)
+        end_minute = time_to_minutes(end_time)
+        if end_minute <= start_minute:
+            raise ValueError('Geçersiz sınav slotu: ' + start_time + '-' + end_time)
+        template.append((start_minute, end_minute))
+
+    template.sort()
+    return template
+
+
+def compile_slot_grid(settings=None):
+    """
+    Slot ızgarası ayarlarını planlamada kullanılacak hale getirir.
+
+    Parametreler:
+        settings: Izgara ayarları (varsayılan: config.SINAV_SLOT_IZGARASI)
+
+    Döndürür:
+        grid: Sözlük
+            'day_start', 'day_end': Sınavların en erken başlangıcı / en geç bitişi (dakika)
+            'breaks': [(başlangıç_dk, bitiş_dk), ...] sınavın çakışamayacağı molalar
+            'default': Varsayılan gün şablonu [(başlangıç_dk, bitiş_dk), ...]
+            'days': {gün_adı: şablon} farklı şablonu olan günler
+            'starts': {(gün_adı, süre): başlangıçlar} (get_exam_starts önbelleği)
+            'day_names': {tarih: gün_adı} önbelleği
+    """
+    if settings is None:
+        settings = SINAV_SLOT_IZGARASI
+
+    day_start = time_to_minutes(settings['gun_basi'])
+    day_end = time_to_minutes(settings['gun_sonu'])
+    step = settings.get('dakika_adimi')
+
+    breaks = []
+    for start_time, end_time in settings.get('molalar', []):
+        breaks.append((time_to_minutes(start_time), time_to_minutes(end_time)))
+
+    days = {}
+    for day_name, slots in settings.get('gunler', {}).items():
+        days[day_name] = build_day_template(slots, day_start, day_end)
+
+    grid = {
+        'day_start': day_start,
+        'day_end': day_end,
+        'breaks': breaks,
+        'default': build_day_template(settings.get('slotlar', []), day_start, day_end, step),
+        'days': days,
+        'starts': {},
+        'day_names': {}
+    }
+
+    # Bilinen sınav süreleri için başlangıçlar baştan hesaplanır
+    for day_name in DAY_NAMES[:5]:
+        for duration in SINAV_SURELERI:
+            get_exam_starts(grid, day_name, duration)
+
+    return grid
+
+
+def get_day_name(grid, exam_date):
+    """'YYYY-MM-DD' tarihinin gün adı (her tarih bir kere ayrıştırılır)."""
+    day_name = grid['day_names'].get(exam_date)
+    if day_name is None:
+        day_name = DAY_NAMES[datetime.strptime(exam_date, '%Y-%m-%d').weekday()]
+        grid['day_names'][exam_date] = day_name
+    return day_name
+
+
+def get_day_slots(grid, day_name):
+    """Günün slot şablonu [(başlangıç_dk, bitiş_dk), ...]."""
+    return grid['days'].get(day_name, grid['default'])
+
+
+def fits_in_day(grid, start_minute, end_minute):
+    """Sınav gün başı ile gün sonu arasında mı ve hiçbir molaya denk gelmiyor mu?"""
+    if start_minute < grid['day_start'] or end_minute > grid['day_end']:
+        return False
+
+    for break_start, break_end in grid['breaks']:
+        if break_start < end_minute and start_minute < break_end:
+            return False
+
+    return True
+
+
+def get_exam_starts(grid, day_name, duration):
+    """
+    Verilen süredeki bir sınavın o gün başlayabileceği slotlar.
+
+    Döndürür:
+        starts: [(başlangıç_dk, bitiş_dk, 'HH:MM', 'HH:MM', kapladığı slot başlangıçları), ...]
+                Sadece gün sonunu geçmeyen ve molaya denk gelmeyen başlangıçlar.
+    """
+    key = (day_name, duration)
+    starts = grid['starts'].get(key)
+    if starts is not None:
+        return starts
+
+    template = get_day_slots(grid, day_name)
+    starts = []
+    for start_minute, _ in template:
+        end_minute = start_minute + duration
+        if not fits_in_day(grid, start_minute, end_minute):
+            continue
+        covered = tuple(slot_start for slot_start, slot_end in template
+                        if slot_start < end_minute and start_minute < slot_end)
+        starts.append((start_minute, end_minute, minutes_to_time(start_minute), minutes_to_time(end_minute),
+                       covered))
+
+    grid['starts'][key] = starts
+    return starts
+
+
+def get_time_slots(grid, day_name=None):
+    """Günün şablonunu eski biçimde döndürür: [('HH:MM', 'HH:MM'), ...]."""
+    template = grid['default'] if day_name is None else get_day_slots(grid, day_name)
+    return [(minutes_to_time(start), minutes_to_time(end)) for start, end in template]
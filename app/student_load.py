@@ -0,0 +1,127 @@
+# ==============================================
+# ÖĞRENCİ GÜNLÜK SINAV YÜKÜ
+# ==============================================
+# Çakışma kontrolü sadece aynı saatte iki sınavı
+# engeller; bir öğrencinin aynı gün üç sınavı
+# olabilir. Bunu SQL ile her slot için kontrol
+# etmek (öğrenci x sınav birleştirmesi) çok yavaştır.
+#
+# Bu dosya iki kuralı bellekte kontrol eder:
+#    - Bir öğrencinin bir günde en fazla kaç sınavı
+#      olabilir (config.SINAV_OGRENCI_GUNLUK_EN_FAZLA)
+#    - Aynı gündeki iki sınavı arasında en az kaç
+#      dakika olmalı (config.SINAV_OGRENCI_EN_AZ_ARA)
+#
+# Her (öğrenci, tarih) için sınav sayısı ve başlangıca
+# göre sıralı (başlangıç, bitiş) listesi tutulur; her
+# yerleşimde güncellenir. Bir slotun kontrolü dersin
+# öğrencileri üzerinde tek geçiştir (öğrenci başına
+# sözlük okuma + sıralı listede ikili arama),
+# veritabanına gidilmez.
+#
+# İki kural da kapalıysa (None / 0) indeks hiç
+# doldurulmaz ve kontrol hemen döner.
+# ==============================================
+
+from bisect import bisect_left, insort
+
+
+def create_student_load_index(enrollments, max_per_day=None, min_gap=0):
+    """
+    Boş bir öğrenci yükü indeksi oluşturur.
+
+    Parametreler:
+        enrollments: {ders_id: {öğrenci_id, ...}}
+        max_per_day: Öğrenci başına günlük en fazla sınav (None: sınırsız)
+        min_gap: Aynı gündeki iki sınav arasında en az ara (dakika, 0: sadece çakışma yasak)
+
+    Döndürür:
+        index: Sözlük
+            'enrollments': Ders -> öğrenciler
+            'max_per_day', 'min_gap': Kurallar
+            'enabled': Kurallardan biri açık mı?
+            'counts': {(öğrenci_id, tarih): sınav sayısı}
+            'exams': {(öğrenci_id, tarih): [(başlangıç, bitiş), ...]} (başlangıca göre sıralı)
+    """
+    index = {
+        'enrollments': enrollments,
+        'max_per_day': max_per_day,
+        'min_gap': min_gap or 0,
+        'enabled': max_per_day is not None or bool(min_gap),
+        'counts': {},
+        'exams': {}
+    }
+    return index
+
+
+def violates_student_load(index, course_id, exam_date, start_minute, end_minute):
+    """
+    Ders bu slota konursa bir öğrencinin günlük sınır veya en az ara kuralı bozulur mu?
+
+    Döndürür:
+        violates: True/False
+    """
+    if not index['enabled']:
+        return False
+
+    max_per_day = index['max_per_day']
+    min_gap = index['min_gap']
+    counts = index['counts']
+    exams = index['exams']
+
+    for student_id in index['enrollments'].get(course_id, ()):
+        key = (student_id, exam_date)
+
+        if max_per_day is not None and counts.get(key, 0) >= max_per_day:
+            return True
+
+        if min_gap:
+            day_exams = exams.get(key)
+            if not day_exams:
+                continue
+            position = bisect_left(day_exams, (start_minute, end_minute))
+            # Önceki sınav bitişi ile bu sınavın başlangıcı arası
+            if position > 0 and day_exams[position - 1][1] + min_gap > start_minute:
+                return True
+            # Bu sınavın bitişi ile sonraki sınavın başlangıcı arası
+            if position < len(day_exams) and end_minute + min_gap > day_exams[position][0]:
+                return True
+
+    return False
+
+
+def add_exam_to_student_load(index, course_id, exam_date, start_minute, end_minute):
+    """Dersin sınavını öğrencilerinin günlük sayaçlarına ve listelerine ekler."""
+    if not index['enabled']:
+        return
+
+    counts = index['counts']
+    exams = index['exams']
+
+    for student_id in index['enrollments'].get(course_id, ()):
+        key = (student_id, exam_date)
+        counts[key] = counts.get(key, 0) + 1
+        day_exams = exams.get(key)
+        if day_exams is None:
+            exams[key] = [(start_minute, end_minute)]
+        else:
+            insort(day_exams, (start_minute, end_minute))
+
+
+def remove_exam_from_student_load(index, course_id, exam_date, start_minute, end_minute):
+    """add_exam_to_student_load ile eklenen sınavı geri alır."""
+    if not index['enabled']:
+        return
+
+    counts = index['counts']
+    exams = index['exams']
+
+    for student_id in index['enrollments'].get(course_id, ()):
+        key = (student_id, exam_date)
+        if counts.get(key, 0) <= 1:
+            counts.pop(key, None)
+            exams.pop(key, None)
+            continue
+        counts[key] -= 1
+        day_exams = exams[key]
+        day_exams.pop(bisect_left(day_exams, (start_minute, end_minute)))
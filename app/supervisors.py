@@ -0,0 +1,284 @@
+# ==============================================
+# GÖZETMEN ATAMASI (Min-Maliyet Eşleştirme)
+# ==============================================
+# Yerleştirme sırasında gözetmenler ID sırasıyla
+# alınır; bu yüzden hep aynı hocalar yüklenir.
+#
+# Bu dosya gözetmen atamasını ayrı bir aşama
+# olarak yapar. Sınavların gün, saat ve derslikleri
+# sabitlendikten sonra:
+#
+#    1. Aynı gün ve aynı başlangıç saatindeki sınavlar
+#       bir grup oluşturur (hepsi birbiriyle çakışır).
+#    2. Her grup için (sınav-derslik, hoca) çiftleri
+#       üzerinde min-maliyet eşleştirme çözülür.
+#       Maliyet = hocanın o ana kadarki gözetmenlik yükü.
+#    3. Her sınavın ilk dersliği önceliklidir; böylece
+#       gözetmensiz sınav kalmaz.
+#    4. Gözetmen yetmezse sınavın diğer dersliklerine
+#       aynı sınavın gözetmeni tekrar verilir.
+#    5. Eşleşmede hiç gözetmen bulunamayan sınava hâlâ
+#       boşta olan uygun bir hoca verilir; o da yoksa
+#       sınav gözetmensiz kalır ve raporda sayılır.
+#
+# Müsaitlik ve çakışmalar bellekten kontrol edilir,
+# veritabanına sorgu atılmaz.
+# ==============================================
+
+import time
+from collections import deque
+from datetime import datetime
+
+from app.schedule_snapshot import DAY_NAMES, is_instructor_available_in_snapshot
+from app.occupancy import is_busy, mark_busy, is_instructor_busy
+
+# İlk dersliğin eşleşmesini her şeyin önüne koyan ödül
+PRIMARY_ROOM_BONUS = 10 ** 9
+
+
+def solve_min_cost_matching(left_count, right_count, costs):
+    """
+    Min-maliyetli en büyük eşleştirmeyi bulur (ardışık en kısa yol).
+    Her sol ve sağ düğüm en fazla bir kere eşleşir.
+
+    Parametreler:
+        left_count: Sol düğüm sayısı (sınav-derslik)
+        right_count: Sağ düğüm sayısı (hoca)
+        costs: {(sol, sağ): maliyet} (sadece izin verilen çiftler)
+
+    Döndürür:
+        matching: {sol: sağ}
+    """
+    source = 0
+    sink = left_count + right_count + 1
+    node_count = sink + 1
+    graph = [[] for _ in range(node_count)]
+
+    def add_edge(u, v, cost):
+        graph[u].append([v, 1, cost, len(graph[v])])
+        graph[v].append([u, 0, -cost, len(graph[u]) - 1])
+
+    for left in range(left_count):
+        add_edge(source, 1 + left, 0)
+    for right in range(right_count):
+        add_edge(1 + left_count + right, sink, 0)
+    for (left, right), cost in costs.items():
+        add_edge(1 + left, 1 + left_count + right, cost)
+
+    while True:
+        # Bellman-Ford (SPFA) ile artık grafikte en kısa yol
+        distance = [None] * node_count
+        previous = [None] * node_count
+        in_queue = [False] * node_count
+        distance[source] = 0
+        queue = deque([source])
+        in_queue[source] = True
+
+        while queue:
+            u = queue.popleft()
+            in_queue[u] = False
+            for i, (v, capacity, cost, _) in enumerate(graph[u]):
+                if capacity <= 0:
+                    continue
+                if distance[v] is None or distance[u] + cost < distance[v]:
+                    distance[v] = distance[u] + cost
+                    previous[v] = (u, i)
+                    if not in_queue[v]:
+                        queue.append(v)
+                        in_queue[v] = True
+
+        if distance[sink] is None:
+            break  # Artırılacak yol kalmadı
+
+        # Yol boyunca bir birim akış gönder
+        v = sink
+        while v != source:
+            u, i = previous[v]
+            edge = graph[u][i]
+            edge[1] -= 1
+            graph[v][edge[3]][1] += 1
+            v = u
+
+    matching = {}
+    for left in range(left_count):
+        for v, capacity, _, _ in graph[1 + left]:
+            if capacity == 0 and 1 + left_count <= v < sink:
+                matching[left] = v - 1 - left_count
+                break
+
+    return matching
+
+
+def group_placements_by_slot(placements):
+    """
+    Yerleşimleri (tarih, başlangıç) gruplarına ayırır, kronolojik sırayla.
+
+    Döndürür:
+        groups: [[yerleşim, ...], ...]
+    """
+    groups = {}
+    for placement in placements:
+        key = (placement['exam_date'], placement['start_minute'])
+        if key not in groups:
+            groups[key] = []
+        groups[key].append(placement)
+
+    return [groups[key] for key in sorted(groups)]
+
+
+def get_eligible_supervisors(state, placement, day_name, assigned):
+    """
+    Sınava gözetmen olabilecek hocaları bulur:
+    müsait, o saatte kendi sınavı yok, başka sınavda gözetmen değil.
+
+    Döndürür:
+        instructor_ids: Hoca ID listesi
+    """
+    snapshot = state['snapshot']
+    exam_date = placement['exam_date']
+    start_minute = placement['start_minute']
+    end_minute = placement['end_minute']
+
+    eligible = []
+    for instructor_id in snapshot['instructor_ids']:
+        if instructor_id == placement['instructor_id']:
+            continue
+        if not is_instructor_available_in_snapshot(snapshot, instructor_id, day_name, start_minute, end_minute):
+            continue
+        if is_instructor_busy(state['occupancy'], instructor_id, exam_date, start_minute, end_minute):
+            continue
+        if is_busy(assigned, (exam_date, instructor_id), start_minute, end_minute):
+            continue
+        eligible.append(instructor_id)
+
+    return eligible
+
+
+def pick_free_supervisor(state, placement, day_name, assigned, load):
+    """
+    Eşleşmede gözetmen bulunamayan sınav için hâlâ uygun ve boşta olan bir hoca seçer.
+    Yerleştirmedeki gözetmen boştaysa o korunur, değilse yükü en az olan seçilir.
+
+    Döndürür:
+        instructor_id: Hoca ID'si veya None (uygun hoca yok)
+    """
+    eligible = get_eligible_supervisors(state, placement, day_name, assigned)
+    if not eligible:
+        return None
+
+    for supervisor_id in placement['supervisors']:
+        if supervisor_id in eligible:
+            return supervisor_id
+
+    return min(eligible, key=lambda instructor_id: load.get(instructor_id, 0))
+
+
+def set_placement_supervisors(placement, supervisors, assigned, load):
+    """Gözetmenleri yerleşime yazar, görev tablosunu ve yükleri günceller (None atlanır)."""
+    placement['supervisors'] = supervisors
+    for supervisor_id in set(supervisors):
+        if supervisor_id is not None:
+            mark_busy(assigned, (placement['exam_date'], supervisor_id),
+                      placement['start_minute'], placement['end_minute'])
+    for supervisor_id in supervisors:
+        if supervisor_id is not None:
+            load[supervisor_id] = load.get(supervisor_id, 0) + 1
+
+
+def assign_supervisors(state):
+    """
+    Yerleşmiş tüm sınavların gözetmenlerini yük dengeli olarak yeniden atar.
+    state['placements'] içindeki 'supervisors' listeleri ve doluluk
+    indeksindeki gözetmen tablosu güncellenir.
+
+    Döndürür:
+        report: Sözlük
+            'rooms': Toplam sınav-derslik sayısı
+            'matched': Ayrı gözetmen bulunan derslik sayısı
+            'reused': Aynı sınavın gözetmeni tekrar verilen derslik sayısı
+            'unmatched': Eşleştirmede gözetmen bulunamayan sınav sayısı
+            'unsupervised': Boşta uygun hoca da olmadığı için gözetmensiz kalan sınav sayısı
+            'max_load' / 'min_load': Gözetmenlik yükü (görev alan hocalar arasında)
+            'elapsed': Geçen süre (saniye)
+    """
+    started = time.perf_counter()
+
+    instructor_rank = {}
+    for i, instructor_id in enumerate(state['snapshot']['instructor_ids']):
+        instructor_rank[instructor_id] = i
+    weight = len(instructor_rank) + 1
+
+    load = {}
+    assigned = {}
+    report = {'rooms': 0, 'matched': 0, 'reused': 0, 'unmatched': 0, 'unsupervised': 0}
+
+    for group in group_placements_by_slot(state['placements']):
+        day_name = DAY_NAMES[datetime.strptime(group[0]['exam_date'], '%Y-%m-%d').weekday()]
+
+        # Sol düğümler: (yerleşim, derslik sırası)
+        left_nodes = []
+        right_index = {}
+        right_nodes = []
+        costs = {}
+
+        for placement in group:
+            eligible = get_eligible_supervisors(state, placement, day_name, assigned)
+            for room_index in range(len(placement['rooms'])):
+                left = len(left_nodes)
+                left_nodes.append((placement, room_index))
+
+                for instructor_id in eligible:
+                    if instructor_id not in right_index:
+                        right_index[instructor_id] = len(right_nodes)
+                        right_nodes.append(instructor_id)
+
+                    # Yükü az olan önce, eşitlikte ID sırası
+                    cost = load.get(instructor_id, 0) * weight + instructor_rank[instructor_id]
+                    if room_index == 0:
+                        cost -= PRIMARY_ROOM_BONUS
+                    costs[(left, right_index[instructor_id])] = cost
+
+        matching = solve_min_cost_matching(len(left_nodes), len(right_nodes), costs)
+
+        # Sonuçları yerleşimlere yaz
+        chosen = {}
+        for left, (placement, room_index) in enumerate(left_nodes):
+            if left in matching:
+                key = id(placement)
+                if key not in chosen:
+                    chosen[key] = [None] * len(placement['rooms'])
+                chosen[key][room_index] = right_nodes[matching[left]]
+
+        # Önce eşleşenler işaretlenir; eşleşmeyenler kalan boş hocalardan seçer
+        unmatched = []
+        for placement in group:
+            report['rooms'] += len(placement['rooms'])
+            supervisors = chosen.get(id(placement))
+
+            if supervisors is None or supervisors[0] is None:
+                report['unmatched'] += 1
+                unmatched.append(placement)
+                continue
+
+            for room_index in range(len(supervisors)):
+                if supervisors[room_index] is None:
+                    supervisors[room_index] = supervisors[0]
+                    report['reused'] += 1
+                else:
+                    report['matched'] += 1
+            set_placement_supervisors(placement, supervisors, assigned, load)
+
+        for placement in unmatched:
+            supervisor_id = pick_free_supervisor(state, placement, day_name, assigned, load)
+            if supervisor_id is None:
+                report['unsupervised'] += 1
+            set_placement_supervisors(placement, [supervisor_id] * len(placement['rooms']), assigned, load)
+
+    # Doluluk indeksindeki gözetmen tablosunu yeni atamayla değiştir
+    state['occupancy']['supervisors'] = assigned
+
+    report['max_load'] = max(load.values()) if load else 0
+    report['min_load'] = min(load.values()) if load else 0
+    report['elapsed'] = round(time.perf_counter() - started, 3)
+
+    return report
@@ -0,0 +1,377 @@
+# ==============================================
+# SENTETİK ÜNİVERSİTE VERİSİ (Ölçek Testi)
+# ==============================================
+# seed.sql ve generate_students.py gerçek
+# verimizin çok küçük bir kopyasıdır. Planlama,
+# dışa aktarma ve sayfaların 10x-100x veride
+# nasıl davrandığını ölçmek için bu dosya
+# parametrik bir veri seti üretir:
+#    fakülteler, bölümler, öğretim üyeleri,
+#    derslikler (+ yakınlık), dersler, öğrenciler,
+#    ders kayıtları, hoca müsaitlikleri
+#
+# Ayarlar (DEFAULT_OPTIONS):
+#    - scale: Fakülte sayısı çarpanı (her şey onunla büyür)
+#    - enrollment_skew: Kayıt dağılımının çarpıklığı
+#      (0 = eşit, büyüdükçe bazı dersler çok kalabalık)
+#    - cross_department_ratio: Öğrencinin başka bölümden
+#      aldığı ders oranı (çakışma grafının yoğunluğu)
+#    - unavailable_ratio: Hocanın müsait olmadığı yarım
+#      gün oranı (müsaitlik seyrekliği)
+#
+# Veri tek bağlantıda, tek işlemde executemany ile
+# yazılır. Aynı tohum (seed) aynı veriyi üretir.
+#
+# Kullanım:
+#    python -m app.synthetic_data hedef.db --scale 10 --seed 1
+# ==============================================
+
+import os
+import random
+import sqlite3
+import time
+
+from config import BASE_DIR
+
+# Varsayılanlar seed.sql ile aynı büyüklüktedir (scale=1)
+DEFAULT_OPTIONS = {
+    'scale': 1,
+    'faculties': 4,
+    'departments_per_faculty': 2,
+    'instructors_per_department': 2,
+    'courses_per_department': 5,
+    'students_per_department': 100,
+    'courses_per_student': 4,
+    'rooms_per_faculty': 4,
+    'labs_per_faculty': 1,
+    'proximity_neighbors': 3,
+    'lab_course_ratio': 0.15,
+    'common_courses': 1,
+    'common_course_ratio': 0.15,
+    'enrollment_skew': 1.0,
+    'cross_department_ratio': 0.2,
+    'unavailable_ratio': 0.2,
+    'class_time_ratio': 1.0
+}
+
+DAYS = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma']
+
+# Müsaitlik yarım günleri ve haftalık ders saatleri
+HALF_DAYS = [('09:00', '13:00'), ('13:00', '18:00')]
+CLASS_SLOTS = [('09:00', '10:30'), ('10:30', '12:00'), ('13:00', '14:30'), ('14:30', '16:00')]
+
+TITLES = ['Prof. Dr.', 'Doç. Dr.', 'Dr. Öğr. Üyesi', 'Öğr. Gör.']
+FIRST_NAMES = ['Ahmet', 'Mehmet', 'Ayşe', 'Fatma', 'Zeynep', 'Emre', 'Elif', 'Can', 'Selin', 'Burak',
+               'Merve', 'Onur', 'Deniz', 'Ece', 'Kaan', 'Gizem', 'Mert', 'Defne', 'Arda', 'Naz']
+LAST_NAMES = ['Yılmaz', 'Demir', 'Şahin', 'Çelik', 'Öztürk', 'Kaya', 'Arslan', 'Koç', 'Aydın', 'Polat',
+              'Kara', 'Aksoy', 'Özkan', 'Tekin', 'Kurt', 'Yıldız', 'Güneş', 'Bulut', 'Doğan', 'Aslan']
+
+
+def build_options(**overrides):
+    """
+    Varsayılan ayarları verilenlerle birleştirir.
+    Bilinmeyen ayar adı verilirse hata verir.
+    """
+    options = dict(DEFAULT_OPTIONS)
+    for name, value in overrides.items():
+        if name not in options:
+            raise ValueError(f"Bilinmeyen ayar: {name}")
+        options[name] = value
+    return options
+
+
+def random_name(rng):
+    """Rastgele ad soyad."""
+    return rng.choice(FIRST_NAMES) + ' ' + rng.choice(LAST_NAMES)
+
+
+def weighted_sample(rng, items, weights, count):
+    """
+    Ağırlıklara göre tekrarsız örnek seçer (Efraimidis-Spirakis).
+
+    Döndürür:
+        selected: En fazla count elemanlı liste
+    """
+    if count >= len(items):
+        return list(items)
+    keys = []
+    for item, weight in zip(items, weights):
+        keys.append((rng.random() ** (1.0 / weight), item))
+    keys.sort(reverse=True)
+    return [item for _, item in keys[:count]]
+
+
+def generate_university_rows(options, seed=0):
+    """
+    Tüm tabloların satırlarını bellekte üretir (veritabanına yazmaz).
+    ID'ler 1'den başlar; satırlar boş bir veritabanına bu sırayla eklenir.
+
+    Döndürür:
+        rows: {tablo_adı: [satır, ...]}
+    """
+    rng = random.Random(seed)
+
+    faculty_count = options['faculties'] * options['scale']
+    rows = {
+        'faculties': [], 'departments': [], 'instructors': [], 'classrooms': [],
+        'classroom_proximity': [], 'courses': [], 'students': [], 'student_courses': [],
+        'instructor_availability': []
+    }
+
+    # Fakülteler, bölümler, hocalar
+    department_ids = []
+    instructors_by_department = {}
+    for f in range(faculty_count):
+        faculty_id = f + 1
+        rows['faculties'].append((f'Fakülte {faculty_id}', f'F{faculty_id}'))
+
+        for d in range(options['departments_per_faculty']):
+            department_id = len(department_ids) + 1
+            department_ids.append(department_id)
+            rows['departments'].append((f'Bölüm {department_id}', f'B{department_id}', faculty_id))
+
+            instructors_by_department[department_id] = []
+            for i in range(options['instructors_per_department']):
+                instructor_id = len(rows['instructors']) + 1
+                instructors_by_department[department_id].append(instructor_id)
+                rows['instructors'].append((
+                    random_name(rng), rng.choice(TITLES), f'hoca{instructor_id}@kstu.edu.tr',
+                    f'0262 555 {instructor_id:04d}', department_id
+                ))
+
+    # Derslikler: her fakülteye bir bina, binadaki derslikler birbirine yakın
+    for f in range(faculty_count):
+        building = f'Bina {f + 1}'
+        block = chr(ord('A') + f % 26)
+        building_room_ids = []
+
+        for r in range(options['rooms_per_faculty']):
+            building_room_ids.append(len(rows['classrooms']) + 1)
+            rows['classrooms'].append((f'{block}{f + 1}-{r + 1:02d}', building, block,
+                                       rng.choice([35, 40, 45, 50, 60, 70, 80]), 0, 1, 'Normal'))
+        for r in range(options['labs_per_faculty']):
+            building_room_ids.append(len(rows['classrooms']) + 1)
+            rows['classrooms'].append((f'LAB{f + 1}-{r + 1}', building, block,
+                                       rng.choice([30, 35]), 1, 1, 'Lab'))
+
+        # Her 4 fakülteye bir konferans salonu (kalabalık ortak dersler için)
+        if f % 4 == 0:
+            building_room_ids.append(len(rows['classrooms']) + 1)
+            rows['classrooms'].append((f'KONF-{f // 4 + 1}', building, block,
+                                       rng.choice([120, 150]), 0, 1, 'Konferans'))
+
+        for room_id in building_room_ids:
+            others = [other for other in building_room_ids if other != room_id]
+            rng.shuffle(others)
+            for priority, nearby_id in enumerate(others[:options['proximity_neighbors']]):
+                rows['classroom_proximity'].append((room_id, nearby_id, priority + 1))
+
+    # Dersler (öğrenci sayısı kayıtlardan sonra doldurulur)
+    courses_by_department = {}
+    course_department = []
+    course_instructor = []
+    course_is_lab = []
+    for department_id in department_ids:
+        courses_by_department[department_id] = []
+        for c in range(options['courses_per_department']):
+            course_id = len(course_department) + 1
+            courses_by_department[department_id].append(course_id)
+            course_department.append(department_id)
+            course_instructor.append(rng.choice(instructors_by_department[department_id]))
+            course_is_lab.append(rng.random() < options['lab_course_ratio'])
+
+    common_course_ids = []
+    for c in range(options['common_courses'] * options['scale']):
+        course_id = len(course_department) + 1
+        common_course_ids.append(course_id)
+        department_id = department_ids[c % len(department_ids)]
+        course_department.append(department_id)
+        course_instructor.append(rng.choice(instructors_by_department[department_id]))
+        course_is_lab.append(False)
+
+    # Öğrenciler ve kayıtlar
+    # Ders popülerliği: i. ders için ağırlık 1 / (i + 1) ^ skew
+    skew = options['enrollment_skew']
+    enrollment_counts = [0] * len(course_department)
+    all_regular_courses = [course_id for department_id in department_ids
+                           for course_id in courses_by_department[department_id]]
+
+    for department_id in department_ids:
+        own_courses = courses_by_department[department_id]
+        own_weights = [1.0 / (i + 1) ** skew for i in range(len(own_courses))]
+
+        for s in range(options['students_per_department']):
+            student_id = len(rows['students']) + 1
+            grade = s % 4 + 1
+            rows['students'].append((
+                f'2024{department_id:03d}{s + 1:04d}', random_name(rng),
+                f'ogrenci{student_id}@kstu.edu.tr', department_id, grade
+            ))
+
+            wanted = options['courses_per_student']
+            cross_count = sum(1 for _ in range(wanted) if rng.random() < options['cross_department_ratio'])
+            chosen = weighted_sample(rng, own_courses, own_weights, wanted - cross_count)
+            if cross_count:
+                others = [course_id for course_id in rng.sample(all_regular_courses,
+                                                                min(len(all_regular_courses), cross_count * 3))
+                          if course_id not in chosen]
+                chosen.extend(others[:cross_count])
+            # Ortak dersler bölümlere paylaştırılır (her ortak dersi bir bölüm grubu alır)
+            if common_course_ids:
+                common_course_id = common_course_ids[(department_id - 1) % len(common_course_ids)]
+                if rng.random() < options['common_course_ratio']:
+                    chosen.append(common_course_id)
+
+            for course_id in chosen:
+                rows['student_courses'].append((student_id, course_id))
+                enrollment_counts[course_id - 1] += 1
+
+    for index in range(len(course_department)):
+        course_id = index + 1
+        department_id = course_department[index]
+        if course_id in common_course_ids:
+            code = f'ORT{901 + common_course_ids.index(course_id)}'
+        elif course_is_lab[index]:
+            code = f'LAB{department_id}{course_id:04d}'
+        else:
+            code = f'B{department_id}D{course_id:04d}'
+
+        class_day, class_start, class_end = None, None, None
+        if rng.random() < options['class_time_ratio']:
+            class_day = rng.choice(DAYS)
+            class_start, class_end = rng.choice(CLASS_SLOTS)
+
+        rows['courses'].append((
+            code, f'Ders {course_id}', department_id, course_instructor[index],
+            enrollment_counts[index], rng.choice([60, 60, 90]), 'Yazılı',
+            1 if course_is_lab[index] else 0, 1, class_day, class_start, class_end
+        ))
+
+    # Hoca müsaitlikleri: her hoca için her yarım gün ya müsait ya değil
+    for instructor_id in range(1, len(rows['instructors']) + 1):
+        for day_name in DAYS:
+            for start_time, end_time in HALF_DAYS:
+                is_available = 0 if rng.random() < options['unavailable_ratio'] else 1
+                rows['instructor_availability'].append((instructor_id, day_name, start_time,
+                                                        end_time, is_available))
+
+    return rows
+
+
+def write_university(database_path, rows, admin_password='admin123'):
+    """
+    Üretilen satırları yeni bir SQLite dosyasına toplu olarak yazar.
+    Dosya varsa silinir. Şema database/schema.sql'den oluşturulur.
+    """
+    if os.path.exists(database_path):
+        os.remove(database_path)
+
+    schema_file = open(os.path.join(BASE_DIR, 'database', 'schema.sql'), 'r', encoding='utf-8')
+    schema_sql = schema_file.read()
+    schema_file.close()
+
+    connection = sqlite3.connect(database_path)
+    cursor = connection.cursor()
+
+    try:
+        cursor.executescript(schema_sql)
+
+        # Toplu yazma: tek işlem, diske her satırda gitme
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+        cursor.execute("BEGIN")
+
+        cursor.executemany("INSERT INTO faculties (name, code) VALUES (?, ?)", rows['faculties'])
+        cursor.executemany("INSERT INTO departments (name, code, faculty_id) VALUES (?, ?, ?)",
+                           rows['departments'])
+        cursor.executemany("""
+            INSERT INTO instructors (name, title, email, phone, department_id) VALUES (?, ?, ?, ?, ?)
+        """, rows['instructors'])
+        cursor.executemany("""
+            INSERT INTO classrooms (name, building, block, capacity, has_computer, is_available, classroom_type)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows['classrooms'])
+        cursor.executemany("""
+            INSERT INTO classroom_proximity (classroom_id, nearby_classroom_id, priority) VALUES (?, ?, ?)
+        """, rows['classroom_proximity'])
+        cursor.executemany("""
+            INSERT INTO courses (code, name, department_id, instructor_id, student_count, exam_duration,
+                                 exam_type, needs_computer, has_exam, day_of_week, class_start_time, class_end_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows['courses'])
+        cursor.executemany("""
+            INSERT INTO students (student_no, name, email, department_id, grade) VALUES (?, ?, ?, ?, ?)
+        """, rows['students'])
+        cursor.executemany("INSERT INTO student_courses (student_id, course_id) VALUES (?, ?)",
+                           rows['student_courses'])
+        cursor.executemany("""
+            INSERT INTO instructor_availability (instructor_id, day_of_week, start_time, end_time, is_available)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows['instructor_availability'])
+
+        if admin_password:
+            from werkzeug.security import generate_password_hash
+            cursor.execute("""
+                INSERT INTO users (username, password, email, full_name, role)
+                VALUES ('admin', ?, 'admin@kstu.edu.tr', 'Sistem Yöneticisi', 'admin')
+            """, (generate_password_hash(admin_password),))
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def generate_university(database_path, seed=0, admin_password='admin123', **overrides):
+    """
+    Sentetik bir üniversite veri seti üretir ve SQLite dosyasına yazar.
+
+    Parametreler:
+        database_path: Yazılacak veritabanı dosyası (varsa silinir)
+        seed: Rastgele tohum (aynı tohum + aynı ayarlar = aynı veri)
+        admin_password: Admin kullanıcısının şifresi (None ise kullanıcı eklenmez)
+        overrides: DEFAULT_OPTIONS içindeki ayarlar (ör. scale=10)
+
+    Döndürür:
+        stats: {tablo_adı: satır sayısı, 'options': ayarlar, 'elapsed': süre}
+    """
+    started = time.perf_counter()
+
+    options = build_options(**overrides)
+    rows = generate_university_rows(options, seed)
+    write_university(database_path, rows, admin_password)
+
+    stats = {}
+    for table, table_rows in rows.items():
+        stats[table] = len(table_rows)
+    stats['options'] = options
+    stats['elapsed'] = round(time.perf_counter() - started, 3)
+
+    return stats
+
+
+def main():
+    """Komut satırı: python -m app.synthetic_data hedef.db --scale 10 --seed 1"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sentetik üniversite veritabanı üretir.')
+    parser.add_argument('database_path', help='Yazılacak SQLite dosyası (varsa silinir)')
+    parser.add_argument('--seed', type=int, default=0, help='Rastgele tohum')
+    for name, value in DEFAULT_OPTIONS.items():
+        parser.add_argument('--' + name.replace('_', '-'), dest=name, type=type(value), default=value)
+    args = vars(parser.parse_args())
+
+    database_path = args.pop('database_path')
+    seed = args.pop('seed')
+    stats = generate_university(database_path, seed=seed, **args)
+
+    print(f"Veritabani olusturuldu: {database_path} ({stats['elapsed']} sn)")
+    for table in ('faculties', 'departments', 'instructors', 'classrooms', 'courses',
+                  'students', 'student_courses', 'instructor_availability'):
+        print(f"   {table}: {stats[table]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+# ==============================================
+# DENEME (DRY-RUN) PLANLAMASI
+# ==============================================
+# Normal planlama önce exam_schedule'ı temizler;
+# yönetici farklı bir tarih aralığını denemek
+# isterse yayındaki program kaybolur.
+#
+# Deneme planlaması:
+#    1. Programı tamamen bellekte hesaplar
+#       (compute_schedule_in_memory), exam_schedule'a
+#       DOKUNMAZ
+#    2. Sonucu taslak olarak saklar (schedule_drafts)
+#    3. Yerleşimleri, istatistikleri ve yayındaki
+#       programla farkı (eklenen, kaldırılan, taşınan
+#       dersler) döndürür
+#
+# Taslak daha sonra publish_draft ile yeniden
+# hesaplanmadan tek işlemde yayınlanabilir. Taslak
+# hesaplandıktan sonra yayındaki program değiştiyse
+# (ör. başka bir planlama yayınlandı) yayınlama
+# ancak açık onayla (force) yapılır; taslaktaki ders,
+# derslik veya gözetmen silindiyse hiç yapılmaz.
+# ==============================================
+
+import json
+
+from app.database import execute_query
+from app.models.exam import replace_all_exams, get_published_version_id
+from app.models.draft import create_draft, get_draft_by_id, mark_draft_published
+from app.scheduler import compute_schedule_in_memory, placements_to_exam_rows, calculate_schedule_statistics
+
+# exam_schedule satırlarının alan sırası (placements_to_exam_rows ile aynı)
+EXAM_ROW_FIELDS = ('course_id', 'classroom_id', 'supervisor_id', 'exam_date', 'start_time', 'end_time')
+
+
+def get_current_exam_rows():
+    """Yayındaki programın satırlarını sözlük listesi olarak getirir."""
+    query = "SELECT course_id, classroom_id, supervisor_id, exam_date, start_time, end_time FROM exam_schedule"
+    return [dict(row) for row in execute_query(query)]
+
+
+def group_exam_rows(exam_rows):
+    """
+    Satırları ders bazında birleştirir (bir ders birden fazla derslikte olabilir).
+
+    Döndürür:
+        exams: {ders_id: {'exam_date', 'start_time', 'end_time', 'rooms', 'supervisors'}}
+    """
+    exams = {}
+    for row in exam_rows:
+        exam = exams.get(row['course_id'])
+        if exam is None:
+            exam = {'exam_date': row['exam_date'], 'start_time': row['start_time'],
+                    'end_time': row['end_time'], 'rooms': [], 'supervisors': []}
+            exams[row['course_id']] = exam
+        exam['rooms'].append(row['classroom_id'])
+        exam['supervisors'].append(row['supervisor_id'])
+
+    for exam in exams.values():
+        pairs = sorted(zip(exam['rooms'], exam['supervisors']), key=lambda pair: pair[0])
+        exam['rooms'] = [room for room, _ in pairs]
+        exam['supervisors'] = [supervisor for _, supervisor in pairs]
+
+    return exams
+
+
+def diff_exam_rows(current_rows, proposed_rows):
+    """
+    İki programı ders bazında karşılaştırır.
+
+    Parametreler:
+        current_rows: Yayındaki programın satırları
+        proposed_rows: Deneme programının satırları
+
+    Döndürür:
+        diff: Sözlük
+            'added': Sadece yeni programda olan dersler
+            'removed': Sadece yayındaki programda olan dersler
+            'moved': Tarihi veya saati değişen dersler
+            'changed': Saati aynı, dersliği veya gözetmeni değişen dersler
+            'unchanged_count': Hiç değişmeyen ders sayısı
+        Listelerdeki her kayıt: {'course_id', 'code', 'before', 'after'}
+    """
+    current = group_exam_rows(current_rows)
+    proposed = group_exam_rows(proposed_rows)
+
+    codes = {}
+    for row in execute_query("SELECT id, code FROM courses"):
+        codes[row['id']] = row['code']
+
+    diff = {'added': [], 'removed': [], 'moved': [], 'changed': [], 'unchanged_count': 0}
+
+    for course_id in sorted(set(current) | set(proposed)):
+        before = current.get(course_id)
+        after = proposed.get(course_id)
+        entry = {'course_id': course_id, 'code': codes.get(course_id), 'before': before, 'after': after}
+
+        if before is None:
+            diff['added'].append(entry)
+        elif after is None:
+            diff['removed'].append(entry)
+        elif (before['exam_date'], before['start_time'], before['end_time']) != \
+                (after['exam_date'], after['start_time'], after['end_time']):
+            diff['moved'].append(entry)
+        elif before != after:
+            diff['changed'].append(entry)
+        else:
+            diff['unchanged_count'] += 1
+
+    return diff
+
+
+def run_dry_run(start_date, end_date, ordering='student_count', improve=False, attempts=1, workers=None,
+                supervisor_matching=True, progress=None, deadline=None, components=False):
+    """
+    Planlamayı exam_schedule'a yazmadan yapar ve taslak olarak saklar.
+    Parametreler için bkz. generate_exam_schedule.
+
+    Döndürür:
+        result: Planlama sonucu ve ek olarak
+            'dry_run': True
+            'draft_id': Yayınlamak için taslak ID'si (bkz. publish_draft)
+            'placements': Yeni programın satırları (EXAM_ROW_FIELDS sözlükleri)
+            'statistics': Yeni programın istatistikleri (get_schedule_statistics ile aynı)
+            'diff': Yayındaki programla fark (bkz. diff_exam_rows)
+    """
+    if components:
+        from app.components import generate_component_schedule
+        result = generate_component_schedule(start_date, end_date, workers, ordering, improve,
+                                             supervisor_matching, progress, deadline, save=False)
+        placements = result.pop('placements')
+    elif attempts > 1:
+        from app.multistart import generate_multistart_schedule
+        result = generate_multistart_schedule(start_date, end_date, attempts, workers, ordering, improve,
+                                              progress=progress, deadline=deadline, save=False,
+                                              supervisor_matching=supervisor_matching)
+        placements = result.pop('placements')
+    else:
+        state, result = compute_schedule_in_memory(start_date, end_date, ordering, improve,
+                                                   supervisor_matching=supervisor_matching,
+                                                   progress=progress, deadline=deadline)
+        placements = state['placements']
+
+    base_version_id = get_published_version_id()
+    exam_rows = placements_to_exam_rows(placements)
+    proposed_rows = [dict(zip(EXAM_ROW_FIELDS, row)) for row in exam_rows]
+
+    result['dry_run'] = True
+    result['statistics'] = calculate_schedule_statistics(proposed_rows)
+    result['diff'] = diff_exam_rows(get_current_exam_rows(), proposed_rows)
+
+    options = {'ordering': ordering, 'improve': improve, 'attempts': attempts,
+               'supervisor_matching': supervisor_matching, 'components': components}
+    summary = dict(result)
+    summary.pop('profile', None)
+    result['draft_id'] = create_draft(start_date, end_date, json.dumps(options), json.dumps(exam_rows),
+                                      json.dumps(summary, default=str, ensure_ascii=False), base_version_id)
+    result['placements'] = proposed_rows
+
+    return result
+
+
+def get_draft_summary(draft_id):
+    """
+    Taslağın sonucunu (istatistik ve fark dahil) getirir.
+
+    Döndürür:
+        summary: run_dry_run sonucu (yerleşimler ve profil hariç) veya None
+    """
+    draft = get_draft_by_id(draft_id)
+    if draft is None:
+        return None
+
+    summary = json.loads(draft['summary'] or '{}')
+    summary['draft_id'] = draft['id']
+    summary['start_date'] = draft['start_date']
+    summary['end_date'] = draft['end_date']
+    summary['created_at'] = draft['created_at']
+    summary['published_at'] = draft['published_at']
+    # Fark hesaplandıktan sonra yayındaki program değişti mi?
+    summary['outdated'] = draft['base_version_id'] != get_published_version_id()
+    return summary
+
+
+def find_missing_references(cursor, exam_rows):
+    """
+    Taslak satırlarında artık veritabanında olmayan ders, derslik ve gözetmenleri bulur.
+
+    Döndürür:
+        missing: {'courses': [...], 'classrooms': [...], 'supervisors': [...]} (eksik ID'ler)
+    """
+    tables = (('courses', 'courses', 0), ('classrooms', 'classrooms', 1), ('supervisors', 'instructors', 2))
+
+    missing = {}
+    for name, table, index in tables:
+        cursor.execute(f"SELECT id FROM {table}")
+        existing_ids = set(row[0] for row in cursor.fetchall())
+        used_ids = set(row[index] for row in exam_rows if row[index] is not None)
+        missing[name] = sorted(used_ids - existing_ids)
+
+    return missing
+
+
+def publish_draft(draft_id, force=False):
+    """
+    Taslak programı yeniden hesaplamadan yayınlar.
+    Kontroller, eski programın değiştirilmesi ve taslağın yayınlandı
+    işaretlenmesi tek işlemde yapılır.
+
+    Parametreler:
+        draft_id: Taslak ID'si
+        force: True ise taslak hesaplandıktan sonra yayındaki program
+               değişmiş olsa da yayınlanır (yönetici onayı)
+
+    Döndürür:
+        saved_count: Yazılan exam_schedule satırı sayısı
+
+    Hata:
+        ValueError: Taslak bulunamazsa, yayındaki program taslaktan sonra
+                    değiştiyse (force olmadan) veya taslaktaki ders, derslik
+                    ya da gözetmen silinmişse
+    """
+    draft = get_draft_by_id(draft_id)
+    if draft is None:
+        raise ValueError(f"Taslak bulunamadı: {draft_id}")
+
+    exam_rows = [tuple(row) for row in json.loads(draft['exam_rows'])]
+
+    def check_and_mark(cursor):
+        cursor.execute("SELECT version_id FROM published_schedule WHERE id = 1")
+        row = cursor.fetchone()
+        published_version_id = row[0] if row else None
+        if not force and published_version_id != draft['base_version_id']:
+            raise ValueError("Taslak hesaplandıktan sonra yayındaki program değişti; "
+                             "fark güncel değil. Yine de yayınlamak için onaylayın.")
+
+        missing = find_missing_references(cursor, exam_rows)
+        if any(missing.values()):
+            details = ', '.join(f"{name}: {ids}" for name, ids in missing.items() if ids)
+            raise ValueError(f"Taslaktaki kayıtlar silinmiş ({details}); taslak yayınlanamaz.")
+
+        mark_draft_published(draft_id, cursor)
+
+    return replace_all_exams(exam_rows, (draft['start_date'], draft['end_date']), check_and_mark)
@@ -26,6 +26,36 @@ SINAV_BITIS_SAATI = 18      # 18:00
 # Sınav süreleri (dakika cinsinden)
 SINAV_SURELERI = [30, 45, 60, 90, 120]
 
+# Sınav saat ızgarası (bkz. app/slot_grid.py)
+#   'gun_basi' / 'gun_sonu': Sınavların en erken başlangıcı / en geç bitişi
+#   'slotlar': Varsayılan gün şablonu [(başlangıç, bitiş), ...]
+#   'gunler': Gün adına göre farklı şablon, ör. {'Cuma': [('09:00', '10:30'), ('14:00', '15:30')]}
+#   'dakika_adimi': Verilirse şablon yerine gün başından itibaren her N dakikada bir slot
+#   'molalar': Sınavın denk gelemeyeceği aralıklar, ör. [('12:30', '13:30')]
+SINAV_SLOT_IZGARASI = {
+    'gun_basi': '%02d:00' % SINAV_BASLANGIC_SAATI,
+    'gun_sonu': '%02d:00' % SINAV_BITIS_SAATI,
+    'slotlar': [('09:00', '10:30'), ('11:00', '12:30'), ('13:30', '15:00'), ('15:30', '17:00')],
+    'gunler': {},
+    'dakika_adimi': None,
+    'molalar': []
+}
+
+# Hocanın haftalık ders saatleri sınav planlamasında meşgul sayılsın mı?
+# (courses.day_of_week, class_start_time, class_end_time)
+SINAV_DERS_SAATLERI_MESGUL = True
+
+# Bir öğrencinin bir günde en fazla kaç sınavı olabilir? (None: sınırsız)
+SINAV_OGRENCI_GUNLUK_EN_FAZLA = None
+
+# Bir öğrencinin aynı gündeki iki sınavı arasında en az kaç dakika olmalı?
+# (0: sadece çakışma yasak)
+SINAV_OGRENCI_EN_AZ_ARA = 0
+
+# Sınavlar günlere ve slotlara yüke göre dağıtılsın mı?
+# (False: günler takvim sırasıyla doldurulur)
+SINAV_GUN_DENGELEME = True
+
 # Sınav günleri (Pazartesi=0, Salı=1, ... Cuma=4)
 SINAV_GUNLERI = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma']
 
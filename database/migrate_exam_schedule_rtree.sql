@@ -0,0 +1,16 @@
+-- ==============================================
+-- MİGRASYON: Doluluk R*Tree Aynası
+-- ==============================================
+-- exam_schedule_rtree tablosu ve tetikleyicileri
+-- schema.sql ile oluşturulur; tetikleyiciler sadece
+-- yeni yazılan satırları aynalar. init_database bu
+-- dosyayı tablo ilk oluşturulduğunda çalıştırır ve
+-- mevcut sınavları ağaca ekler.
+-- ==============================================
+
+INSERT INTO exam_schedule_rtree
+SELECT id, version_id, version_id, classroom_id, classroom_id,
+       COALESCE(supervisor_id, 0), COALESCE(supervisor_id, 0),
+       date_ord * 1440 + start_min, date_ord * 1440 + end_min
+FROM exam_schedule_versions
+WHERE date_ord IS NOT NULL;
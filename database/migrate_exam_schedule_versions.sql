@@ -0,0 +1,29 @@
+-- ==============================================
+-- MİGRASYON: Sürümlü Sınav Programı
+-- ==============================================
+-- Eski veritabanlarında exam_schedule bir tabloydu.
+-- init_database bu tabloyu exam_schedule_legacy
+-- adıyla saklar, schema.sql'i çalıştırır ve bu
+-- dosyayı çalıştırır: eski sınavlar ilk sürüm
+-- olarak kopyalanır ve yayınlanır.
+-- ==============================================
+
+-- İlk sürüm
+INSERT INTO schedule_versions (status, published_at) VALUES ('hazır', CURRENT_TIMESTAMP);
+
+-- Eski sınavları ilk sürüme kopyala (ID'ler korunur)
+INSERT INTO exam_schedule_versions
+    (id, version_id, course_id, classroom_id, supervisor_id, exam_date, start_time, end_time, status, created_at,
+     date_ord, start_min, end_min)
+SELECT id, (SELECT MAX(id) FROM schedule_versions), course_id, classroom_id, supervisor_id,
+       exam_date, start_time, end_time, status, created_at,
+       CAST(julianday(exam_date) - 1721424.5 AS INTEGER),
+       CAST(substr(start_time, 1, 2) AS INTEGER) * 60 + CAST(substr(start_time, 4, 2) AS INTEGER),
+       CAST(substr(end_time, 1, 2) AS INTEGER) * 60 + CAST(substr(end_time, 4, 2) AS INTEGER)
+FROM exam_schedule_legacy;
+
+-- İlk sürümü yayınla
+UPDATE published_schedule SET version_id = (SELECT MAX(id) FROM schedule_versions) WHERE id = 1;
+
+-- Eski tabloyu kaldır
+DROP TABLE exam_schedule_legacy;
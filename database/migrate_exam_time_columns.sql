@@ -0,0 +1,29 @@
+-- ==============================================
+-- MİGRASYON: Tam Sayı Tarih ve Saat Sütunları
+-- ==============================================
+-- Çakışma sorguları 'HH:MM' metinlerini üç OR'lu
+-- karşılaştırmayla tarıyordu; indeks kullanılamıyordu.
+-- exam_schedule_versions tablosuna tam sayı kopyalar
+-- eklenir ve mevcut satırlar doldurulur:
+--    date_ord:  date.toordinal() ile aynı gün sırası
+--    start_min: Başlangıç (gün başından dakika)
+--    end_min:   Bitiş (gün başından dakika)
+-- init_database bu dosyayı schema.sql'den ÖNCE
+-- çalıştırır (yeni indeksler bu sütunları kullanır).
+-- ==============================================
+
+ALTER TABLE exam_schedule_versions ADD COLUMN date_ord INTEGER;
+ALTER TABLE exam_schedule_versions ADD COLUMN start_min INTEGER;
+ALTER TABLE exam_schedule_versions ADD COLUMN end_min INTEGER;
+
+-- Mevcut sınavları doldur (julianday 0001-01-01 için 1721425.5 verir)
+UPDATE exam_schedule_versions
+SET date_ord = CAST(julianday(exam_date) - 1721424.5 AS INTEGER),
+    start_min = CAST(substr(start_time, 1, 2) AS INTEGER) * 60 + CAST(substr(start_time, 4, 2) AS INTEGER),
+    end_min = CAST(substr(end_time, 1, 2) AS INTEGER) * 60 + CAST(substr(end_time, 4, 2) AS INTEGER);
+
+-- Yeni indeksin ön eki olan eski indeks
+DROP INDEX IF EXISTS idx_exam_schedule_versions_classroom;
+
+-- Görünüm yeni sütunlarla schema.sql'de yeniden oluşturulur
+DROP VIEW IF EXISTS exam_schedule;
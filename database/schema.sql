@@ -136,9 +136,26 @@ CREATE TABLE IF NOT EXISTS instructor_availability (
 -- ==============================================
 -- Planlanan sınavları tutar.
 -- Hangi ders, hangi gün, saat ve derslikte yapılacak.
--- ==============================================
-CREATE TABLE IF NOT EXISTS exam_schedule (
+--
+-- Sınavlar sürümlü tutulur: her planlama yeni bir
+-- sürüme (schedule_versions) yazar, sayfalar bu
+-- sırada yayındaki sürümü okumaya devam eder.
+-- Yayınlama ve geri alma sadece published_schedule
+-- tablosundaki işaretçiyi değiştirir.
+-- exam_schedule yayındaki sürümün görünümüdür (VIEW).
+-- ==============================================
+CREATE TABLE IF NOT EXISTS schedule_versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'hazırlanıyor', -- hazırlanıyor, hazır
+    start_date TEXT,                        -- Planlandığı sınav dönemi başlangıcı
+    end_date TEXT,                          -- Planlandığı sınav dönemi bitişi
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    published_at TEXT                       -- Son yayınlanma zamanı
+);
+
+CREATE TABLE IF NOT EXISTS exam_schedule_versions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    version_id INTEGER NOT NULL,            -- Hangi sürüm?
     course_id INTEGER NOT NULL,             -- Hangi dersin sınavı?
     classroom_id INTEGER NOT NULL,          -- Hangi derslikte?
     supervisor_id INTEGER,                  -- Gözetmen (sınıf sorumlusu)
@@ -147,11 +164,73 @@ CREATE TABLE IF NOT EXISTS exam_schedule (
     end_time TEXT NOT NULL,                 -- Bitiş saati (10:30 gibi)
     status TEXT DEFAULT 'planlandı',        -- Durum: planlandı, onaylandı, iptal
     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    -- Çakışma sorguları için tam sayı kopyalar (yazarken doldurulur)
+    date_ord INTEGER,                       -- Tarihin gün sırası (date.toordinal())
+    start_min INTEGER,                      -- Başlangıç, gün başından dakika (09:00 -> 540)
+    end_min INTEGER,                        -- Bitiş, gün başından dakika
+    FOREIGN KEY (version_id) REFERENCES schedule_versions(id),
     FOREIGN KEY (course_id) REFERENCES courses(id),
     FOREIGN KEY (classroom_id) REFERENCES classrooms(id),
     FOREIGN KEY (supervisor_id) REFERENCES instructors(id)
 );
 
+-- Tek satırlık işaretçi: yayındaki ve bir önceki sürüm
+CREATE TABLE IF NOT EXISTS published_schedule (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version_id INTEGER,                     -- Yayındaki sürüm
+    previous_version_id INTEGER             -- Geri alınınca dönülecek sürüm
+);
+
+INSERT OR IGNORE INTO published_schedule (id, version_id, previous_version_id) VALUES (1, NULL, NULL);
+
+CREATE VIEW IF NOT EXISTS exam_schedule AS
+    SELECT id, course_id, classroom_id, supervisor_id, exam_date, start_time, end_time, status, created_at,
+           date_ord, start_min, end_min
+    FROM exam_schedule_versions
+    WHERE version_id = (SELECT version_id FROM published_schedule WHERE id = 1);
+
+-- Doluluk için R*Tree aynası: her sınav satırı (sürüm, derslik,
+-- gözetmen, zaman aralığı) kutusu olarak tutulur. Zaman
+-- date_ord * 1440 + dakika'dır (günler arası tek eksen).
+-- "Şu saatte hangi derslikler boş?" gibi çakışma sorguları
+-- tarih indeksini taramak yerine ağaçta arama yapar.
+-- Tablo tetikleyicilerle exam_schedule_versions ile aynı tutulur.
+CREATE VIRTUAL TABLE IF NOT EXISTS exam_schedule_rtree USING rtree_i32(
+    id,                                     -- exam_schedule_versions.id
+    version_min, version_max,               -- Sürüm
+    classroom_min, classroom_max,           -- Derslik
+    supervisor_min, supervisor_max,         -- Gözetmen (yoksa 0)
+    start_at, end_at                        -- date_ord * 1440 + start_min / end_min
+);
+
+CREATE TRIGGER IF NOT EXISTS exam_schedule_rtree_insert
+AFTER INSERT ON exam_schedule_versions
+WHEN NEW.date_ord IS NOT NULL
+BEGIN
+    INSERT INTO exam_schedule_rtree VALUES (
+        NEW.id, NEW.version_id, NEW.version_id, NEW.classroom_id, NEW.classroom_id,
+        COALESCE(NEW.supervisor_id, 0), COALESCE(NEW.supervisor_id, 0),
+        NEW.date_ord * 1440 + NEW.start_min, NEW.date_ord * 1440 + NEW.end_min
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS exam_schedule_rtree_update
+AFTER UPDATE ON exam_schedule_versions
+BEGIN
+    DELETE FROM exam_schedule_rtree WHERE id = OLD.id;
+    INSERT INTO exam_schedule_rtree
+    SELECT NEW.id, NEW.version_id, NEW.version_id, NEW.classroom_id, NEW.classroom_id,
+           COALESCE(NEW.supervisor_id, 0), COALESCE(NEW.supervisor_id, 0),
+           NEW.date_ord * 1440 + NEW.start_min, NEW.date_ord * 1440 + NEW.end_min
+    WHERE NEW.date_ord IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS exam_schedule_rtree_delete
+AFTER DELETE ON exam_schedule_versions
+BEGIN
+    DELETE FROM exam_schedule_rtree WHERE id = OLD.id;
+END;
+
 -- ==============================================
 -- TABLO 9: ÖĞRENCİLER (students)
 -- ==============================================
@@ -197,8 +276,12 @@ CREATE TABLE IF NOT EXISTS student_courses (
 CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
 CREATE INDEX IF NOT EXISTS idx_courses_department ON courses(department_id);
 CREATE INDEX IF NOT EXISTS idx_courses_instructor ON courses(instructor_id);
-CREATE INDEX IF NOT EXISTS idx_exam_schedule_date ON exam_schedule(exam_date);
-CREATE INDEX IF NOT EXISTS idx_exam_schedule_classroom ON exam_schedule(classroom_id);
+CREATE INDEX IF NOT EXISTS idx_exam_schedule_versions_date ON exam_schedule_versions(version_id, exam_date);
+-- Çakışma sorguları: aynı gün, start_min < bitiş AND end_min > başlangıç
+CREATE INDEX IF NOT EXISTS idx_exam_schedule_versions_classroom_time ON exam_schedule_versions(version_id, classroom_id, date_ord, start_min);
+CREATE INDEX IF NOT EXISTS idx_exam_schedule_versions_supervisor_time ON exam_schedule_versions(version_id, supervisor_id, date_ord, start_min);
+CREATE INDEX IF NOT EXISTS idx_exam_schedule_versions_time ON exam_schedule_versions(version_id, date_ord, start_min);
+CREATE INDEX IF NOT EXISTS idx_exam_schedule_versions_course ON exam_schedule_versions(version_id, course_id);
 CREATE INDEX IF NOT EXISTS idx_student_courses_student ON student_courses(student_id);
 CREATE INDEX IF NOT EXISTS idx_student_courses_course ON student_courses(course_id);
 
@@ -220,3 +303,100 @@ CREATE TABLE IF NOT EXISTS classroom_proximity (
 
 CREATE INDEX IF NOT EXISTS idx_proximity_classroom ON classroom_proximity(classroom_id);
 
+
+-- ==============================================
+-- TABLO 12: VERİ SÜRÜMLERİ (data_versions)
+-- ==============================================
+-- Derlenmiş önbelleklerin (ör. hoca müsaitlik
+-- maskeleri) ne zaman yeniden hesaplanacağını
+-- belirler. Tetikleyiciler ilgili tablolar
+-- değiştiğinde sürümü bir artırır.
+-- ==============================================
+CREATE TABLE IF NOT EXISTS data_versions (
+    name TEXT PRIMARY KEY,                -- Önbellek adı
+    version INTEGER NOT NULL DEFAULT 0    -- Değişiklik sayacı
+);
+
+INSERT OR IGNORE INTO data_versions (name, version) VALUES ('availability', 0);
+
+-- Müsaitlik kayıtları değişti
+CREATE TRIGGER IF NOT EXISTS trg_availability_insert AFTER INSERT ON instructor_availability
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'availability';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_availability_update AFTER UPDATE ON instructor_availability
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'availability';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_availability_delete AFTER DELETE ON instructor_availability
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'availability';
+END;
+
+-- Dersin hocası veya ders saati değişti (ders saatleri meşgul sayılır)
+CREATE TRIGGER IF NOT EXISTS trg_course_class_time_insert AFTER INSERT ON courses
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'availability';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_course_class_time_update
+AFTER UPDATE OF instructor_id, day_of_week, class_start_time, class_end_time ON courses
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'availability';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_course_class_time_delete AFTER DELETE ON courses
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE name = 'availability';
+END;
+
+-- ==============================================
+-- TABLO 13: PLANLAMA İŞLERİ (generation_jobs)
+-- ==============================================
+-- Otomatik planlama arka planda çalışır.
+-- Her çalıştırmanın durumu ve ilerlemesi burada
+-- tutulur; planlama sayfası bu tabloyu sorgular.
+-- Aynı anda sadece bir iş çalışabilir.
+-- ==============================================
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'bekliyor', -- bekliyor, çalışıyor, tamamlandı, hata
+    start_date TEXT NOT NULL,               -- Sınav dönemi başlangıcı
+    end_date TEXT NOT NULL,                 -- Sınav dönemi bitişi
+    options TEXT,                           -- Planlama seçenekleri (JSON)
+    processed_count INTEGER DEFAULT 0,      -- İşlenen ders sayısı
+    placed_count INTEGER DEFAULT 0,         -- Yerleşen ders sayısı
+    total_courses INTEGER DEFAULT 0,        -- Toplam ders sayısı
+    failed_count INTEGER DEFAULT 0,         -- Yerleşemeyen ders sayısı
+    message TEXT,                           -- Hata veya bilgi mesajı
+    result TEXT,                            -- Sonuç (JSON)
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    started_at TEXT,
+    updated_at TEXT,                        -- Son ilerleme zamanı
+    heartbeat_at TEXT,                      -- Çalışan işin son canlılık sinyali
+    finished_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_status ON generation_jobs(status);
+
+-- ==============================================
+-- TABLO 14: TASLAK PROGRAMLAR (schedule_drafts)
+-- ==============================================
+-- Deneme (dry-run) planlaması exam_schedule'a
+-- dokunmaz; hesaplanan program burada saklanır.
+-- Yönetici farkı inceledikten sonra taslağı
+-- yeniden hesaplamadan yayınlayabilir.
+-- ==============================================
+CREATE TABLE IF NOT EXISTS schedule_drafts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    start_date TEXT NOT NULL,               -- Sınav dönemi başlangıcı
+    end_date TEXT NOT NULL,                 -- Sınav dönemi bitişi
+    options TEXT,                           -- Planlama seçenekleri (JSON)
+    exam_rows TEXT NOT NULL,                -- exam_schedule satırları (JSON)
+    summary TEXT,                           -- Sonuç, istatistik ve fark (JSON)
+    base_version_id INTEGER,                -- Hesaplanırken yayında olan sürüm
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    published_at TEXT                       -- Yayınlandıysa zamanı
+);
@@ -56,6 +56,12 @@ def clean_database():
     """
     Mevcut veritabanındaki tüm verileri temizler.
     Tablolar korunur, sadece veriler silinir.
+    
+    Sınav programı sürümlü tutulduğu için (exam_schedule bir
+    görünümdür) bütün sürümler ve taslaklar da silinir, yayın
+    işaretçisi sıfırlanır. Aksi halde eski sürümler yeniden
+    numaralanan ders ve dersliklere işaret ederdi.
+    Hata olursa hiçbir tablo silinmez ve hata yükseltilir.
     """
     print("🗑️  Mevcut veriler temizleniyor...")
     
@@ -64,7 +70,9 @@ def clean_database():
     
     # Sırayla tabloları temizle (foreign key sırası önemli)
     tables = [
-        'exam_schedule',      # Sınav programı
+        'exam_schedule_versions',  # Sınav programı (bütün sürümler)
+        'schedule_versions',  # Program sürümleri
+        'schedule_drafts',    # Taslak programlar
         'classroom_proximity', # Derslik yakınlık
         'student_courses',    # Öğrenci-ders ilişkisi
         'instructor_availability',  # Hoca müsaitlik
@@ -76,21 +84,24 @@ def clean_database():
         'faculties',          # Fakülteler
     ]
     
-    for table in tables:
-        try:
+    try:
+        for table in tables:
             cursor.execute(f"DELETE FROM {table}")
             print(f"   ✓ {table} tablosu temizlendi")
-        except Exception as e:
-            pass  # Tablo yoksa sessizce geç
-    
-    # Auto-increment sıfırla
-    try:
+        
+        # Yayında ve geri alınacak sürüm kalmadı
+        cursor.execute("UPDATE published_schedule SET version_id = NULL, previous_version_id = NULL WHERE id = 1")
+        
+        # Auto-increment sıfırla
         cursor.execute("DELETE FROM sqlite_sequence")
-    except:
-        pass  # sqlite_sequence yoksa sessizce geç
+        
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
     
-    conn.commit()
-    conn.close()
     print("✅ Tüm veriler temizlendi!\n")
 
 
@@ -42,6 +42,10 @@ class ExamAppTest(unittest.TestCase):
         importlib.reload(course_model)
         cls.course_model = course_model
 
+        import app.models.instructor as instructor_model
+        importlib.reload(instructor_model)
+        cls.instructor_model = instructor_model
+
         import app.models.exam as exam_model
         importlib.reload(exam_model)
         cls.exam_model = exam_model
@@ -54,10 +58,30 @@ class ExamAppTest(unittest.TestCase):
         importlib.reload(availability_model)
         cls.availability_model = availability_model
 
+        import app.conflict_graph as conflict_graph
+        importlib.reload(conflict_graph)
+        cls.conflict_graph = conflict_graph
+
         import app.scheduler as scheduler
         importlib.reload(scheduler)
         cls.scheduler = scheduler
 
+        import app.rescheduling as rescheduling
+        importlib.reload(rescheduling)
+        cls.rescheduling = rescheduling
+
+        import app.models.job as job_model
+        importlib.reload(job_model)
+        cls.job_model = job_model
+
+        import app.jobs as jobs
+        importlib.reload(jobs)
+        cls.jobs = jobs
+
+        import app.what_if as what_if
+        importlib.reload(what_if)
+        cls.what_if = what_if
+
     @classmethod
     def tearDownClass(cls):
         """Test veritabanını temizler."""
@@ -196,6 +220,1088 @@ class ExamAppTest(unittest.TestCase):
                             "Aynı hocada çakışan sınavlar var."
                         )
 
+    def test_memory_index_matches_sql_schedule(self):
+        """Bellek içi planlamanın SQL kontrollü planlamayla aynı sonucu verdiğini kontrol eder."""
+        start_date = '2025-01-06'
+        end_date = '2025-01-17'
+
+        for supervisor_matching in (False, True):
+            self.scheduler.generate_exam_schedule(start_date, end_date, use_memory_index=False,
+                                                  supervisor_matching=supervisor_matching)
+            sql_exams = self._exam_rows()
+
+            self.scheduler.generate_exam_schedule(start_date, end_date, supervisor_matching=supervisor_matching)
+            memory_exams = self._exam_rows()
+
+            self.assertGreater(len(memory_exams), 0, "Hiç sınav planlanmadı.")
+            self.assertEqual(
+                sql_exams,
+                memory_exams,
+                "Bellek içi planlama farklı bir program üretti."
+            )
+
+    def test_conflict_graph_matches_enrollments(self):
+        """Çakışma grafındaki ortak öğrenci sayılarının SQL ile aynı olduğunu kontrol eder."""
+        graph = self.conflict_graph.build_conflict_graph()
+        rows = self.database.execute_query("""
+            SELECT sc1.course_id as course_a, sc2.course_id as course_b,
+                   COUNT(DISTINCT sc1.student_id) as shared
+            FROM student_courses sc1
+            INNER JOIN student_courses sc2 ON sc1.student_id = sc2.student_id
+            WHERE sc1.course_id < sc2.course_id
+            GROUP BY sc1.course_id, sc2.course_id
+        """)
+
+        for row in rows:
+            self.assertEqual(
+                graph[row['course_a']][row['course_b']],
+                row['shared'],
+                "Ortak öğrenci sayısı hatalı."
+            )
+        self.assertEqual(
+            sum(len(neighbors) for neighbors in graph.values()) // 2,
+            len(rows),
+            "Çakışan ders çifti sayısı hatalı."
+        )
+
+    def test_schedule_has_no_student_clashes(self):
+        """Planlanan programda öğrenci çakışması olmadığını kontrol eder."""
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+
+        graph = self.conflict_graph.build_conflict_graph()
+        exams = self.exam_model.get_all_exams()
+        clashes = self.conflict_graph.find_student_clashes(graph, exams)
+
+        self.assertEqual(clashes, [], "Öğrenci çakışması olan sınavlar var.")
+
+    def test_dsatur_ordering_places_all_courses(self):
+        """DSATUR sıralamasıyla tüm derslerin çakışmasız yerleştiğini kontrol eder."""
+        result = self.scheduler.generate_exam_schedule(
+            '2025-01-06', '2025-01-17', ordering='dsatur'
+        )
+        courses = self.course_model.get_courses_with_exam()
+
+        self.assertEqual(result['failed_count'], 0, "Planlanamayan dersler var.")
+        self.assertEqual(result['placed_count'], len(courses))
+
+        graph = self.conflict_graph.build_conflict_graph()
+        clashes = self.conflict_graph.find_student_clashes(graph, self.exam_model.get_all_exams())
+        self.assertEqual(clashes, [], "Öğrenci çakışması olan sınavlar var.")
+
+    def test_local_search_never_worsens_schedule(self):
+        """Yerel aramanın yerleşen ders sayısını azaltmadığını kontrol eder."""
+        result = self.scheduler.generate_exam_schedule(
+            '2025-01-06', '2025-01-08', improve=True
+        )
+        report = result['local_search']
+
+        self.assertLessEqual(
+            report['after']['failed_count'],
+            report['before']['failed_count'],
+            "Yerel arama sonucu kötüleştirdi."
+        )
+        self.assertEqual(result['failed_count'], report['after']['failed_count'])
+
+        exams = self.exam_model.get_all_exams()
+        self.assertEqual(
+            len(set(exam['course_id'] for exam in exams)),
+            result['placed_count'],
+            "Kaydedilen sınav sayısı rapordakiyle uyuşmuyor."
+        )
+        graph = self.conflict_graph.build_conflict_graph()
+        self.assertEqual(self.conflict_graph.find_student_clashes(graph, exams), [])
+
+    def test_multistart_keeps_best_attempt(self):
+        """Paralel çoklu denemenin en iyi sonucu çakışmasız kaydettiğini kontrol eder."""
+        single = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-08')
+        result = self.scheduler.generate_exam_schedule(
+            '2025-01-06', '2025-01-08', attempts=3, workers=2
+        )
+
+        self.assertEqual(result['attempts'], 3)
+        self.assertEqual(len(result['attempt_summary']), 3)
+        self.assertLessEqual(result['failed_count'], single['failed_count'])
+
+        exams = self.exam_model.get_all_exams()
+        self.assertEqual(len(set(exam['course_id'] for exam in exams)), result['placed_count'])
+        graph = self.conflict_graph.build_conflict_graph()
+        self.assertEqual(self.conflict_graph.find_student_clashes(graph, exams), [])
+        self.assertIn('supervisor_assignment', result)
+
+    def test_multistart_forwards_supervisor_matching_and_cancel(self):
+        """Çoklu denemenin gözetmen ayarını ve iptal sinyalini her denemeye aktardığını kontrol eder."""
+        import threading
+
+        result = self.scheduler.generate_exam_schedule(
+            '2025-01-06', '2025-01-08', attempts=2, workers=1, supervisor_matching=False
+        )
+        self.assertNotIn('supervisor_assignment', result)
+
+        # İptal edilmiş planlamada ilk deneme de ilk dersten önce durur
+        for workers in (1, 2):
+            cancel_event = threading.Event()
+            cancel_event.set()
+            result = self.scheduler.generate_exam_schedule(
+                '2025-01-06', '2025-01-17', attempts=3, workers=workers, cancel_event=cancel_event
+            )
+            self.assertFalse(result['completed'])
+            self.assertEqual(result['stop_reason'], 'iptal edildi')
+            self.assertEqual(result['placed_count'], 0)
+
+    def test_incremental_reschedule_moves_only_affected_exams(self):
+        """Kapatılan derslikteki sınavların taşındığını, diğerlerinin yerinde kaldığını kontrol eder."""
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        old_exams = self._exam_rows()
+
+        classroom_id = old_exams[0][1]
+        affected = set(row[0] for row in old_exams if row[1] == classroom_id)
+        self.database.execute_update(
+            "UPDATE classrooms SET is_available = 0 WHERE id = ?", (classroom_id,)
+        )
+        try:
+            result = self.rescheduling.reschedule_incrementally(verbose=False)
+        finally:
+            self.database.execute_update(
+                "UPDATE classrooms SET is_available = 1 WHERE id = ?", (classroom_id,)
+            )
+
+        new_exams = self._exam_rows()
+        self.assertEqual(len(result['invalidated']), len(affected))
+        self.assertEqual(result['failed_count'], 0)
+        self.assertNotIn(classroom_id, [row[1] for row in new_exams])
+        self.assertEqual(
+            [row for row in old_exams if row[0] not in affected],
+            [row for row in new_exams if row[0] not in affected],
+            "Etkilenmeyen sınavlar yer değiştirdi."
+        )
+        graph = self.conflict_graph.build_conflict_graph()
+        self.assertEqual(
+            self.conflict_graph.find_student_clashes(graph, self.exam_model.get_all_exams()), []
+        )
+
+    def test_incremental_reschedule_accepts_fresh_schedule(self):
+        """Planlamanın hemen ardından artımlı planlamanın hiçbir sınavı geçersiz saymadığını kontrol eder."""
+        import tempfile
+        from app.synthetic_data import generate_university
+
+        # Yakınlık birleştirmesi ve laboratuvar dersleri olan sentetik veri
+        database_path = os.path.join(tempfile.mkdtemp(), 'synthetic.db')
+        generate_university(database_path, seed=7, admin_password=None, scale=2)
+
+        old_path = self.database.DATABASE_PATH
+        self.database.DATABASE_PATH = database_path
+        try:
+            for use_memory_index in (True, False):
+                self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17',
+                                                      use_memory_index=use_memory_index)
+                result = self.rescheduling.reschedule_incrementally(verbose=False)
+                self.assertEqual(result['invalidated'], [])
+                self.assertFalse(result['changed'])
+        finally:
+            self.database.DATABASE_PATH = old_path
+            os.remove(database_path)
+
+    def test_schedule_version_keeps_generation_period(self):
+        """Yayındaki sürümün planlandığı dönemi sakladığını ve artımlı değişikliklerde koruduğunu kontrol eder."""
+        for use_memory_index in (True, False):
+            self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17', use_memory_index=use_memory_index)
+            self.assertEqual(self.exam_model.get_published_period(), ('2025-01-06', '2025-01-17'))
+
+        course_id = self._exam_rows()[0][0]
+        self.exam_model.replace_course_exams([course_id], [])
+        self.assertEqual(self.exam_model.get_published_period(), ('2025-01-06', '2025-01-17'))
+
+        self.exam_model.delete_all_exams()
+        self.assertIsNone(self.exam_model.get_published_period())
+
+    def test_incremental_reschedule_skips_unchanged_schedule(self):
+        """Değişiklik yoksa yeni sürüm yayınlanmadığını, yerleşmemiş derslerin sadece istenirse denendiğini kontrol eder."""
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        course_id = self._exam_rows()[0][0]
+        self.exam_model.replace_course_exams([course_id], [])
+
+        published = self.database.execute_query("SELECT * FROM published_schedule WHERE id = 1")[0]
+        result = self.rescheduling.reschedule_incrementally(verbose=False)
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['placed_courses'], [])
+        self.assertEqual(
+            dict(self.database.execute_query("SELECT * FROM published_schedule WHERE id = 1")[0]),
+            dict(published),
+            "Değişiklik olmadan yeni sürüm yayınlandı."
+        )
+        self.assertNotIn(course_id, [row[0] for row in self._exam_rows()])
+
+        result = self.rescheduling.reschedule_incrementally(verbose=False, retry_unplaced=True)
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['replaced_count'], 1)
+        self.assertIn(course_id, [row[0] for row in self._exam_rows()])
+
+    def test_scoped_reschedule_runs_as_job(self):
+        """Düzenleme sonrası yeniden planlamanın sadece kapsamdaki sınavları doğruladığını ve işle çalıştığını kontrol eder."""
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        old_exams = self._exam_rows()
+
+        classroom_id = old_exams[0][1]
+        affected = set(row[0] for row in old_exams if row[1] == classroom_id)
+        other_course_id = next(row[0] for row in old_exams if row[0] not in affected)
+        self.database.execute_update(
+            "UPDATE classrooms SET is_available = 0 WHERE id = ?", (classroom_id,)
+        )
+        try:
+            # Kapsam dışındaki kapatılmış derslik dokunulmadan kalır
+            job, created = self.jobs.start_reschedule_job({'course_ids': [other_course_id]})
+            self.assertTrue(created)
+            job = self.jobs.wait_for_job(job['id'], timeout=60)
+            self.assertEqual(job['status'], self.job_model.JOB_DONE, job['message'])
+            self.assertEqual(job['total_courses'], 0)
+            self.assertEqual(self._exam_rows(), old_exams)
+
+            # Çalışan bir planlama varken iş başlatılmaz
+            running_id, _ = self.job_model.create_job_if_idle('2025-01-06', '2025-01-17', '{}')
+            self.job_model.mark_job_running(running_id)
+            try:
+                other, created = self.jobs.start_reschedule_job({'classroom_ids': [classroom_id]})
+                self.assertFalse(created)
+                self.assertEqual(other['id'], running_id)
+            finally:
+                self.job_model.fail_job(running_id, 'test')
+
+            job, created = self.jobs.start_reschedule_job({'classroom_ids': [classroom_id]})
+            self.assertTrue(created)
+            job = self.jobs.wait_for_job(job['id'], timeout=60)
+        finally:
+            self.database.execute_update(
+                "UPDATE classrooms SET is_available = 1 WHERE id = ?", (classroom_id,)
+            )
+
+        self.assertEqual(job['status'], self.job_model.JOB_DONE, job['message'])
+        self.assertEqual(job['total_courses'], len(affected))
+        new_exams = self._exam_rows()
+        self.assertNotIn(classroom_id, [row[1] for row in new_exams])
+        self.assertEqual(
+            [row for row in old_exams if row[0] not in affected],
+            [row for row in new_exams if row[0] not in affected]
+        )
+
+    def test_supervisor_matching_balances_load(self):
+        """Gözetmen eşleştirmesinin iki planlama yolunda da çakışmasız ve daha dengeli atama yaptığını kontrol eder."""
+        start_date = '2025-01-06'
+        end_date = '2025-01-17'
+
+        for use_memory_index in (True, False):
+            with self.subTest(use_memory_index=use_memory_index):
+                self.scheduler.generate_exam_schedule(start_date, end_date, use_memory_index=use_memory_index,
+                                                      supervisor_matching=False)
+                greedy_load = self._supervisor_load()
+
+                result = self.scheduler.generate_exam_schedule(start_date, end_date,
+                                                               use_memory_index=use_memory_index)
+                matched_load = self._supervisor_load()
+
+                self.assertEqual(result['supervisor_assignment']['unmatched'], 0)
+                self.assertLessEqual(max(matched_load.values()), max(greedy_load.values()))
+                self._assert_supervisors_do_not_clash()
+
+    def test_supervisor_matching_reports_unsupervised_exams(self):
+        """Gözetmen yetmediğinde çakışan sınavlara aynı hocanın verilmediğini ve açığın raporlandığını kontrol eder."""
+        from app.supervisors import assign_supervisors
+
+        state, _ = self.scheduler.compute_schedule_in_memory('2025-01-06', '2025-01-17', verbose=False,
+                                                             supervisor_matching=False)
+        # Sadece iki hoca gözetmen olabilir
+        state['snapshot']['instructor_ids'] = state['snapshot']['instructor_ids'][:2]
+        report = assign_supervisors(state)
+
+        self.assertGreater(report['unsupervised'], 0)
+        duties = {}
+        for placement in state['placements']:
+            for supervisor_id in set(placement['supervisors']):
+                if supervisor_id is None:
+                    continue
+                self.assertIn(supervisor_id, state['snapshot']['instructor_ids'])
+                for other in duties.get((placement['exam_date'], supervisor_id), []):
+                    self.assertFalse(other['start_minute'] < placement['end_minute']
+                                     and placement['start_minute'] < other['end_minute'],
+                                     "Aynı gözetmen çakışan iki sınava atandı.")
+                duties.setdefault((placement['exam_date'], supervisor_id), []).append(placement)
+
+    def _supervisor_load(self):
+        """Gözetmen başına görev sayısını döndürür."""
+        rows = self.database.execute_query(
+            "SELECT supervisor_id, COUNT(*) as duty_count FROM exam_schedule GROUP BY supervisor_id"
+        )
+        return dict((row['supervisor_id'], row['duty_count']) for row in rows)
+
+    def test_multi_room_exam_stays_in_one_building(self):
+        """Yakınlık yoksa büyük sınavın derslikleri aynı binadan seçilmeli."""
+        snapshot = self.scheduler.load_schedule_snapshot()
+        state = self.scheduler.create_run_state(snapshot)
+        classrooms = [c for c in snapshot['classrooms'] if c['has_computer'] == 0]
+        largest = max(room['capacity'] for room in classrooms)
+
+        rooms = self.scheduler.find_available_classrooms_in_memory(
+            state, classrooms, '2025-01-06', 9 * 60, 11 * 60, largest + 1
+        )
+
+        self.assertIsNotNone(rooms)
+        self.assertGreaterEqual(sum(room['capacity'] for room in rooms), largest + 1)
+        self.assertEqual(len(set(room['building'] for room in rooms)), 1,
+                         "Derslikler farklı binalardan birleştirildi.")
+
+        cumulative = snapshot['room_clusters'][rooms[0]['id']]['cumulative']
+        self.assertEqual(cumulative, sorted(cumulative))
+
+    def test_room_clusters_keep_only_matching_rooms(self):
+        """Yakınlık kümelerine farklı türden ve kapalı dersliklerin girmediğini kontrol eder."""
+        from app.room_clusters import build_room_clusters, cluster_can_fit
+
+        def room(room_id, capacity, has_computer, is_available=1):
+            return {'id': room_id, 'capacity': capacity, 'has_computer': has_computer, 'is_available': is_available}
+
+        lab = room(1, 30, 1)
+        proximity = {1: [room(2, 100, 0), room(3, 40, 1, 0), room(4, 20, 1)]}
+        clusters = build_room_clusters([lab], proximity)
+
+        self.assertEqual([nearby['id'] for nearby in clusters[1]['neighbors']], [4])
+        self.assertEqual(clusters[1]['cumulative'], [30, 50])
+        self.assertFalse(cluster_can_fit(clusters, 1, 60))
+
+    def test_availability_masks_follow_data_changes(self):
+        """Müsaitlik maskelerinin kayıt ve ders saati değişince yeniden derlendiğini kontrol eder."""
+        course = self.course_model.get_courses_with_exam()[0]
+        instructor_id = course['instructor_id']
+        check = self.availability_model.check_instructor_available
+
+        new_id = self.availability_model.create_availability(instructor_id, 'Cumartesi', '09:00', '17:00', 1)
+        try:
+            self.assertTrue(check(instructor_id, 'Cumartesi', '10:00', '12:00'))
+
+            blocked_id = self.availability_model.create_availability(
+                instructor_id, 'Cumartesi', '11:00', '11:30', 0
+            )
+            self.assertFalse(check(instructor_id, 'Cumartesi', '10:00', '12:00'))
+            self.assertTrue(check(instructor_id, 'Cumartesi', '11:30', '13:00'))
+            self.availability_model.delete_availability(blocked_id)
+
+            # Ders saati meşgul sayılır
+            self.database.execute_update(
+                "UPDATE courses SET day_of_week = 'Cumartesi', class_start_time = '14:00', "
+                "class_end_time = '15:30' WHERE id = ?", (course['id'],)
+            )
+            self.assertFalse(check(instructor_id, 'Cumartesi', '15:00', '16:00'))
+            self.assertTrue(check(instructor_id, 'Cumartesi', '10:00', '12:00'))
+        finally:
+            self.database.execute_update(
+                "UPDATE courses SET day_of_week = ?, class_start_time = ?, class_end_time = ? WHERE id = ?",
+                (course['day_of_week'], course['class_start_time'], course['class_end_time'], course['id'])
+            )
+            self.availability_model.delete_availability(new_id)
+
+    def test_replace_all_exams_is_atomic(self):
+        """Toplu yazma hata verirse eski programın korunduğunu kontrol eder."""
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        old_exams = self._exam_rows()
+
+        bad_rows = [
+            (old_exams[0][0], old_exams[0][1], None, '2025-02-03', '09:00', '10:00'),
+            (None, None, None, None, None, None)
+        ]
+        with self.assertRaises(Exception):
+            self.exam_model.replace_all_exams(bad_rows)
+
+        self.assertEqual(
+            self._exam_rows(),
+            old_exams,
+            "Hatalı yazma sonrası eski program bozuldu."
+        )
+
+    def test_generation_job_runs_in_background(self):
+        """Planlama işinin arka planda bittiğini ve ikinci işin başlamadığını kontrol eder."""
+        job, created = self.jobs.start_generation_job('2025-01-06', '2025-01-17')
+        self.assertTrue(created)
+
+        # İş sürerken yeni istek aynı işi döndürür
+        second, second_created = self.jobs.start_generation_job('2025-01-06', '2025-01-17')
+        if second['status'] in self.job_model.ACTIVE_JOB_STATUSES:
+            self.assertFalse(second_created)
+            self.assertEqual(second['id'], job['id'])
+
+        job = self.jobs.wait_for_job(job['id'], timeout=60)
+        self.assertEqual(job['status'], self.job_model.JOB_DONE, job['message'])
+        self.assertEqual(job['placed_count'], job['total_courses'])
+        self.assertEqual(job['processed_count'], job['total_courses'])
+        self.assertGreater(len(self._exam_rows()), 0)
+
+        # Çalışan iş varken yenisi oluşturulmaz
+        running_id, created = self.job_model.create_job_if_idle('2025-01-06', '2025-01-17', '{}')
+        self.assertTrue(created)
+        self.job_model.mark_job_running(running_id)
+        try:
+            other, other_created = self.jobs.start_generation_job('2025-01-06', '2025-01-17')
+            self.assertFalse(other_created)
+            self.assertEqual(other['id'], running_id)
+
+            # Başka işlemde çalışan iş: sinyal taze oldukça kapatılmaz, uzun süre ilerleme yazmasa da
+            self.database.execute_update(
+                "UPDATE generation_jobs SET updated_at = datetime('now', '-1 hour') WHERE id = ?", (running_id,)
+            )
+            self.assertTrue(self.job_model.touch_job_heartbeat(running_id))
+            self.jobs.release_stale_job()
+            self.assertEqual(self.job_model.get_job_by_id(running_id)['status'], self.job_model.JOB_RUNNING)
+
+            # Sinyali kesilen iş yarıda kalmış sayılır
+            self.database.execute_update(
+                "UPDATE generation_jobs SET heartbeat_at = datetime('now', '-1 hour') WHERE id = ?", (running_id,)
+            )
+            self.jobs.release_stale_job()
+            self.assertEqual(self.job_model.get_job_by_id(running_id)['status'], self.job_model.JOB_FAILED)
+        finally:
+            self.job_model.fail_job(running_id, 'test')
+
+    def test_deadline_returns_partial_schedule(self):
+        """Süre dolunca veya iptal edilince kısmi programın kaydedildiğini kontrol eder."""
+        import threading
+
+        # Süre hemen doldu: hiçbir ders denenmez
+        result = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17', time_limit=0)
+        self.assertFalse(result['completed'])
+        self.assertEqual(result['stop_reason'], 'süre doldu')
+        self.assertEqual(result['placed_count'], 0)
+        self.assertEqual(result['skipped_count'], result['total_courses'])
+        self.assertEqual(result['failed_count'], result['total_courses'])
+
+        # Üç ders işlendikten sonra iptal: o ana kadar yerleşenler kaydedilir
+        for use_memory_index in (True, False):
+            cancel_event = threading.Event()
+
+            def progress(processed_count, placed_count, total_courses):
+                if processed_count >= 3:
+                    cancel_event.set()
+
+            result = self.scheduler.generate_exam_schedule(
+                '2025-01-06', '2025-01-17', use_memory_index=use_memory_index,
+                progress=progress, cancel_event=cancel_event)
+            self.assertFalse(result['completed'])
+            self.assertEqual(result['stop_reason'], 'iptal edildi')
+            self.assertEqual(result['placed_count'], 3)
+            self.assertEqual(result['placed_count'] + result['failed_count'], result['total_courses'])
+            self.assertEqual(len(set(row[0] for row in self._exam_rows())), 3)
+
+        # Süre sınırı yeterliyse planlama tamamlanır
+        result = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17', time_limit=60)
+        self.assertTrue(result['completed'])
+        self.assertIsNone(result['stop_reason'])
+        self.assertEqual(result['skipped_count'], 0)
+
+    def test_dry_run_keeps_schedule_and_publishes_later(self):
+        """Deneme planlamasının programa dokunmadığını ve taslağın sonra yayınlandığını kontrol eder."""
+        what_if = self.what_if
+
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        published = self._exam_rows()
+
+        # Aynı ayarlarla deneme: program değişmez, fark yoktur
+        result = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17', dry_run=True)
+        self.assertEqual(self._exam_rows(), published)
+        self.assertEqual(result['diff']['unchanged_count'], result['statistics']['total_exams'])
+        self.assertEqual(self.scheduler.get_schedule_statistics(), result['statistics'])
+
+        # Farklı tarih aralığı: fark raporlanır, program yine değişmez
+        result = self.scheduler.generate_exam_schedule('2025-01-13', '2025-01-24', dry_run=True)
+        self.assertEqual(self._exam_rows(), published)
+        diff = result['diff']
+        self.assertGreater(len(diff['moved']), 0)
+        self.assertEqual(len(diff['added']) + len(diff['moved']) + len(diff['changed']) + diff['unchanged_count'],
+                         result['statistics']['total_exams'])
+        proposed = sorted(tuple(row[field] for field in what_if.EXAM_ROW_FIELDS)
+                          for row in result['placements'])
+
+        # Yayınlama yeniden hesaplamadan taslağı yazar
+        saved_count = what_if.publish_draft(result['draft_id'])
+        self.assertEqual(saved_count, len(proposed))
+        self.assertEqual(self._exam_rows(), proposed)
+        self.assertIsNotNone(what_if.get_draft_summary(result['draft_id'])['published_at'])
+
+        with self.assertRaises(ValueError):
+            what_if.publish_draft(9999)
+
+    def test_publish_draft_checks_base_version_and_references(self):
+        """Taslağın değişen yayın ve silinmiş kayıtlar üzerine sessizce yayınlanmadığını kontrol eder."""
+        import json
+        what_if = self.what_if
+
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        draft_id = self.scheduler.generate_exam_schedule('2025-01-13', '2025-01-24', dry_run=True)['draft_id']
+        self.assertFalse(what_if.get_draft_summary(draft_id)['outdated'])
+
+        # Taslaktan sonra yeni program yayınlandı: onaysız yayınlanmaz
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        published = self._exam_rows()
+        version_id = self.exam_model.get_published_version_id()
+        self.assertTrue(what_if.get_draft_summary(draft_id)['outdated'])
+        with self.assertRaises(ValueError):
+            what_if.publish_draft(draft_id)
+        self.assertEqual(self.exam_model.get_published_version_id(), version_id)
+        self.assertIsNone(what_if.get_draft_summary(draft_id)['published_at'])
+
+        # Silinmiş derslik: onayla da yayınlanmaz, hiçbir şey değişmez
+        draft = what_if.get_draft_by_id(draft_id)
+        exam_rows = json.loads(draft['exam_rows'])
+        exam_rows[0][1] = 9999
+        self.database.execute_update("UPDATE schedule_drafts SET exam_rows = ? WHERE id = ?",
+                                     (json.dumps(exam_rows), draft_id))
+        with self.assertRaises(ValueError):
+            what_if.publish_draft(draft_id, force=True)
+        self.assertEqual(self.exam_model.get_published_version_id(), version_id)
+        self.assertEqual(self._exam_rows(), published)
+        self.assertIsNone(what_if.get_draft_summary(draft_id)['published_at'])
+
+        # Açık onayla yayınlanır ve aynı işlemde işaretlenir
+        self.database.execute_update("UPDATE schedule_drafts SET exam_rows = ? WHERE id = ?",
+                                     (draft['exam_rows'], draft_id))
+        saved_count = what_if.publish_draft(draft_id, force=True)
+        self.assertEqual(saved_count, len(exam_rows))
+        self.assertNotEqual(self.exam_model.get_published_version_id(), version_id)
+        self.assertIsNotNone(what_if.get_draft_summary(draft_id)['published_at'])
+
+    def test_generation_publishes_new_version_and_rolls_back(self):
+        """Planlamanın yayındaki programı bozmadan yeni sürüm yayınladığını ve geri alındığını kontrol eder."""
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        first = self._exam_rows()
+
+        # SQL planlaması sürerken sayfalar eski programı görür
+        seen_during_run = []
+
+        def progress(processed_count, placed_count, total_courses):
+            seen_during_run.append(self._exam_rows() == first)
+
+        self.scheduler.generate_exam_schedule('2025-01-13', '2025-01-24', use_memory_index=False,
+                                              progress=progress)
+        second = self._exam_rows()
+        self.assertTrue(seen_during_run and all(seen_during_run))
+        self.assertNotEqual(second, first)
+
+        # Geri alma önceki sürüme döner, tekrar geri alma yeniye
+        self.assertIsNotNone(self.exam_model.rollback_schedule())
+        self.assertEqual(self._exam_rows(), first)
+        self.exam_model.rollback_schedule()
+        self.assertEqual(self._exam_rows(), second)
+
+        # Temizleme de geri alınabilir
+        self.exam_model.delete_all_exams()
+        self.assertEqual(self._exam_rows(), [])
+        self.exam_model.rollback_schedule()
+        self.assertEqual(self._exam_rows(), second)
+
+        # Eski sürümler sınırlı sayıda saklanır
+        for _ in range(self.exam_model.KEEP_SCHEDULE_VERSIONS + 3):
+            self.exam_model.delete_all_exams()
+        versions = self.database.execute_query("SELECT COUNT(*) as count FROM schedule_versions")[0]['count']
+        self.assertLessEqual(versions, self.exam_model.KEEP_SCHEDULE_VERSIONS + 2)
+
+    def test_delete_checks_retained_versions(self):
+        """Saklanan eski sürümde kullanılan dersliğin silinince o sürümün de silindiğini kontrol eder."""
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        course_id = self._exam_rows()[0][0]
+        classroom_id = self.classroom_model.create_classroom('TEST-SILME', 'Test', 10, 0, 0)
+        self.exam_model.replace_course_exams(
+            [course_id], [(course_id, classroom_id, None, '2025-01-06', '09:00', '10:00')]
+        )
+
+        # Yayındaki programda kullanılan derslik silinmez
+        self.assertFalse(self.classroom_model.delete_classroom(classroom_id))
+
+        # Sadece geri alma hedefinde kalınca silinir, o sürüm de gider
+        self.assertIsNotNone(self.exam_model.rollback_schedule())
+        self.assertTrue(self.classroom_model.delete_classroom(classroom_id))
+        self.assertIsNone(self.exam_model.get_previous_version_id())
+        self.assertIsNone(self.exam_model.rollback_schedule())
+        rows = self.database.execute_query(
+            "SELECT COUNT(*) as count FROM exam_schedule_versions WHERE classroom_id = ?", (classroom_id,)
+        )
+        self.assertEqual(rows[0]['count'], 0)
+        self.assertIn(course_id, [row[0] for row in self._exam_rows()])
+
+    def test_delete_instructor_checks_retained_versions_and_drafts(self):
+        """Gözetmenliği saklanan sürümde veya taslakta kalan öğretim üyesinin silinince onların da silindiğini kontrol eder."""
+        import json
+
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        course_id, classroom_id, _, exam_date, start_time, end_time = self._exam_rows()[0]
+        instructor_id = self.instructor_model.create_instructor('Test Gözetmen', 'Dr.', 'gozetmen@test', '', 1)
+        self.exam_model.replace_course_exams(
+            [course_id], [(course_id, classroom_id, instructor_id, exam_date, start_time, end_time)]
+        )
+
+        draft_id = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17', dry_run=True)['draft_id']
+        exam_rows = json.loads(self.what_if.get_draft_by_id(draft_id)['exam_rows'])
+        exam_rows[0][2] = instructor_id
+        self.database.execute_update("UPDATE schedule_drafts SET exam_rows = ? WHERE id = ?",
+                                     (json.dumps(exam_rows), draft_id))
+
+        # Yayındaki programda gözetmen olan öğretim üyesi silinmez
+        self.assertFalse(self.instructor_model.delete_instructor(instructor_id))
+        self.assertIsNotNone(self.what_if.get_draft_by_id(draft_id))
+
+        # Sadece geri alma hedefinde ve taslakta kalınca silinir, onlar da gider
+        self.assertIsNotNone(self.exam_model.rollback_schedule())
+        self.assertTrue(self.instructor_model.delete_instructor(instructor_id))
+        self.assertIsNone(self.exam_model.get_previous_version_id())
+        self.assertIsNone(self.what_if.get_draft_by_id(draft_id))
+        rows = self.database.execute_query(
+            "SELECT COUNT(*) as count FROM exam_schedule_versions WHERE supervisor_id = ?", (instructor_id,)
+        )
+        self.assertEqual(rows[0]['count'], 0)
+
+    def test_concurrent_runs_do_not_share_state(self):
+        """Aynı işlemde paralel çalışan planlamaların birbirini bozmadığını kontrol eder."""
+        import threading
+
+        def run(seed, results):
+            state, result = self.scheduler.compute_schedule_in_memory(
+                '2025-01-06', '2025-01-17', ordering='random', seed=seed, verbose=False)
+            results[seed] = (result['placed_count'], sorted(
+                (p['course_id'], p['exam_date'], p['start_minute'], tuple(p['rooms']), tuple(p['supervisors']))
+                for p in state['placements']
+            ))
+
+        expected = {}
+        for seed in (1, 2, 3):
+            run(seed, expected)
+
+        results = {}
+        threads = [threading.Thread(target=run, args=(seed, results)) for seed in (1, 2, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, expected)
+        self.assertFalse(hasattr(self.scheduler, 'daily_department_exams'))
+
+    def test_profile_reports_checks_and_rejection_reasons(self):
+        """Sonuçtaki ölçümlerin kontrolleri ve red nedenlerini içerdiğini kontrol eder."""
+        import json
+        import tempfile
+
+        profile_path = os.path.join(tempfile.mkdtemp(), 'profile.json')
+        result = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-10', profile_path=profile_path)
+        profile = result['profile']
+
+        for name in ('derslik', 'hoca müsaitliği', 'hoca çakışması', 'gözetmen',
+                     'öğrenci çakışması', 'bölüm aralığı'):
+            self.assertIn(name, profile['checks'])
+            self.assertGreater(profile['checks'][name]['count'], 0)
+
+        # Her ders en az bir slot denedi, reddedilen slotların hepsinin nedeni var
+        self.assertEqual(len(profile['courses']), result['total_courses'])
+        rejected = sum(profile['rejections'].values())
+        self.assertEqual(profile['slot_attempts'] - rejected, result['placed_count'])
+
+        # Dar dönemde yerleşemeyen derslerin nedeni raporlanır
+        self.assertGreater(result['failed_count'], 0)
+        self.assertEqual(len(profile['failed']), result['failed_count'])
+        for reason in profile['failed'].values():
+            self.assertIsNotNone(reason)
+
+        with open(profile_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), profile)
+
+    def test_synthetic_university_is_reproducible(self):
+        """Sentetik veri üretecinin tohuma göre aynı veriyi ürettiğini kontrol eder."""
+        import sqlite3
+        import tempfile
+        from app.synthetic_data import build_options, generate_university_rows, generate_university
+
+        options = build_options(scale=2, cross_department_ratio=0.5)
+        self.assertEqual(generate_university_rows(options, seed=7), generate_university_rows(options, seed=7))
+        self.assertNotEqual(generate_university_rows(options, seed=7), generate_university_rows(options, seed=8))
+        with self.assertRaises(ValueError):
+            build_options(unknown_option=1)
+
+        database_path = os.path.join(tempfile.mkdtemp(), 'synthetic.db')
+        stats = generate_university(database_path, seed=7, admin_password=None, scale=2)
+
+        connection = sqlite3.connect(database_path)
+        try:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM faculties").fetchone()[0], 8)
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM student_courses").fetchone()[0],
+                             stats['student_courses'])
+
+            # Dersin öğrenci sayısı kayıtlarla aynı
+            mismatched = connection.execute("""
+                SELECT COUNT(*) FROM courses c
+                WHERE c.student_count != (SELECT COUNT(*) FROM student_courses sc WHERE sc.course_id = c.id)
+            """).fetchone()[0]
+            self.assertEqual(mismatched, 0)
+        finally:
+            connection.close()
+
+    def test_benchmark_flags_regressions_against_baseline(self):
+        """Ölçümlerin kaydedildiğini ve temel çizgiye göre kötüleşmenin bulunduğunu kontrol eder."""
+        import copy
+        from app import benchmark
+
+        report = benchmark.run_benchmarks(scales=[1], cases=['generate_exam_schedule', 'get_all_exams'],
+                                          verbose=False)
+        self.assertEqual(self.database.DATABASE_PATH, config.DATABASE_PATH)
+
+        metrics = report['results']['scale_1']['generate_exam_schedule']
+        for key in ('time', 'queries', 'peak_memory_kb', 'placed', 'failed'):
+            self.assertIn(key, metrics)
+        self.assertGreater(metrics['queries'], 0)
+
+        self.assertEqual(benchmark.compare_with_baseline(report, report), [])
+
+        baseline = copy.deepcopy(report)
+        baseline['results']['scale_1']['generate_exam_schedule']['placed'] += 1
+        baseline['results']['scale_1']['get_all_exams']['queries'] -= 1
+        regressions = benchmark.compare_with_baseline(report, baseline)
+        self.assertEqual(
+            sorted((item['case'], item['metric']) for item in regressions),
+            [('generate_exam_schedule', 'placed'), ('get_all_exams', 'queries')]
+        )
+
+    def test_sparse_coenrollment_matches_python_graph(self):
+        """Seyrek Aᵀ·A ile hesaplanan grafın Python döngüsüyle aynı olduğunu kontrol eder."""
+        from app.coenrollment import (
+            load_incidence_matrix, compute_coenrollment, list_conflict_pairs, get_conflict_pair_report
+        )
+
+        graph = self._build_conflict_graph_by_students(self.conflict_graph.load_enrollments())
+        self.assertEqual(self.conflict_graph.build_conflict_graph(), graph)
+
+        enrollments = {1: {10, 11, 12}, 2: {11, 12}, 3: {12}, 4: {13}}
+        self.assertEqual(
+            self.conflict_graph.build_conflict_graph(enrollments),
+            {1: {2: 2, 3: 1}, 2: {1: 2, 3: 1}, 3: {1: 1, 2: 1}}
+        )
+
+        coenrollment = compute_coenrollment(load_incidence_matrix())
+        self.assertEqual(
+            set(list_conflict_pairs(coenrollment, min_shared=2)),
+            set((course_a, course_b, shared) for course_a in graph for course_b, shared in graph[course_a].items()
+                if course_a < course_b and shared >= 2)
+        )
+
+        # Yönetici raporu aynı çiftleri ders kodlarıyla verir
+        report = get_conflict_pair_report(min_shared=2)
+        self.assertEqual([(item['course_a'], item['course_b'], item['shared']) for item in report],
+                         list_conflict_pairs(coenrollment, min_shared=2))
+        codes = {row['id']: row['code'] for row in self.database.execute_query("SELECT id, code FROM courses")}
+        for item in report:
+            self.assertEqual(item['code_a'], codes[item['course_a']])
+
+    def test_independent_components_schedule_in_parallel(self):
+        """Bağımsız parçaların ayrı planlanıp derslik çakışması olmadan birleştiğini kontrol eder."""
+        from app.components import find_course_components, pack_components
+
+        courses = [
+            {'id': 1, 'instructor_id': 10, 'department_id': 100},
+            {'id': 2, 'instructor_id': 11, 'department_id': 101},
+            {'id': 3, 'instructor_id': 12, 'department_id': 102},
+            {'id': 4, 'instructor_id': 12, 'department_id': 103},
+            {'id': 5, 'instructor_id': 13, 'department_id': 103},
+            {'id': 6, 'instructor_id': 14, 'department_id': 104}
+        ]
+        graph = {1: {2: 3}, 2: {1: 3}}
+        components = find_course_components(courses, graph)
+        self.assertEqual(components, [[3, 4, 5], [1, 2], [6]])
+        self.assertEqual(pack_components(components, 2), [[3, 4, 5], [1, 2, 6]])
+
+        result = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17', components=True, workers=2)
+        self.assertEqual(result['placed_count'] + result['failed_count'], result['total_courses'])
+
+        exams = self.exam_model.get_all_exams()
+        self.assertEqual(len(set(exam['course_id'] for exam in exams)), result['placed_count'])
+        graph = self.conflict_graph.build_conflict_graph()
+        self.assertEqual(self.conflict_graph.find_student_clashes(graph, exams), [])
+        for i, exam_a in enumerate(exams):
+            for exam_b in exams[i + 1:]:
+                if exam_a['exam_date'] == exam_b['exam_date'] and self._time_overlaps(exam_a, exam_b):
+                    self.assertNotEqual(exam_a['classroom_id'], exam_b['classroom_id'])
+                    if exam_a['course_id'] != exam_b['course_id']:
+                        self.assertNotEqual(exam_a['supervisor_id'], exam_b['supervisor_id'])
+
+        with self.assertRaises(ValueError):
+            self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17', components=True, attempts=2)
+
+    def test_component_merge_repair_respects_deadline(self):
+        """Birleştirmedeki yeniden denemenin süre dolunca durduğunu kontrol eder."""
+        from app.components import merge_component_batches
+        from app.deadline import create_deadline
+        from app.schedule_snapshot import load_schedule_snapshot
+
+        snapshot = load_schedule_snapshot()
+        course_ids = [course['id'] for course in snapshot['courses']]
+        batches = [{'placements': [], 'failed_ids': course_ids, 'stop_reason': None}]
+
+        for time_limit, stop_reason in ((0, 'süre doldu'), (60, None)):
+            state = self.scheduler.create_run_state(snapshot)
+            state['settings'] = self.scheduler.build_schedule_settings(snapshot, '2025-01-06', '2025-01-17')
+            repair = merge_component_batches(state, batches, create_deadline(time_limit))
+
+            self.assertEqual(repair['retried'], len(course_ids))
+            self.assertEqual(repair['stop_reason'], stop_reason)
+            if stop_reason:
+                self.assertEqual(repair['skipped'], len(course_ids))
+                self.assertEqual(state['placements'], [])
+            else:
+                self.assertEqual(repair['skipped'], 0)
+                self.assertEqual(repair['repaired'], len(state['placements']))
+            self.assertEqual(len(state['placements']) + len(state['failed_courses']), len(course_ids))
+
+    def test_student_daily_load_limits(self):
+        """Öğrenci başına günlük sınav sınırının ve en az aranın uygulandığını kontrol eder."""
+        from app.student_load import (
+            create_student_load_index, violates_student_load, add_exam_to_student_load,
+            remove_exam_from_student_load
+        )
+
+        index = create_student_load_index({1: {10, 11}, 2: {11}, 3: {12}}, max_per_day=2, min_gap=60)
+        add_exam_to_student_load(index, 1, '2025-01-06', 540, 630)
+        self.assertTrue(violates_student_load(index, 2, '2025-01-06', 660, 750))
+        self.assertFalse(violates_student_load(index, 2, '2025-01-06', 690, 780))
+        self.assertFalse(violates_student_load(index, 3, '2025-01-06', 660, 750))
+        add_exam_to_student_load(index, 2, '2025-01-06', 690, 780)
+        self.assertTrue(violates_student_load(index, 1, '2025-01-06', 900, 990))
+        remove_exam_from_student_load(index, 2, '2025-01-06', 690, 780)
+        self.assertEqual(index['counts'], {(10, '2025-01-06'): 1, (11, '2025-01-06'): 1})
+
+        self.scheduler.SINAV_OGRENCI_GUNLUK_EN_FAZLA = 1
+        try:
+            result = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        finally:
+            self.scheduler.SINAV_OGRENCI_GUNLUK_EN_FAZLA = None
+
+        self.assertGreater(result['placed_count'], 0)
+        overloaded = self.database.execute_query("""
+            SELECT sc.student_id, e.exam_date
+            FROM student_courses sc
+            INNER JOIN (SELECT DISTINCT course_id, exam_date FROM exam_schedule) e ON e.course_id = sc.course_id
+            GROUP BY sc.student_id, e.exam_date
+            HAVING COUNT(*) > 1
+        """)
+        self.assertEqual(len(overloaded), 0, "Bir günde birden fazla sınavı olan öğrenci var.")
+
+    def test_day_balancing_spreads_exams(self):
+        """Gün sayaçlarına göre sınavların günlere dengeli dağıtıldığını kontrol eder."""
+        from app.day_load import create_day_load_index, add_exam_to_day_load, iterate_balanced_days, order_day_slots
+
+        index = create_day_load_index({1: 50, 2: 20})
+        days = ['2025-01-06', '2025-01-07', '2025-01-08']
+        self.assertEqual(list(iterate_balanced_days(index, days)), days)
+        add_exam_to_day_load(index, 1, '2025-01-06', 540, 2)
+        add_exam_to_day_load(index, 2, '2025-01-08', 660, 1)
+        self.assertEqual(list(iterate_balanced_days(index, days)), ['2025-01-07', '2025-01-08', '2025-01-06'])
+        self.assertEqual(order_day_slots(index, '2025-01-08', [540, 660, 810]), [540, 810, 660])
+
+        def daily_counts():
+            rows = self.database.execute_query(
+                "SELECT exam_date, COUNT(DISTINCT course_id) as count FROM exam_schedule GROUP BY exam_date"
+            )
+            return [row['count'] for row in rows]
+
+        self.scheduler.SINAV_GUN_DENGELEME = False
+        try:
+            calendar = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+            calendar_counts = daily_counts()
+        finally:
+            self.scheduler.SINAV_GUN_DENGELEME = True
+        balanced = self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        balanced_counts = daily_counts()
+
+        self.assertEqual(balanced['placed_count'], calendar['placed_count'])
+        self.assertGreaterEqual(len(balanced_counts), len(calendar_counts))
+        self.assertLessEqual(max(balanced_counts), max(calendar_counts))
+
+    def test_slot_grid_from_config(self):
+        """Saat ızgarasının (adım, mola, gün şablonu) önceden hesaplandığını ve planlamada uyulduğunu kontrol eder."""
+        import app.slot_grid as slot_grid
+
+        grid = slot_grid.compile_slot_grid({
+            'gun_basi': '09:00',
+            'gun_sonu': '13:00',
+            'slotlar': [],
+            'gunler': {'Cuma': [('09:00', '10:00')]},
+            'dakika_adimi': 60,
+            'molalar': [('11:30', '12:00')]
+        })
+        self.assertEqual(slot_grid.get_day_slots(grid, 'Pazartesi'), [(540, 600), (600, 660), (660, 720), (720, 780)])
+        self.assertEqual(slot_grid.get_exam_starts(grid, 'Pazartesi', 90),
+                         [(540, 630, '09:00', '10:30', (540, 600)), (600, 690, '10:00', '11:30', (600, 660))])
+        self.assertEqual([start[0] for start in slot_grid.get_exam_starts(grid, 'Pazartesi', 60)], [540, 600, 720])
+        self.assertEqual(slot_grid.get_day_slots(grid, 'Cuma'), [(540, 600)])
+        self.assertEqual(slot_grid.get_day_name(grid, '2025-01-10'), 'Cuma')
+
+        default_grid = slot_grid.SINAV_SLOT_IZGARASI
+        slot_grid.SINAV_SLOT_IZGARASI = dict(default_grid, molalar=[('11:00', '12:30')])
+        try:
+            self.assertEqual(self.scheduler.generate_time_slots(),
+                             [('09:00', '10:30'), ('11:00', '12:30'), ('13:30', '15:00'), ('15:30', '17:00')])
+            self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        finally:
+            slot_grid.SINAV_SLOT_IZGARASI = default_grid
+
+        exams = self.database.execute_query("SELECT start_time, end_time FROM exam_schedule")
+        self.assertTrue(exams)
+        for exam in exams:
+            self.assertFalse(exam['start_time'] < '12:30' and exam['end_time'] > '11:00')
+            self.assertLessEqual(exam['end_time'], '18:00')
+
+    def test_exam_time_columns_and_migration(self):
+        """Tam sayı tarih/saat sütunlarının yazıldığını, çakışma sorgusunu ve eski veritabanı migrasyonunu kontrol eder."""
+        import sqlite3
+        import tempfile
+
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        exams = self.database.execute_query("SELECT * FROM exam_schedule")
+        self.assertTrue(exams)
+        for exam in exams:
+            self.assertEqual((exam['date_ord'], exam['start_min'], exam['end_min']),
+                             self.exam_model.get_exam_time_columns(exam['exam_date'], exam['start_time'],
+                                                                   exam['end_time']))
+
+        exam = exams[0]
+        self.assertTrue(self.exam_model.check_classroom_conflict(exam['classroom_id'], exam['exam_date'],
+                                                                 exam['start_time'], exam['start_time'][:3] + '59'))
+        self.assertFalse(self.exam_model.check_classroom_conflict(exam['classroom_id'], exam['exam_date'],
+                                                                  exam['end_time'], '20:00'))
+
+        # Tam sayı sütunlarından önceki sürümlü bir veritabanı
+        database_path = os.path.join(tempfile.mkdtemp(), 'old.db')
+        connection = sqlite3.connect(database_path)
+        connection.executescript("""
+            CREATE TABLE exam_schedule_versions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, version_id INTEGER NOT NULL, course_id INTEGER NOT NULL,
+                classroom_id INTEGER NOT NULL, supervisor_id INTEGER, exam_date TEXT NOT NULL,
+                start_time TEXT NOT NULL, end_time TEXT NOT NULL, status TEXT DEFAULT 'planlandı',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX idx_exam_schedule_versions_classroom ON exam_schedule_versions(version_id, classroom_id);
+            INSERT INTO exam_schedule_versions (version_id, course_id, classroom_id, exam_date, start_time, end_time)
+            VALUES (1, 1, 1, '2025-01-06', '13:30', '15:00');
+        """)
+        connection.close()
+
+        current_path = self.database.DATABASE_PATH
+        self.database.DATABASE_PATH = database_path
+        try:
+            self.database.init_database()
+        finally:
+            self.database.DATABASE_PATH = current_path
+
+        connection = sqlite3.connect(database_path)
+        try:
+            row = connection.execute("SELECT date_ord, start_min, end_min FROM exam_schedule_versions").fetchone()
+            self.assertEqual(row, (datetime(2025, 1, 6).toordinal(), 810, 900))
+            indexes = [r[0] for r in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+            self.assertIn('idx_exam_schedule_versions_classroom_time', indexes)
+            self.assertNotIn('idx_exam_schedule_versions_classroom', indexes)
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM exam_schedule_rtree").fetchone()[0], 1)
+        finally:
+            connection.close()
+
+    def test_exam_schedule_rtree_mirror(self):
+        """R*Tree aynasının tetikleyicilerle güncel kaldığını ve doluluk sorgularını kontrol eder."""
+        def mirror_count():
+            return self.database.execute_query("SELECT COUNT(*) as count FROM exam_schedule_rtree")[0]['count']
+
+        def version_count():
+            return self.database.execute_query("SELECT COUNT(*) as count FROM exam_schedule_versions")[0]['count']
+
+        self.scheduler.generate_exam_schedule('2025-01-06', '2025-01-17')
+        self.assertEqual(mirror_count(), version_count())
+
+        exam = self.database.execute_query("SELECT * FROM exam_schedule ORDER BY id LIMIT 1")[0]
+        middle = exam['start_time'][:3] + '15'
+        overlapping = self.exam_model.find_overlapping_exams(exam['exam_date'], middle)
+        self.assertIn(exam['id'], [row['id'] for row in overlapping])
+        self.assertEqual(self.exam_model.find_overlapping_exams(exam['exam_date'], exam['start_time'],
+                                                               exam['end_time'], classroom_id=exam['classroom_id'],
+                                                               exclude_exam_id=exam['id']), [])
+        free_ids = [room['id'] for room in self.exam_model.get_free_classrooms(exam['exam_date'], middle)]
+        self.assertNotIn(exam['classroom_id'], free_ids)
+        self.assertFalse(self.exam_model.find_overlapping_exams(exam['exam_date'], exam['end_time'],
+                                                                classroom_id=exam['classroom_id']))
+
+        # Aynı gözetmen aynı saatte başka bir dersin sınavında
+        self.assertEqual(self.exam_model.find_supervisor_double_bookings(exam['supervisor_id']), [])
+        other_course = self.database.execute_query(
+            "SELECT id FROM courses WHERE id != ? LIMIT 1", (exam['course_id'],)
+        )[0]['id']
+        extra_id = self.exam_model.create_exam(other_course, exam['classroom_id'], exam['exam_date'],
+                                               exam['start_time'], exam['end_time'], exam['supervisor_id'])
+        bookings = self.exam_model.find_supervisor_double_bookings(exam['supervisor_id'])
+        self.assertIn(extra_id, [row['other_exam_id'] for row in bookings])
+
+        self.exam_model.delete_exam(extra_id)
+        self.assertEqual(self.exam_model.find_supervisor_double_bookings(exam['supervisor_id']), [])
+        self.assertEqual(mirror_count(), version_count())
+
+    def _assert_supervisors_do_not_clash(self):
+        """Çakışan sınavlarda aynı gözetmen veya kendi sınavını veren gözetmen olmadığını doğrular."""
+        exams = self.exam_model.get_all_exams()
+        for i in range(len(exams)):
+            for j in range(i + 1, len(exams)):
+                exam_a = exams[i]
+                exam_b = exams[j]
+                if exam_a['exam_date'] != exam_b['exam_date'] or exam_a['course_id'] == exam_b['course_id']:
+                    continue
+                if not self._time_overlaps(exam_a, exam_b):
+                    continue
+
+                self.assertNotEqual(
+                    exam_a['supervisor_id'],
+                    exam_b['supervisor_id'],
+                    "Aynı gözetmen çakışan iki sınava atandı."
+                )
+                course_b = self.course_model.get_course_by_id(exam_b['course_id'])
+                self.assertNotEqual(
+                    exam_a['supervisor_id'],
+                    course_b['instructor_id'],
+                    "Gözetmen aynı saatte kendi sınavını veriyor."
+                )
+
+    def _build_conflict_graph_by_students(self, enrollments):
+        """
+        Çakışma grafını saf Python ile oluşturur (seyrek hesaplamayı doğrulamak için):
+        her öğrencinin aldığı derslerin her çifti için ortak öğrenci sayısı bir artırılır.
+        """
+        student_courses = {}
+        for course_id in enrollments:
+            for student_id in enrollments[course_id]:
+                if student_id not in student_courses:
+                    student_courses[student_id] = []
+                student_courses[student_id].append(course_id)
+
+        graph = {}
+        for course_ids in student_courses.values():
+            for i in range(len(course_ids)):
+                course_a = course_ids[i]
+                for j in range(i + 1, len(course_ids)):
+                    course_b = course_ids[j]
+                    if course_a == course_b:
+                        continue
+
+                    if course_a not in graph:
+                        graph[course_a] = {}
+                    if course_b not in graph:
+                        graph[course_b] = {}
+
+                    graph[course_a][course_b] = graph[course_a].get(course_b, 0) + 1
+                    graph[course_b][course_a] = graph[course_b].get(course_a, 0) + 1
+
+        return graph
+
+    def _exam_rows(self):
+        """Planlanan sınavları karşılaştırılabilir liste olarak döndürür."""
+        rows = self.database.execute_query(
+            "SELECT course_id, classroom_id, supervisor_id, exam_date, start_time, end_time "
+            "FROM exam_schedule"
+        )
+        return sorted(tuple(row) for row in rows)
+
     def _time_overlaps(self, exam_a, exam_b):
         """İki sınav saatinin çakışıp çakışmadığını kontrol eder."""
         start_a = exam_a['start_time']